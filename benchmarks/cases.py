@@ -0,0 +1,264 @@
+"""The timed cases, run in one process per virtual desktop.
+
+Each case is timed ``repeat`` times after one untimed warm-up run, so
+lazily built state (fonts, glyph caches, codec plugins) is not counted.
+Samples are milliseconds of wall time.
+
+Cases, for a desktop of screens S:
+
+* ``capture.stitch``: cut the grabbed desktop into one pixmap per screen,
+  as the overlay does when it opens (``_create_surfaces``);
+* ``overlay.open``: the whole overlay, from the grabbed frame to the
+  windows shown;
+* ``paint.N``: repaint every window with the whole desktop selected and
+  N annotations spread over it;
+* ``blur.small``, ``blur.screen``, ``blur.span``: the blur tool on a
+  400x300 area, a whole screen, and an area across two screens;
+* ``export.N``: ``_get_capture_image`` of the whole desktop with N
+  annotations;
+* ``encode.<fmt>``: ``save_image`` of the first screen's export;
+* ``encode.anim.<fmt>``: ``encode_animation`` of a recording of a quarter
+  of the first screen (``ANIMATION_FRAMES`` frames), with the peak memory
+  it takes on top of the recording (``peak_mb``, Linux only);
+* ``encode.tiles``: ``TileStore.put`` of the first screen, a timelapse
+  frame that differs from the last one in one moving window.
+"""
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(ROOT))
+
+from scripts.replay_trace import fake_monitors, start_app, start_offscreen, synthetic_desktop  # noqa: E402
+
+# Logical geometry and device pixel ratio of each screen; x, y in
+# physical pixels, as in a trace header (src/core/trace.py)
+DESKTOPS = {
+    "1080p": [{"x": 0, "y": 0, "width": 1920, "height": 1080, "dpr": 1.0, "refresh": 60.0}],
+    "1440p": [{"x": 0, "y": 0, "width": 2560, "height": 1440, "dpr": 1.0, "refresh": 60.0}],
+    "4k": [{"x": 0, "y": 0, "width": 2560, "height": 1440, "dpr": 1.5, "refresh": 60.0}],
+    "3x4k": [
+        {"x": 0, "y": 0, "width": 2560, "height": 1440, "dpr": 1.5, "refresh": 60.0},
+        {"x": 3840, "y": 0, "width": 3840, "height": 2160, "dpr": 1.0, "refresh": 60.0},
+        {"x": 7680, "y": 0, "width": 1920, "height": 1080, "dpr": 2.0, "refresh": 60.0},
+    ],
+}
+ANNOTATION_COUNTS = (0, 100, 1000)
+IMAGE_FORMATS = ("png", "jpg", "bmp", "webp")
+ANIMATION_FRAMES = 60
+
+
+def summary(samples):
+    ordered = sorted(samples)
+    n = len(ordered)
+    median = ordered[n // 2] if n % 2 else (ordered[n // 2 - 1] + ordered[n // 2]) / 2
+    return {"count": n, "min": ordered[0], "median": median, "mean": sum(ordered) / n, "max": ordered[-1]}
+
+
+def measure(fn, repeat, setup=None, teardown=None):
+    """Time *fn* ``repeat`` times after one warm-up call. *setup* runs
+    before each call and its result is passed to *fn*; *teardown* gets
+    *fn*'s result. Neither is timed."""
+    samples = []
+    for i in range(repeat + 1):
+        arg = setup() if setup else None
+        t = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        ms = (time.perf_counter() - t) * 1000
+        if teardown:
+            teardown(result)
+        if i:
+            samples.append(ms)
+    return summary(samples)
+
+
+def _rss_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+
+
+def peak_mb(fn):
+    """Run *fn* once; returns how far the process's peak resident memory
+    rose above what it used before, in MB (``None`` without procfs)."""
+    try:
+        # Resets the peak (VmHWM) to the current resident size
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        before = _rss_kb("VmRSS")
+    except OSError:
+        return None
+    fn()
+    return max(0.0, (_rss_kb("VmHWM") - before) / 1024)
+
+
+def make_annotations(count, area, seed=11):
+    """*count* annotations spread over *area*: pen and highlighter strokes,
+    rectangles, arrows and text, in a fixed mix."""
+    import random
+
+    from PyQt6.QtCore import QLineF, QPoint, QPointF, QRect
+    from PyQt6.QtGui import QColor
+
+    from src.core import annotations as ann
+    from src.core.strokes import StrokeBuilder
+
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        color = QColor.fromHsv(rng.randrange(360), 220, 230)
+        x = area.left() + rng.randrange(max(1, area.width() - 200))
+        y = area.top() + rng.randrange(max(1, area.height() - 100))
+        kind = i % 10
+        if kind < 6:
+            builder = StrokeBuilder(QPointF(x, y))
+            phase = rng.random() * math.tau
+            for j in range(1, 120):
+                builder.add(QPointF(x + j * 1.5, y + 30 * math.sin(j / 10 + phase)))
+            cls = ann.Highlighter if kind >= 4 else ann.Pen
+            items.append(cls(color, builder.finish()))
+        elif kind < 8:
+            items.append(ann.Rect(color, QRect(x, y, rng.randrange(20, 200), rng.randrange(20, 100))))
+        elif kind < 9:
+            items.append(ann.Arrow(color, QLineF(x, y, x + rng.randrange(-150, 150), y + rng.randrange(20, 100))))
+        else:
+            items.append(ann.Text(color, QPoint(x, y + 20), f"Nota {i}"))
+    return items
+
+
+def run_desktop(name, repeat):
+    """Time every case on desktop *name*; the cases are ``{case: summary}``."""
+    screens = DESKTOPS[name]
+    tmp = start_offscreen(screens)
+    app = start_app(tmp)
+
+    import numpy as np
+    from PyQt6.QtCore import QRect, QSettings
+    from PyQt6.QtWidgets import QApplication
+
+    from src.core import capture
+    from src.core.capture import Frame
+    from src.core.export import save_image
+    from src.core.recording import DeltaRing, EXTENSIONS, FORMATS, encode_animation
+    from src.core.tilestore import TileStore
+    from src.ui.overlay import SnippingOverlay
+
+    # Edge detection only feeds snapping, and would run alongside the cases
+    QSettings("Webtechcrafter", "PixelCatchr").setValue("snap_to_elements", False)
+
+    right, bottom = fake_monitors(screens)
+    desktop = synthetic_desktop(right, bottom)
+    frame = Frame(desktop.tobytes(), right, bottom)
+    cases = {}
+
+    def settle(overlay):
+        # The image pyramids are built on threads once the windows are up
+        app.processEvents()
+        for surface in overlay.surfaces:
+            if surface.pyramid is not None and surface.pyramid._thread is not None:
+                surface.pyramid._thread.join()
+        app.processEvents()
+
+    def close(overlay):
+        settle(overlay)
+        overlay.close()
+        app.processEvents()
+
+    def open_overlay():
+        overlay = SnippingOverlay(frame)
+        app.processEvents()
+        return overlay
+
+    cases["overlay.open"] = measure(open_overlay, repeat, teardown=close)
+
+    overlay = open_overlay()
+    settle(overlay)
+
+    monitors = capture.monitors()[1:]
+
+    def stitch():
+        image = frame.to_qimage()
+        return [overlay._screen_pixmap(screen, image, frame, monitors) for screen in QApplication.screens()]
+
+    cases["capture.stitch"] = measure(stitch, repeat)
+
+    overlay.select_all()
+    overlay.toolbar.hide()
+    app.processEvents()
+    whole = overlay.rect()
+
+    def repaint_all():
+        for surface in overlay.surfaces:
+            surface.repaint()
+
+    added = []
+    for count in ANNOTATION_COUNTS:
+        for item in make_annotations(count - len(added), whole, seed=len(added)):
+            overlay._insert_annotation(item)
+            added.append(item)
+        app.processEvents()
+        cases[f"paint.{count}"] = measure(repaint_all, repeat)
+        cases[f"export.{count}"] = measure(overlay._get_capture_image, repeat)
+
+    first = overlay.surfaces[0].area
+    blur_rects = {
+        "blur.small": QRect(first.center().x() - 200, first.center().y() - 150, 400, 300),
+        "blur.screen": QRect(first),
+    }
+    if len(overlay.surfaces) > 1:
+        second = overlay.surfaces[1].area
+        blur_rects["blur.span"] = QRect(first.right() - 300, first.top() + 200, 600, 400).intersected(
+            first.united(second)
+        )
+    for case, rect in blur_rects.items():
+        cases[case] = measure(lambda rect=rect: overlay._blur_rect(rect), repeat)
+
+    # Encoders, on the first screen with the annotations burned in
+    overlay.selection_rect = QRect(first)
+    image = overlay._get_capture_image()
+    out = tempfile.mkdtemp(prefix="pixelcatchr-bench-", dir=tmp)
+    for fmt in IMAGE_FORMATS:
+        path = os.path.join(out, f"capture.{fmt}")
+        cases[f"encode.{fmt}"] = measure(lambda fmt=fmt, path=path: save_image(image, path, fmt), repeat)
+        cases[f"encode.{fmt}"]["bytes"] = os.path.getsize(path)
+    close(overlay)
+
+    m = monitors[0]
+    screen_px = desktop[m["top"]:m["top"] + m["height"], m["left"]:m["left"] + m["width"]]
+    h, w = screen_px.shape[0] // 2, screen_px.shape[1] // 2
+    region = np.ascontiguousarray(screen_px[:h, :w])
+    ring = DeltaRing(ANIMATION_FRAMES + 1, 1 << 30)
+    prev = None
+    for i in range(ANIMATION_FRAMES):
+        # A window sliding across the region, like a recorded drag
+        arr = region.copy()
+        x = i * (w - w // 4) // ANIMATION_FRAMES
+        arr[h // 4:h // 2, x:x + w // 4] = np.uint32(0xFF3060C0)
+        ring.push(arr, prev, i / 15)
+        prev = arr
+    for fmt in FORMATS:
+        path = os.path.join(out, f"recording.{EXTENSIONS[fmt]}")
+        encode = lambda fmt=fmt, path=path: encode_animation(ring, (w, h), fmt, path)  # noqa: E731
+        cases[f"encode.anim.{fmt}"] = measure(encode, repeat)
+        cases[f"encode.anim.{fmt}"]["bytes"] = os.path.getsize(path)
+        cases[f"encode.anim.{fmt}"]["peak_mb"] = peak_mb(encode)
+
+    store = TileStore(os.path.join(out, "tiles"))
+    counter = iter(range(1 << 30))
+
+    def next_frame():
+        i = next(counter)
+        arr = screen_px.copy()
+        x = (i * 97) % max(1, arr.shape[1] - 400)
+        arr[100:400, x:x + 400] = np.uint32(0xFF000000 | (i * 2654435761 & 0xFFFFFF))
+        return i, arr
+
+    cases["encode.tiles"] = measure(lambda args: store.put(f"frame{args[0]}", args[1]), repeat, setup=next_frame)
+    store.close()
+
+    return {"screens": screens, "desktop_px": [right, bottom], "cases": cases}
@@ -0,0 +1,170 @@
+"""Offscreen benchmarks: capture stitching, painting, blur, export, encoders.
+
+Usage:
+    python benchmarks/run.py [--desktops 1080p,1440p,4k,3x4k] [--repeat 5]
+                             [--output results.json] [--compare baseline.json]
+                             [--threshold 0.25] [--min-ms 1.0]
+
+Every desktop (see ``DESKTOPS`` in ``cases.py``) runs in its own process on
+Qt's offscreen platform with a synthetic screenshot, so nothing is drawn
+on screen and one desktop's memory does not weigh on the next. Each case
+reports min/median/mean/max milliseconds over ``--repeat`` runs.
+
+``--compare`` checks the results against a file written earlier with
+``--output``. A case regresses when its median is more than ``--threshold``
+(a fraction) slower than the baseline's *and* at least ``--min-ms`` slower,
+so sub-millisecond noise does not count. Cases that report ``peak_mb``
+regress the same way when their memory grows by over ``--threshold`` and
+at least ``MIN_PEAK_MB``. Exits 1 on any regression. Only compare results
+taken on the same machine.
+
+    python benchmarks/run.py --output baseline.json
+    # ... change something ...
+    python benchmarks/run.py --compare baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from benchmarks.cases import DESKTOPS  # noqa: E402
+
+FORMAT_VERSION = 1
+# Smaller changes of a case's peak memory are noise
+MIN_PEAK_MB = 16
+
+
+def run_worker(name, repeat):
+    """Run desktop *name* in a child process; returns its results."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    env.pop("PIXELCATCHR_TRACE", None)
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", name, "--repeat", str(repeat)],
+        capture_output=True, text=True, env=env,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"{name}: el benchmark falló (código {proc.returncode})")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def environment():
+    from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+
+    return {
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def print_results(results):
+    for name, desktop in results["desktops"].items():
+        w, h = desktop["desktop_px"]
+        print(f"\n{name}: {len(desktop['screens'])} pantalla(s), {w}x{h} px")
+        print(f"  {'':22}{'min':>10}{'median':>10}{'max':>10}  ms")
+        for case, s in desktop["cases"].items():
+            size = f"  {s['bytes'] / 1024:.0f} KiB" if "bytes" in s else ""
+            if s.get("peak_mb") is not None:
+                size += f", pico +{s['peak_mb']:.0f} MB"
+            print(f"  {case:22}{s['min']:>10.2f}{s['median']:>10.2f}{s['max']:>10.2f}{size}")
+
+
+def compare(results, baseline, threshold, min_ms):
+    """Print the change of every case in both files; returns the regressions."""
+    regressions = []
+    for name, desktop in results["desktops"].items():
+        base_cases = baseline.get("desktops", {}).get(name, {}).get("cases", {})
+        if not base_cases:
+            print(f"\n{name}: sin referencia")
+            continue
+        print(f"\n{name}: {'':13}{'referencia':>11}{'ahora':>10}{'cambio':>9}")
+        for case, s in desktop["cases"].items():
+            base = base_cases.get(case)
+            if base is None:
+                print(f"  {case:22}{'-':>11}{s['median']:>10.2f}     nuevo")
+                continue
+            old, new = base["median"], s["median"]
+            change = (new - old) / old if old else 0.0
+            flag = ""
+            if new > old * (1 + threshold) and new - old >= min_ms:
+                flag = "  REGRESIÓN"
+                regressions.append(f"{name} {case}: {old:.2f} -> {new:.2f} ms ({change:+.0%})")
+            print(f"  {case:22}{old:>11.2f}{new:>10.2f}{change:>+9.0%}{flag}")
+            old_mb, new_mb = base.get("peak_mb"), s.get("peak_mb")
+            if old_mb is not None and new_mb is not None and new_mb > old_mb * (1 + threshold) \
+                    and new_mb - old_mb >= MIN_PEAK_MB:
+                print(f"  {'':22}{old_mb:>8.0f} MB{new_mb:>7.0f} MB  REGRESIÓN de memoria")
+                regressions.append(f"{name} {case}: pico de memoria {old_mb:.0f} -> {new_mb:.0f} MB")
+        for case in base_cases.keys() - desktop["cases"].keys():
+            print(f"  {case:22}{base_cases[case]['median']:>11.2f}{'-':>10}  eliminado")
+    if baseline.get("environment") != results.get("environment"):
+        print("\nAviso: la referencia se tomó en otro entorno "
+              f"({baseline.get('environment')} frente a {results.get('environment')})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--desktops", default=",".join(DESKTOPS),
+                        help=f"comma-separated, from {', '.join(DESKTOPS)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="flag regressions against this results file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        from benchmarks.cases import run_desktop
+
+        result = run_desktop(args.worker, args.repeat)
+        print(json.dumps(result))
+        # The overlay's windows and threads are not worth tearing down
+        sys.stdout.flush()
+        os._exit(0)
+
+    names = [n.strip() for n in args.desktops.split(",") if n.strip()]
+    unknown = [n for n in names if n not in DESKTOPS]
+    if unknown:
+        parser.error(f"unknown desktop(s): {', '.join(unknown)}")
+
+    results = {
+        "version": FORMAT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "repeat": args.repeat,
+        "environment": environment(),
+        "desktops": {},
+    }
+    for name in names:
+        t = time.perf_counter()
+        results["desktops"][name] = run_worker(name, args.repeat)
+        print(f"{name}: {time.perf_counter() - t:.1f} s", file=sys.stderr)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print("\nFAIL: " + "\n      ".join(regressions))
+            sys.exit(1)
+        print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,34 @@
 import sys
 import os
+import argparse
 
 # Ensure the project root is in sys.path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from src.core.instance import forward_command
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="PixelCatchr")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--capture", dest="command", action="store_const", const="capture",
+                       help="start a zone capture")
+    group.add_argument("--full", dest="command", action="store_const", const="full",
+                       help="capture the whole screen")
+    group.add_argument("--settings", dest="command", action="store_const", const="settings",
+                       help="open the settings window")
+    return parser.parse_args()
 
-from src.main import PixelCatchrApp
 
 if __name__ == "__main__":
-    app = PixelCatchrApp()
+    args = parse_args()
+
+    # If PixelCatchr is already running, hand the command over and exit
+    # before any Qt widget (or QApplication) is created.
+    if forward_command(args.command or "activate"):
+        sys.exit(0)
+
+    from src.main import PixelCatchrApp
+
+    app = PixelCatchrApp(initial_command=args.command)
     app.run()
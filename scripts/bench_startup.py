@@ -0,0 +1,108 @@
+"""Startup benchmark: time-to-tray plus ``-X importtime`` breakdown.
+
+Launches ``run.py`` with PIXELCATCHR_STARTUP_PROBE=1 (the app reports when the
+tray is up, warms up, then quits) and parses the import log. Fails (exit 1)
+when the tray takes longer than the budget or a deferred module is imported
+before the tray is shown.
+
+Usage:
+    python scripts/bench_startup.py [--runs 5] [--budget-ms 1500] [--top 15] [--json out.json]
+
+Runs headless in CI with QT_QPA_PLATFORM=offscreen (set by default here).
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+
+# Modules that must not be imported before the tray icon is shown
+DEFERRED = ("src.ui.overlay", "src.ui.toolbar", "src.ui.settings", "src.ui.icons", "src.core.scheduler", "src.core.automation", "src.core.timelapse", "src.core.scrolling", "src.core.recording", "src.core.tilestore", "src.core.stability", "src.core.screens", "src.core.pyramid", "src.core.snapping", "src.core.annotations", "src.core.history", "src.core.strokes", "src.core.pacing", "src.core.trace", "numpy", "PIL", "qtawesome", "mss")
+
+IMPORT_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)")
+PROBE_RE = re.compile(r"^startup: (\w+)=([\d.]+)")
+
+
+def run_once():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["PIXELCATCHR_STARTUP_PROBE"] = "1"
+
+    t0 = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "run.py")],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    wall_ms = (time.perf_counter() - t0) * 1000
+
+    result = {"wall_ms": wall_ms, "imports_before_tray": {}, "imports_after_tray": {}}
+    phase = "imports_before_tray"
+    for line in proc.stderr.splitlines():
+        m = PROBE_RE.match(line)
+        if m:
+            result[m.group(1)] = float(m.group(2))
+            phase = "imports_after_tray"
+            continue
+        m = IMPORT_RE.match(line)
+        if m:
+            result[phase][m.group(3)] = int(m.group(2)) / 1000
+
+    if "tray_ready_ms" not in result:
+        sys.stderr.write(proc.stderr[-4000:])
+        raise SystemExit(f"App did not report startup (exit code {proc.returncode})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    tray_ms = statistics.median(r["tray_ready_ms"] for r in runs)
+    warm_ms = statistics.median(r.get("warm_ms", 0.0) for r in runs)
+    wall_ms = statistics.median(r["wall_ms"] for r in runs)
+    before = runs[-1]["imports_before_tray"]
+
+    print(f"time to tray (median of {args.runs}): {tray_ms:.1f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"warm-up done:                 {warm_ms:.1f} ms")
+    print(f"process wall time:            {wall_ms:.1f} ms")
+    print("\nslowest imports before tray (cumulative ms):")
+    for name, ms in sorted(before.items(), key=lambda kv: kv[1], reverse=True)[: args.top]:
+        print(f"  {ms:8.1f}  {name}")
+
+    leaked = sorted(m for m in before if m.startswith(DEFERRED))
+    failures = []
+    if tray_ms > args.budget_ms:
+        failures.append(f"time to tray {tray_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    if leaked:
+        failures.append(f"deferred modules imported before tray: {', '.join(leaked)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "tray_ready_ms": tray_ms,
+                "warm_ms": warm_ms,
+                "wall_ms": wall_ms,
+                "budget_ms": args.budget_ms,
+                "imports_before_tray": before,
+                "failures": failures,
+            }, f, indent=2)
+
+    if failures:
+        print("\nFAIL: " + "\n      ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    main()
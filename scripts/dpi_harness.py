@@ -0,0 +1,120 @@
+"""Check the capture pipeline on fake screens at several device pixel ratios.
+
+Usage: python scripts/dpi_harness.py
+
+Runs Qt's offscreen platform with five side-by-side screens at DPR 1, 1.25,
+1.5, 1.75 and 2 (Windows-style scaling: native top-left, size / DPR). A
+synthetic physical-pixel frame is passed to SnippingOverlay, and selections
+on every screen must export exactly the frame's pixels at the physical
+rectangle ``selection_region()`` reports. Spanning selections must come out
+at the highest DPR involved. Exits non-zero on any mismatch.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+DPRS = (1.0, 1.25, 1.5, 1.75, 2.0)
+NATIVE_W, NATIVE_H = 1600, 900
+
+tmp = tempfile.mkdtemp(prefix="pixelcatchr-dpi-")
+screens, x = [], 0
+for i, dpr in enumerate(DPRS):
+    screens.append({
+        "name": f"fake{i}", "x": x, "y": 0, "width": NATIVE_W, "height": NATIVE_H,
+        "logicalDpi": 96 * dpr, "logicalBaseDpi": 96, "dpr": 1,
+    })
+    x += NATIVE_W
+config = os.path.join(tmp, "screens.json")
+with open(config, "w") as f:
+    json.dump({"screens": screens}, f)
+os.environ["QT_QPA_PLATFORM"] = f"offscreen:configfile={config}"
+
+import numpy as np
+from PyQt6.QtCore import QRect, QSettings, Qt
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+# Keep the user's settings out of it
+QSettings.setDefaultFormat(QSettings.Format.IniFormat)
+QSettings.setPath(QSettings.Format.IniFormat, QSettings.Scope.UserScope, tmp)
+app = QApplication(sys.argv[:1])
+QSettings("Webtechcrafter", "PixelCatchr").setValue("show_datetime", False)
+
+from src.core import capture
+from src.core.capture import Frame
+from src.core.screens import native_geometry
+from src.ui.overlay import SnippingOverlay
+
+failures = []
+
+# Every pixel of the fake desktop has a distinct-enough color
+ys, xs = np.mgrid[0:NATIVE_H, 0:x].astype(np.uint32)
+desktop = (xs * np.uint32(2654435761) + ys * np.uint32(40503)) & np.uint32(0xFFFFFF) | np.uint32(0xFF000000)
+frame = Frame(desktop.tobytes(), x, NATIVE_H)
+
+
+def pixels(image):
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    rows = np.frombuffer(ptr, dtype=np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()]
+
+
+# What mss would report for these monitors (index 0 is the whole desktop)
+capture.monitors = lambda: [{"left": 0, "top": 0, "width": x, "height": NATIVE_H}] + [
+    {"left": s["x"], "top": s["y"], "width": s["width"], "height": s["height"]} for s in screens
+]
+
+overlay = SnippingOverlay(frame)
+
+for surface, spec in zip(overlay.surfaces, screens):
+    screen = surface.screen()
+    expected = QRect(spec["x"], spec["y"], spec["width"], spec["height"])
+    native = native_geometry(screen, capture.monitors()[1:])
+    if native != expected:
+        failures.append(f"{spec['name']}: native geometry {native} != {expected}")
+    if surface.pixmap.size() != expected.size():
+        failures.append(f"{spec['name']}: surface holds {surface.pixmap.size()}, not {expected.size()}")
+
+    area = surface.area
+    for sel in (
+        QRect(area.left() + 7, area.top() + 11, 101, 53),
+        QRect(area.left() + 33, area.top() + 40, 250, 131),
+        QRect(area),
+    ):
+        overlay.selection_rect = sel
+        region = overlay.selection_region()
+        t0 = time.perf_counter()
+        image = overlay._get_capture_image()
+        ms = (time.perf_counter() - t0) * 1000
+        got = pixels(image)
+        want = desktop[region["top"]:region["top"] + region["height"],
+                       region["left"]:region["left"] + region["width"]]
+        status = "ok"
+        if got.shape != want.shape or not np.array_equal(got & 0xFFFFFF, want & 0xFFFFFF):
+            status = "MISMATCH"
+            failures.append(f"{spec['name']} {sel.getRect()}: export differs from native pixels")
+        print(f"dpr={screen.devicePixelRatio():<5} sel={sel.getRect()} -> {region} "
+              f"{image.width()}x{image.height()} {ms:.1f}ms {status}")
+
+# Spanning selection: composed at the highest DPR involved
+first, second = overlay.surfaces[0], overlay.surfaces[1]
+overlay.selection_rect = QRect(first.area.right() - 99, 10, 200, 100)
+image = overlay._get_capture_image()
+dpr = second.screen().devicePixelRatio()
+if image.devicePixelRatio() != dpr or image.width() != round(200 * dpr):
+    failures.append(f"spanning selection: {image.width()}x{image.height()} @ {image.devicePixelRatio()}")
+print(f"spanning sel -> {image.width()}x{image.height()} @ dpr {image.devicePixelRatio()}")
+
+overlay.close()
+
+if failures:
+    print("\n".join(failures))
+    sys.exit(1)
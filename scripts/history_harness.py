@@ -0,0 +1,82 @@
+"""Check History's memory budget with a stand-in document (no Qt needed).
+
+Usage: python scripts/history_harness.py
+Exits non-zero if the history evicts the wrong steps.
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from src.core.history import COMMAND_BYTES, AddAnnotation, History, RemoveAnnotation
+
+MB = 1024 * 1024
+
+
+class Item:
+    def __init__(self, size):
+        self.size = size
+
+    def nbytes(self):
+        return self.size
+
+
+class Document:
+    def __init__(self):
+        self.items = []
+
+    def _insert_annotation(self, item, position, z):
+        self.items.insert(position, item)
+
+    def _remove_annotation(self, item):
+        position = self.items.index(item)
+        self.items.pop(position)
+        return position, 0
+
+
+failures = []
+
+
+def expect(what, got, wanted):
+    if got != wanted:
+        failures.append(f"{what}: expected {wanted}, got {got}")
+
+
+def add(history, size):
+    item = Item(size)
+    history.doc.items.append(item)
+    history.record(AddAnnotation(item))
+
+
+# 1. Two large undone blurs over budget: the oldest one is dropped from the
+#    redo stack; the strokes, which free nothing, stay undoable
+history = History(Document(), limit_bytes=40 * MB)
+for _ in range(50):
+    add(history, 2 * 1024)
+for _ in range(3):
+    add(history, 33 * MB)
+history.undo()
+history.undo()
+expect("undo steps", len(history), 51)
+expect("redo steps", len(history._redo), 1)
+expect("evicted", history.evicted, 1)
+expect("nbytes", history.nbytes, 52 * COMMAND_BYTES + 33 * MB)
+
+# 2. A deleted blur in an older undo step is what frees memory: the steps
+#    up to and including its deletion go, the newest stays
+history = History(Document(), limit_bytes=40 * MB)
+add(history, 33 * MB)
+blur = history.doc.items[-1]
+add(history, 2 * 1024)
+history.record(RemoveAnnotation(blur, *history.doc._remove_annotation(blur)))
+add(history, 2 * 1024)
+add(history, 33 * MB)
+history.undo()
+expect("undo steps after deletion", len(history), 1)
+expect("redo steps after deletion", len(history._redo), 1)
+expect("evicted after deletion", history.evicted, 3)
+
+if failures:
+    print("\n".join(failures))
+    sys.exit(1)
+print("OK")
@@ -0,0 +1,69 @@
+"""Drive GlobalHotkeyListener with synthetic key events (no OS hook needed).
+
+Usage: python scripts/hotkey_harness.py
+Exits non-zero if a hotkey does not fire as expected. Needs a real pynput
+backend (X11, Windows or macOS): the dummy backend maps every special key
+to the same value.
+"""
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from PyQt6.QtCore import QSettings
+from src.core.hotkeys import GlobalHotkeyListener
+
+fired = []
+
+listener = GlobalHotkeyListener()
+listener.settings = QSettings(QSettings.Format.IniFormat, QSettings.Scope.UserScope, "Webtechcrafter", "PixelCatchrHarness")
+listener.settings.clear()
+listener.on_zone_capture = lambda: fired.append("zone")
+listener.on_full_capture = lambda: fired.append("full")
+listener.on_datetime_toggle = lambda: fired.append("datetime")
+listener.reload()
+
+failures = []
+
+def expect(combo, names):
+    fired.clear()
+    try:
+        listener.inject(combo)
+    except ValueError:
+        failures.append(f"{combo}: this pynput backend cannot tell its keys apart")
+        return
+    if sorted(fired) != sorted(names):
+        failures.append(f"{combo}: expected {names}, got {fired}")
+
+# 1. Defaults
+expect("<alt>+d", ["datetime"])
+listener.DEBOUNCE_MS = 0
+expect("<print_screen>", ["zone"])
+
+# 2. Overlapping combinations: Ctrl+Print is only the full capture
+expect("<ctrl>+<print_screen>", ["full"])
+expect("<print_screen>", ["zone"])
+
+# 3. Debounce: a second press inside the window is swallowed
+listener.DEBOUNCE_MS = 10_000
+expect("<alt>+d", [])
+listener.DEBOUNCE_MS = 0
+
+# 4. Live reconfiguration: the old binding stops, the new one fires
+listener.settings.setValue("hk_datetime", "Ctrl+T")
+listener.reload()
+expect("<alt>+d", [])
+expect("<ctrl>+t", ["datetime"])
+
+listener.settings.clear()
+
+for name, s in listener.stats().items():
+    print(f"{name:9s} count={s['count']:3d} debounced={s['debounced']:3d} "
+          f"mean={s['mean_ms']:.3f}ms max={s['max_ms']:.3f}ms")
+
+if failures:
+    print("\n".join(failures))
+    sys.exit(1)
+print("OK")
@@ -0,0 +1,314 @@
+"""Replay an overlay input trace offscreen and time it.
+
+Usage:
+    python scripts/replay_trace.py TRACE [--json]
+    python scripts/replay_trace.py --synthetic {drag,strokes} [--write TRACE] [--json]
+
+TRACE is a file recorded with ``PIXELCATCHR_TRACE=<file>`` (see
+``src/core/trace.py``). ``--synthetic`` builds a fixed trace instead:
+``drag`` hovers, drags out a selection, resizes and moves it; ``strokes``
+draws 500 pen and highlighter strokes on a selection. ``--write`` saves it
+so it can be replayed or shared as is.
+
+The overlay runs on Qt's offscreen platform with the trace's screens and
+a synthetic screenshot. Replay runs on the trace's clock, not the wall
+clock: frames fall every 1/refresh s of trace time, and each one flushes
+the frame pacer and lets Qt paint. Results are therefore the same on a
+slow or busy machine, apart from the timings themselves. Reported:
+
+* per event kind, the time to handle the event (``sendEvent``);
+* per frame, the paced ``mouse_move`` and the paint time of each window;
+* the export of the final selection (``_get_capture_image``).
+
+The text tool's input dialog is answered with a fixed string. "save",
+"scroll" and "record" would open dialogs or leave the overlay, so those
+actions are skipped.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from src.core import trace as tr
+
+DEFAULT_SCREENS = [{"x": 0, "y": 0, "width": 1920, "height": 1080, "dpr": 1.0, "refresh": 60.0}]
+LEFT = 1  # Qt.MouseButton.LeftButton
+INPUT_HZ = 1000
+
+
+# ---------------------------------------------------------------------------
+# Synthetic traces
+# ---------------------------------------------------------------------------
+class TraceBuilder:
+    """Writes records at a 1000 Hz pointer rate on one screen."""
+
+    def __init__(self):
+        self.records = []
+        self.t = 0.0
+
+    def wait(self, seconds):
+        self.t += seconds
+
+    def add(self, kind, x=0.0, y=0.0, button=0, buttons=0, data=0):
+        self.records.append(tr.Record(self.t, kind, 0, button, buttons, 0, x, y, data))
+
+    def move(self, points, buttons=0):
+        for x, y in points:
+            self.wait(1 / INPUT_HZ)
+            self.add(tr.MOVE, x, y, buttons=buttons)
+
+    def drag(self, points):
+        (x, y), rest = points[0], points[1:]
+        self.add(tr.PRESS, x, y, LEFT, LEFT)
+        self.move(rest, LEFT)
+        x, y = points[-1]
+        self.wait(1 / INPUT_HZ)
+        self.add(tr.RELEASE, x, y, LEFT, 0)
+
+    def pick(self, kind, names, name):
+        self.wait(0.05)
+        self.add(kind, data=names.index(name))
+
+
+def line(a, b, ms):
+    n = max(2, int(ms))
+    return [(a[0] + (b[0] - a[0]) * i / (n - 1), a[1] + (b[1] - a[1]) * i / (n - 1)) for i in range(n)]
+
+
+def synthetic_drag():
+    b = TraceBuilder()
+    b.move([(400 + 300 * math.cos(i / 80), 400 + 200 * math.sin(i / 60)) for i in range(500)])
+    b.drag(line((200, 150), (1400, 900), 1500))
+    b.wait(0.2)
+    # Bottom-right handle, then the middle of the selection
+    b.drag(line((1400, 900), (1600, 980), 500))
+    b.wait(0.2)
+    b.drag(line((900, 560), (700, 400), 500))
+    return tr.Trace(DEFAULT_SCREENS, b.records)
+
+
+def synthetic_strokes(count=500):
+    b = TraceBuilder()
+    b.drag(line((100, 80), (1800, 1000), 300))
+    b.pick(tr.TOOL, tr.TOOLS, "pen")
+    for i in range(count):
+        if i % 50 == 25:
+            b.pick(tr.TOOL, tr.TOOLS, "highlighter")
+        elif i % 50 == 0 and i:
+            b.pick(tr.TOOL, tr.TOOLS, "pen")
+        # A short wavy stroke on a grid over the selection
+        x0 = 150 + (i * 97) % 1500
+        y0 = 120 + (i * 53) % 820
+        b.drag([(x0 + j * 3, y0 + 12 * math.sin(j / 4 + i)) for j in range(40)])
+        b.wait(0.02)
+    return tr.Trace(DEFAULT_SCREENS, b.records)
+
+
+SYNTHETIC = {"drag": synthetic_drag, "strokes": synthetic_strokes}
+
+
+# ---------------------------------------------------------------------------
+# Offscreen overlay
+# ---------------------------------------------------------------------------
+def start_offscreen(screens):
+    """Point Qt's offscreen platform at *screens*; returns the temp folder."""
+    tmp = tempfile.mkdtemp(prefix="pixelcatchr-replay-")
+    config = [{
+        "name": f"replay{i}", "x": s["x"], "y": s["y"],
+        "width": round(s["width"] * s["dpr"]), "height": round(s["height"] * s["dpr"]),
+        "logicalDpi": 96 * s["dpr"], "logicalBaseDpi": 96, "dpr": 1,
+    } for i, s in enumerate(screens)]
+    path = os.path.join(tmp, "screens.json")
+    with open(path, "w") as f:
+        json.dump({"screens": config}, f)
+    os.environ["QT_QPA_PLATFORM"] = f"offscreen:configfile={path}"
+    return tmp
+
+
+def synthetic_desktop(width, height):
+    """Windows and panels on a gradient, so snapping has edges to find."""
+    import numpy as np
+
+    ys, xs = np.mgrid[0:height, 0:width].astype(np.uint32)
+    desktop = (xs * 255 // max(1, width)) << 16 | (ys * 255 // max(1, height)) << 8 | np.uint32(0x40)
+    rng = np.random.default_rng(7)
+    for _ in range(60):
+        w, h = rng.integers(80, max(81, width // 3)), rng.integers(60, max(61, height // 3))
+        x, y = rng.integers(0, max(1, width - w)), rng.integers(0, max(1, height - h))
+        desktop[y:y + h, x:x + w] = rng.integers(0, 0xFFFFFF)
+        desktop[y:y + 24, x:x + w] = rng.integers(0, 0xFFFFFF)
+    return (desktop | np.uint32(0xFF000000)).astype(np.uint32)
+
+
+def percentiles(values):
+    import numpy as np
+
+    if not values:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {"count": len(values), "p50": p50, "p95": p95, "p99": p99, "max": max(values),
+            "total": sum(values)}
+
+
+def start_app(settings_dir):
+    """The QApplication, with settings kept in *settings_dir*."""
+    from PyQt6.QtCore import QSettings, Qt
+    from PyQt6.QtWidgets import QApplication
+
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    QSettings.setDefaultFormat(QSettings.Format.IniFormat)
+    QSettings.setPath(QSettings.Format.IniFormat, QSettings.Scope.UserScope, settings_dir)
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+def fake_monitors(screens):
+    """Make ``capture.monitors`` describe *screens*; returns the desktop's
+    physical size."""
+    from src.core import capture
+
+    monitors = [{"left": s["x"], "top": s["y"], "width": round(s["width"] * s["dpr"]),
+                 "height": round(s["height"] * s["dpr"])} for s in screens]
+    right = max(m["left"] + m["width"] for m in monitors)
+    bottom = max(m["top"] + m["height"] for m in monitors)
+    capture.monitors = lambda: [{"left": 0, "top": 0, "width": right, "height": bottom}] + monitors
+    return right, bottom
+
+
+def replay(trace, settings_dir):
+    """Replay *trace*; returns the timings as a dict of millisecond stats."""
+    from PyQt6.QtWidgets import QApplication, QInputDialog
+
+    app = start_app(settings_dir)
+
+    from src.core.capture import Frame
+    from src.core.pacing import FrameStats
+    from src.ui.overlay import SnippingOverlay
+
+    screens = trace.screens or DEFAULT_SCREENS
+    right, bottom = fake_monitors(screens)
+    QInputDialog.getText = staticmethod(lambda *args, **kwargs: ("Texto de prueba", True))
+
+    paints = []
+
+    class LoggedStats(FrameStats):
+        __slots__ = ()
+
+        def add(self, ms):
+            super().add(ms)
+            paints.append(ms)
+
+    t0 = time.perf_counter()
+    overlay = SnippingOverlay(Frame(synthetic_desktop(right, bottom).tobytes(), right, bottom))
+    app.processEvents()
+    open_ms = (time.perf_counter() - t0) * 1000
+    overlay.frame_stats = LoggedStats()
+    del paints[:]
+
+    refresh = max(s.get("refresh") or 60.0 for s in screens)
+    period = 1.0 / refresh
+    handling = {}
+    frames, frame_paints = [], []
+    next_frame = period
+    closed = False
+
+    def run_frame():
+        start = len(paints)
+        t = time.perf_counter()
+        overlay.pacer.flush()
+        app.processEvents()
+        frames.append((time.perf_counter() - t) * 1000)
+        frame_paints.extend(paints[start:])
+
+    names = {tr.PRESS: "press", tr.RELEASE: "release", tr.MOVE: "move", tr.DOUBLE_CLICK: "double_click",
+             tr.WHEEL: "wheel", tr.KEY_PRESS: "key_press", tr.KEY_RELEASE: "key_release",
+             tr.TOOL: "tool", tr.ACTION: "action"}
+    for record in trace.records:
+        while next_frame <= record.t:
+            run_frame()
+            next_frame += period
+        t = time.perf_counter()
+        if record.kind == tr.TOOL:
+            overlay.toolbar.tool_selected.emit(tr.TOOLS[record.data])
+        elif record.kind == tr.ACTION:
+            action = tr.ACTIONS[record.data]
+            if action in ("save", "scroll", "record"):
+                continue
+            overlay.handle_action(action)
+            closed = action in ("copy", "close")
+        else:
+            surface = overlay.surfaces[min(record.surface, len(overlay.surfaces) - 1)]
+            QApplication.sendEvent(surface, record.to_event())
+        handling.setdefault(names[record.kind], []).append((time.perf_counter() - t) * 1000)
+        if closed:
+            break
+    run_frame()
+
+    export_ms = None
+    if overlay.selection_done and not closed:
+        t = time.perf_counter()
+        overlay._get_capture_image()
+        export_ms = (time.perf_counter() - t) * 1000
+
+    result = {
+        "records": len(trace.records),
+        "duration_s": trace.duration,
+        "open_ms": open_ms,
+        "events": {name: percentiles(values) for name, values in sorted(handling.items())},
+        "frame_ms": percentiles(frames),
+        "paint_ms": percentiles(frame_paints),
+        "export_ms": export_ms,
+        "annotations": len(overlay.annotations),
+    }
+    overlay.close()
+    app.processEvents()
+    return result
+
+
+def print_report(name, result):
+    print(f"{name}: {result['records']} eventos, {result['duration_s']:.1f} s de traza, "
+          f"{result['annotations']} anotaciones, overlay abierto en {result['open_ms']:.0f} ms")
+    rows = [(f"event {k}", v) for k, v in result["events"].items()]
+    rows += [("frame (flush + paint)", result["frame_ms"]), ("paint", result["paint_ms"])]
+    print(f"  {'':24}{'n':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  ms")
+    for label, s in rows:
+        if s["count"]:
+            print(f"  {label:24}{s['count']:>7}{s['p50']:>9.3f}{s['p95']:>9.3f}{s['p99']:>9.3f}{s['max']:>9.3f}")
+    if result["export_ms"] is not None:
+        print(f"  export {result['export_ms']:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", nargs="?", help="trace file to replay")
+    parser.add_argument("--synthetic", choices=sorted(SYNTHETIC), help="replay a built-in trace")
+    parser.add_argument("--write", metavar="TRACE", help="save the synthetic trace here")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+    if bool(args.trace) == bool(args.synthetic):
+        parser.error("give a trace file or --synthetic")
+
+    if args.synthetic:
+        trace = SYNTHETIC[args.synthetic]()
+        name = args.synthetic
+        if args.write:
+            trace.save(args.write)
+    else:
+        trace = tr.Trace.load(args.trace)
+        name = os.path.basename(args.trace)
+
+    tmp = start_offscreen(trace.screens or DEFAULT_SCREENS)
+    result = replay(trace, tmp)
+    if args.json:
+        print(json.dumps({name: result}, indent=2))
+    else:
+        print_report(name, result)
+
+
+if __name__ == "__main__":
+    main()
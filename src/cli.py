@@ -0,0 +1,256 @@
+"""Headless batch capture, without tray or overlay.
+
+Examples::
+
+    python -m src.cli                                   # one full-desktop capture
+    python -m src.cli --monitor 1 -o shots/ --repeat 100 --interval 0.5
+    python -m src.cli --region 0,0,1280,720 -o "shots/%H-%M-%S_{n}.jpg" --quality 85
+    python -m src.cli --tiles -o dashboard/ --repeat 0 --interval 10
+    python -m src.cli --unpack dashboard/ -o shots/
+
+``--output`` is a folder (files are named with the ``filename_pattern``
+setting) or a file pattern with strftime codes and ``{n}`` (capture index).
+Existing files are never overwritten: a clashing name gets ``_1``, ``_2``...
+``--tiles`` writes to a deduplicating tile store instead (see
+``src.core.tilestore``); ``--unpack`` turns a store back into images.
+Runs on Qt's offscreen platform unless QT_QPA_PLATFORM says otherwise.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Nothing here needs a window system; fonts for the timestamp still need a
+# QGuiApplication, which the offscreen platform provides.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSettings
+from PyQt6.QtGui import QGuiApplication
+
+from src.core import capture
+from src.core.export import burn_timestamp, default_filename, save_dir, save_image, unique_path
+
+FORMATS = ("png", "jpg", "bmp", "webp")
+
+
+def parse_region(value):
+    try:
+        left, top, width, height = (int(v) for v in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("la región debe ser LEFT,TOP,WIDTH,HEIGHT")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError("la región debe tener ancho y alto positivos")
+    return {"left": left, "top": top, "width": width, "height": height}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--region", type=parse_region, metavar="L,T,W,H",
+                        help="area in physical pixels of the virtual desktop")
+    target.add_argument("--monitor", type=int, metavar="N",
+                        help="monitor number (1 = first); default is the whole desktop")
+    parser.add_argument("-o", "--output", help="output folder or file pattern (default: save_dir setting)")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="image format (default: image_format setting)")
+    parser.add_argument("--quality", type=int, default=-1, help="0-100 for lossy formats")
+    parser.add_argument("-n", "--repeat", type=int, default=1, help="number of captures, 0 = until Ctrl+C")
+    parser.add_argument("-i", "--interval", type=float, default=0.0, help="seconds between captures")
+    stamp = parser.add_mutually_exclusive_group()
+    stamp.add_argument("--timestamp", dest="timestamp", action="store_true", default=None,
+                       help="burn the capture time into the image")
+    stamp.add_argument("--no-timestamp", dest="timestamp", action="store_false")
+    parser.add_argument("--wait-stable", action="store_true",
+                        help="wait until the screen stops changing before each capture")
+    parser.add_argument("--workers", type=int, default=2, help="encoder threads")
+    store = parser.add_mutually_exclusive_group()
+    store.add_argument("--tiles", action="store_true",
+                       help="store captures as deduplicated tiles in the --output folder")
+    store.add_argument("--unpack", metavar="STORE",
+                       help="rebuild every capture in a tile store as images in --output")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    return parser
+
+
+class BatchCapture:
+    """Grabs on the calling thread and encodes on a small pool.
+
+    Captures are scheduled against fixed deadlines (``start + n * interval``)
+    so encoding time never shifts the schedule. At most ``2 * workers``
+    frames wait for encoding; beyond that grabbing waits for the encoders.
+    """
+
+    def __init__(self, args, settings):
+        self.args = args
+        self.settings = settings
+        self.fmt = (args.format or settings.value("image_format", "PNG")).lower()
+        self.timestamp = args.timestamp
+        if self.timestamp is None:
+            self.timestamp = settings.value("show_datetime", True, type=bool)
+        self.pool = ThreadPoolExecutor(max(1, args.workers), thread_name_prefix="encoder")
+        self.slots = threading.BoundedSemaphore(2 * max(1, args.workers))
+        self.lock = threading.Lock()
+        self.saved = 0
+        self.failed = 0
+        # Paths given out to encoders that may not exist on disk yet
+        self.taken = set()
+
+    def output_path(self, index, when):
+        out = self.args.output
+        if not out:
+            return self._unique(save_dir(self.settings), self._default_name(when))
+        if os.path.isdir(out) or out.endswith(("/", os.sep)):
+            os.makedirs(out, exist_ok=True)
+            return self._unique(out, self._default_name(when))
+
+        path = when.strftime(out.replace("{n}", str(index)))
+        if not os.path.splitext(path)[1]:
+            path += f".{self.fmt}"
+        folder, name = os.path.split(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        # A pattern without {n} (or with only coarse time codes) names
+        # several captures alike
+        return self._unique(folder, name)
+
+    def _unique(self, folder, name):
+        with self.lock:
+            path = unique_path(folder, name, self.taken)
+            self.taken.add(path)
+            return path
+
+    def _default_name(self, when):
+        name = default_filename(self.settings, when)
+        return os.path.splitext(name)[0] + f".{self.fmt}"
+
+    def grab(self):
+        if self.args.wait_stable:
+            from src.core.stability import wait_from_settings
+            frame, report = wait_from_settings(self.settings, self.args.region, self.args.monitor or 0)
+            if not self.args.quiet:
+                print(report.summary(), file=sys.stderr)
+            return frame
+        if self.args.region:
+            return capture.grab(self.args.region)
+        return capture.grab(monitor=self.args.monitor or 0)
+
+    def encode(self, frame, index):
+        try:
+            when = datetime.fromtimestamp(frame.timestamp)
+            img = frame.to_qimage()
+            if self.timestamp:
+                burn_timestamp(img, when)
+            path = self.output_path(index, when)
+            ok = save_image(img, path, self.fmt, self.args.quality)
+            with self.lock:
+                if ok:
+                    self.saved += 1
+                else:
+                    self.failed += 1
+            if not self.args.quiet:
+                print(path if ok else f"No se pudo guardar: {path}", flush=True)
+        except Exception as e:
+            with self.lock:
+                self.failed += 1
+            print(f"Error al guardar captura {index}: {e}", file=sys.stderr)
+        finally:
+            self.slots.release()
+
+    def run(self):
+        if self.args.tiles:
+            return self.run_tiles()
+        start = time.monotonic()
+        index = 0
+        try:
+            while self.args.repeat == 0 or index < self.args.repeat:
+                delay = start + index * self.args.interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                frame = self.grab()
+                self.slots.acquire()
+                self.pool.submit(self.encode, frame, index + 1)
+                index += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.pool.shutdown(wait=True)
+        return time.monotonic() - start
+
+
+    def run_tiles(self):
+        """Grab and store on this thread; only changed tiles are hashed and written."""
+        from src.core.tilestore import TileStore
+        from src.core.timelapse import frame_array
+
+        store = TileStore(self.args.output or os.path.join(save_dir(self.settings), "tiles"))
+        start = time.monotonic()
+        index = 0
+        try:
+            while self.args.repeat == 0 or index < self.args.repeat:
+                delay = start + index * self.args.interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                frame = self.grab()
+                name = os.path.splitext(self._default_name(datetime.fromtimestamp(frame.timestamp)))[0]
+                store.put(name, frame_array(frame), frame.timestamp)
+                self.saved += 1
+                index += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            store.close()
+        if not self.args.quiet:
+            print(store.stats.summary(), file=sys.stderr)
+        return time.monotonic() - start
+
+    def unpack(self):
+        from src.core.tilestore import TileStore
+
+        store = TileStore(self.args.unpack)
+        out = self.args.output or save_dir(self.settings)
+        os.makedirs(out, exist_ok=True)
+        start = time.monotonic()
+        try:
+            for name in store.names():
+                arr, timestamp = store.load(name)
+                frame = capture.Frame(arr.tobytes(), arr.shape[1], arr.shape[0], timestamp=timestamp)
+                img = frame.to_qimage()
+                if self.timestamp and timestamp:
+                    burn_timestamp(img, datetime.fromtimestamp(timestamp))
+                path = self._unique(out, f"{name}.{self.fmt}")
+                if save_image(img, path, self.fmt, self.args.quality):
+                    self.saved += 1
+                    if not self.args.quiet:
+                        print(path, flush=True)
+                else:
+                    self.failed += 1
+                    print(f"No se pudo guardar: {path}", file=sys.stderr)
+        finally:
+            store.close()
+        return time.monotonic() - start
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    batch = BatchCapture(args, QSettings("Webtechcrafter", "PixelCatchr"))
+    try:
+        elapsed = batch.unpack() if args.unpack else batch.run()
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if not args.quiet and batch.saved > 1:
+        print(f"{batch.saved} capturas en {elapsed:.2f} s ({batch.saved / elapsed:.1f}/s)", file=sys.stderr)
+    return 0 if batch.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,492 @@
+"""Overlay annotations: the model, how each kind is drawn, and a spatial index.
+
+Each kind is a small ``__slots__`` class that caches its bounding rect
+(stroke included) until its geometry changes. ``RENDERERS`` maps each
+class to the function that paints it, so drawing is one dict lookup
+instead of a chain of type comparisons. ``to_data``/``from_data`` turn an
+annotation into a compact JSON-able list and back.
+
+``AnnotationIndex`` files each annotation under the ``CELL`` x ``CELL`` grid
+cells its bounding box touches, so hit-tests and repaints only look at the
+annotations near a point or rectangle instead of all of them.
+"""
+import base64
+import collections
+import math
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QLineF, QPoint, QPointF, QRect, QRectF, Qt
+from PyQt6.QtGui import (
+    QColor,
+    QFontMetrics,
+    QPainterPath,
+    QPainterPathStroker,
+    QPen,
+    QPixmap,
+    QPolygonF,
+)
+
+ARROW_HEAD = 15
+# Rough size of an annotation object with its QColor and geometry, measured
+# with tracemalloc; used to budget the undo history
+OBJECT_BYTES = 512
+
+
+class Annotation:
+    """Base class; subclasses set ``kind`` and ``stroke_width``."""
+
+    __slots__ = ("color", "_bounds")
+
+    kind = ""
+    stroke_width = 0
+
+    def __init__(self, color):
+        self.color = QColor(color) if color is not None else None
+        self._bounds = None
+
+    def bounds(self) -> QRectF:
+        """Bounding rect in overlay coordinates, stroke included."""
+        if self._bounds is None:
+            pad = self.stroke_width / 2
+            self._bounds = self._shape_rect().adjusted(-pad, -pad, pad, pad)
+        return self._bounds
+
+    def changed(self):
+        """Call after changing the geometry in place."""
+        self._bounds = None
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this annotation."""
+        return OBJECT_BYTES
+
+    def _shape_rect(self) -> QRectF:
+        raise NotImplementedError
+
+    def translate(self, delta: QPoint):
+        raise NotImplementedError
+
+    def hits(self, p: QPointF, tolerance) -> bool:
+        """Whether *p* is on the drawn annotation (within *tolerance*)."""
+        return self.bounds().adjusted(-tolerance, -tolerance, tolerance, tolerance).contains(p)
+
+
+class Stroke(Annotation):
+    __slots__ = ("path",)
+
+    def __init__(self, color, path: QPainterPath):
+        super().__init__(color)
+        self.path = path
+
+    def _shape_rect(self):
+        return self.path.boundingRect()
+
+    def translate(self, delta):
+        self.path.translate(QPointF(delta))
+        self.changed()
+
+    def nbytes(self):
+        # Each path element is two doubles and a type
+        return OBJECT_BYTES + 24 * self.path.elementCount()
+
+    def hits(self, p, tolerance):
+        if not super().hits(p, tolerance):
+            return False
+        stroker = QPainterPathStroker()
+        stroker.setWidth(self.stroke_width + 2 * tolerance)
+        return stroker.createStroke(self.path).contains(p)
+
+
+class Pen(Stroke):
+    __slots__ = ()
+    kind = "pen"
+    stroke_width = 3
+
+
+class Highlighter(Stroke):
+    __slots__ = ()
+    kind = "highlighter"
+    stroke_width = 24
+
+
+class Rect(Annotation):
+    __slots__ = ("rect",)
+    kind = "rect"
+    stroke_width = 3
+
+    def __init__(self, color, rect: QRect):
+        super().__init__(color)
+        self.rect = rect
+
+    def _shape_rect(self):
+        return QRectF(self.rect)
+
+    def translate(self, delta):
+        self.rect = self.rect.translated(delta)
+        self.changed()
+
+    def hits(self, p, tolerance):
+        # Only the outline is drawn
+        reach = self.stroke_width / 2 + tolerance
+        rect = QRectF(self.rect)
+        inner = rect.adjusted(reach, reach, -reach, -reach)
+        return super().hits(p, tolerance) and not (inner.isValid() and inner.contains(p))
+
+
+class BlurPreview(Rect):
+    """The area being dragged with the blur tool; becomes an ``Image``."""
+
+    __slots__ = ()
+    kind = "blur"
+    stroke_width = 1
+
+
+class Arrow(Annotation):
+    __slots__ = ("line",)
+    kind = "arrow"
+    stroke_width = 3
+
+    def __init__(self, color, line: QLineF):
+        super().__init__(color)
+        self.line = line
+
+    def _shape_rect(self):
+        return QRectF(self.line.p1(), self.line.p2()).normalized().adjusted(
+            -ARROW_HEAD, -ARROW_HEAD, ARROW_HEAD, ARROW_HEAD
+        )
+
+    def translate(self, delta):
+        self.line = self.line.translated(QPointF(delta))
+        self.changed()
+
+    def hits(self, p, tolerance):
+        line = self.line
+        reach = self.stroke_width / 2 + tolerance
+        if math.hypot(p.x() - line.x2(), p.y() - line.y2()) <= ARROW_HEAD + tolerance:
+            return True
+        dx, dy = line.dx(), line.dy()
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else ((p.x() - line.x1()) * dx + (p.y() - line.y1()) * dy) / length_sq
+        t = min(1.0, max(0.0, t))
+        return math.hypot(p.x() - (line.x1() + t * dx), p.y() - (line.y1() + t * dy)) <= reach
+
+
+class Text(Annotation):
+    """Text drawn with ``painter.drawText(pos, text)``: *pos* is the baseline.
+
+    Sizes are measured once per string with the font given to ``set_font``.
+    """
+
+    __slots__ = ("pos", "text")
+    kind = "text"
+
+    TEXT_CACHE = 512
+    _metrics = None
+    _sizes = collections.OrderedDict()
+
+    def __init__(self, color, pos: QPoint, text: str):
+        super().__init__(color)
+        self.pos = pos
+        self.text = text
+
+    @classmethod
+    def set_font(cls, font):
+        cls._metrics = QFontMetrics(font)
+        cls._sizes = collections.OrderedDict()
+
+    def _shape_rect(self):
+        sizes = Text._sizes
+        size = sizes.get(self.text)
+        if size is None:
+            size = sizes[self.text] = (self._metrics.horizontalAdvance(self.text), self._metrics.height())
+            if len(sizes) > self.TEXT_CACHE:
+                sizes.popitem(last=False)
+        else:
+            sizes.move_to_end(self.text)
+        return QRectF(self.pos.x(), self.pos.y() - self._metrics.ascent(), size[0], size[1])
+
+    def translate(self, delta):
+        self.pos = self.pos + delta
+        self.changed()
+
+    def nbytes(self):
+        return OBJECT_BYTES + 2 * len(self.text)
+
+
+class Image(Annotation):
+    """A pixmap pasted over the capture (blurred patches)."""
+
+    __slots__ = ("pos", "pixmap")
+    kind = "image"
+
+    def __init__(self, pos: QPoint, pixmap: QPixmap):
+        super().__init__(None)
+        self.pos = pos
+        self.pixmap = pixmap
+
+    def _shape_rect(self):
+        return QRectF(QPointF(self.pos), self.pixmap.deviceIndependentSize())
+
+    def translate(self, delta):
+        self.pos = self.pos + delta
+        self.changed()
+
+    def nbytes(self):
+        return OBJECT_BYTES + self.pixmap.width() * self.pixmap.height() * self.pixmap.depth() // 8
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+def _stroke_pen(color, width):
+    return QPen(color, width, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
+
+
+def _render_pen(painter, item):
+    painter.setPen(_stroke_pen(item.color, item.stroke_width))
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawPath(item.path)
+
+
+def _render_highlighter(painter, item):
+    # Highlighter: thick, semi-transparent
+    c = QColor(item.color)
+    c.setAlpha(80)
+    painter.setPen(_stroke_pen(c, item.stroke_width))
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawPath(item.path)
+
+
+def _render_rect(painter, item):
+    painter.setPen(_stroke_pen(item.color, item.stroke_width))
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.drawRect(item.rect)
+
+
+def _render_blur_preview(painter, item):
+    # Preview while dragging
+    painter.setPen(QPen(QColor("white"), 1, Qt.PenStyle.DashLine))
+    painter.setBrush(QColor(255, 255, 255, 50))
+    painter.drawRect(item.rect)
+
+
+def _render_arrow(painter, item):
+    line = item.line
+    painter.setPen(_stroke_pen(item.color, item.stroke_width))
+    painter.drawLine(line)
+    angle = math.atan2(-line.dy(), line.dx())
+    p1 = line.p2() - QPointF(
+        ARROW_HEAD * math.cos(angle - math.pi / 6),
+        -ARROW_HEAD * math.sin(angle - math.pi / 6),
+    )
+    p2 = line.p2() - QPointF(
+        ARROW_HEAD * math.cos(angle + math.pi / 6),
+        -ARROW_HEAD * math.sin(angle + math.pi / 6),
+    )
+    painter.setBrush(item.color)
+    painter.drawPolygon(QPolygonF([line.p2(), p1, p2]))
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+
+
+def _render_text(painter, item):
+    painter.setPen(QPen(item.color, 3))
+    painter.drawText(item.pos, item.text)
+
+
+def _render_image(painter, item):
+    painter.drawPixmap(item.pos, item.pixmap)
+
+
+RENDERERS = {
+    Pen: _render_pen,
+    Highlighter: _render_highlighter,
+    Rect: _render_rect,
+    BlurPreview: _render_blur_preview,
+    Arrow: _render_arrow,
+    Text: _render_text,
+    Image: _render_image,
+}
+
+
+def draw_annotation(painter, item):
+    RENDERERS[type(item)](painter, item)
+
+
+# ---------------------------------------------------------------------------
+# Serialization: [kind, color (0xAARRGGBB or None), geometry...]
+# ---------------------------------------------------------------------------
+def _path_points(path):
+    """Flat coordinates of *path*, and whether it is made of cubics (smoothed
+    strokes: control, control, end after the first point) or lines."""
+    points = []
+    curved = False
+    for i in range(path.elementCount()):
+        e = path.elementAt(i)
+        curved = curved or e.isCurveTo()
+        points += (round(e.x, 1), round(e.y, 1))
+    return points, curved
+
+
+def _points_path(points, curved=False):
+    path = QPainterPath(QPointF(points[0], points[1]))
+    p = [QPointF(points[i], points[i + 1]) for i in range(2, len(points), 2)]
+    if curved:
+        for i in range(0, len(p) - 2, 3):
+            path.cubicTo(p[i], p[i + 1], p[i + 2])
+    else:
+        for point in p:
+            path.lineTo(point)
+    return path
+
+
+def _png_b64(pixmap):
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    pixmap.save(buffer, "PNG")
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def to_data(item) -> list:
+    color = item.color.rgba() if item.color is not None else None
+    if isinstance(item, Stroke):
+        geometry = list(_path_points(item.path))
+    elif isinstance(item, Rect):
+        geometry = [item.rect.x(), item.rect.y(), item.rect.width(), item.rect.height()]
+    elif isinstance(item, Arrow):
+        geometry = [item.line.x1(), item.line.y1(), item.line.x2(), item.line.y2()]
+    elif isinstance(item, Text):
+        geometry = [item.pos.x(), item.pos.y(), item.text]
+    elif isinstance(item, Image):
+        geometry = [item.pos.x(), item.pos.y(), item.pixmap.devicePixelRatio(), _png_b64(item.pixmap)]
+    else:
+        raise TypeError(f"Unknown annotation: {item!r}")
+    return [item.kind, color] + geometry
+
+
+_KINDS = {cls.kind: cls for cls in RENDERERS}
+
+
+def from_data(data):
+    kind, color, *g = data
+    cls = _KINDS[kind]
+    color = QColor.fromRgba(color) if color is not None else None
+    if issubclass(cls, Stroke):
+        return cls(color, _points_path(*g))
+    if issubclass(cls, Rect):
+        return cls(color, QRect(*g))
+    if cls is Arrow:
+        return cls(color, QLineF(*g))
+    if cls is Text:
+        return cls(color, QPoint(g[0], g[1]), g[2])
+    pixmap = QPixmap()
+    pixmap.loadFromData(base64.b64decode(g[3]), "PNG")
+    pixmap.setDevicePixelRatio(g[2])
+    return Image(QPoint(g[0], g[1]), pixmap)
+
+
+# ---------------------------------------------------------------------------
+# Spatial index
+# ---------------------------------------------------------------------------
+class AnnotationIndex:
+    """Uniform grid of annotation bounding boxes.
+
+    Call ``add``/``remove``/``update`` whenever an annotation is added,
+    deleted, edited or moved (``rebuild`` after replacing the whole list).
+    """
+
+    CELL = 128
+
+    def __init__(self, font):
+        Text.set_font(font)
+        self._entries = {}  # id(item) -> (z, item, bounds, cells)
+        self._cells = collections.defaultdict(set)
+        self._z = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def bounds(self, item) -> QRectF:
+        return item.bounds()
+
+    def _cells_of(self, rect: QRectF):
+        c = self.CELL
+        x0, y0 = math.floor(rect.left() / c), math.floor(rect.top() / c)
+        x1, y1 = math.floor(rect.right() / c), math.floor(rect.bottom() / c)
+        return [(x, y) for y in range(y0, y1 + 1) for x in range(x0, x1 + 1)]
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add(self, item, z=None):
+        """File *item* on top, or at stacking order *z* (as returned by
+        ``remove``) to put a removed annotation back where it was."""
+        key = id(item)
+        if key in self._entries:
+            self.update(item)
+            return
+        bounds = item.bounds()
+        cells = self._cells_of(bounds)
+        for cell in cells:
+            self._cells[cell].add(key)
+        if z is None:
+            self._z += 1
+            z = self._z
+        self._entries[key] = (z, item, bounds, cells)
+
+    def remove(self, item):
+        """Drop *item*; returns its stacking order, or ``None``."""
+        entry = self._entries.pop(id(item), None)
+        if entry is None:
+            return None
+        for cell in entry[3]:
+            keys = self._cells.get(cell)
+            if keys is not None:
+                keys.discard(id(item))
+                if not keys:
+                    del self._cells[cell]
+        return entry[0]
+
+    def update(self, item):
+        """Re-file *item* after its geometry changed, keeping its stacking order."""
+        entry = self._entries.get(id(item))
+        if entry is None:
+            self.add(item)
+            return
+        self.remove(item)
+        bounds = item.bounds()
+        cells = self._cells_of(bounds)
+        for cell in cells:
+            self._cells[cell].add(id(item))
+        self._entries[id(item)] = (entry[0], item, bounds, cells)
+
+    def rebuild(self, items):
+        self._entries.clear()
+        self._cells.clear()
+        for item in items:
+            self.add(item)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def in_rect(self, rect) -> list:
+        """Annotations whose bounds intersect *rect*, bottom to top."""
+        rect = QRectF(rect)
+        keys = set()
+        for cell in self._cells_of(rect):
+            keys |= self._cells.get(cell, set())
+        entries = [self._entries[k] for k in keys]
+        return [e[1] for e in sorted(entries, key=lambda e: e[0]) if e[2].intersects(rect)]
+
+    def at(self, pos, tolerance=4, types=None):
+        """Topmost annotation drawn at *pos* (within *tolerance* of its
+        stroke), optionally only instances of the classes in *types*."""
+        p = QPointF(pos)
+        keys = set()
+        for cell in self._cells_of(QRectF(p.x() - tolerance, p.y() - tolerance, 2 * tolerance, 2 * tolerance)):
+            keys |= self._cells.get(cell, set())
+        candidates = sorted((self._entries[k] for k in keys), key=lambda e: e[0], reverse=True)
+        for _, item, _, _ in candidates:
+            if types is not None and not isinstance(item, types):
+                continue
+            if item.hits(p, tolerance):
+                return item
+        return None
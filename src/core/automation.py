@@ -0,0 +1,267 @@
+"""Local automation API: capture pixels for scripts and test harnesses.
+
+Requests travel over the single-instance socket (see ``src.core.instance``)
+as JSON lines, e.g.::
+
+    {"cmd": "grab", "mode": "region", "region": [0, 0, 800, 600]}
+    {"cmd": "grab", "mode": "monitor", "monitor": 1}
+    {"cmd": "grab", "mode": "full"}
+    {"cmd": "grab", "mode": "full", "stable": true, "timeout_ms": 5000}
+    {"cmd": "monitors"}
+
+Pixels are not sent over the socket. Each grab is written to a shared
+memory segment holding a small header (``HEADER``) followed by BGRA rows;
+the JSON reply carries the segment name. The segment stays the client's
+until it hands the name back, in the ``release`` list of a later request
+or with the ``release`` command::
+
+    {"cmd": "grab", "mode": "full", "release": ["psm_1a2b3c"]}
+    {"cmd": "release", "release": ["psm_1a2b3c"]}
+
+so a client may pipeline grabs (tagged with ``id``) and read them in any
+order. Released segments are reused for the next grabs of the same
+connection, and everything is freed when it disconnects. Grabs run on a
+thread pool so several clients are served at once. With
+``"stable": true`` the grab waits until the screen stops changing (see
+``src.core.stability``) and the reply includes ``stable_ms`` and ``stable``.
+"""
+import json
+import struct
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+from PyQt6.QtCore import QByteArray
+
+from src.core import capture
+
+MAGIC = b"PXC1"
+# magic, width, height, stride, left, top, sequence number, timestamp
+HEADER = struct.Struct("<4sIIIiiId")
+
+
+def _attach(name):
+    """Attach to an existing segment without letting this process's
+    resource tracker unlink it on exit (it belongs to the server)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class _ClientSegments:
+    """Shared memory owned by the server for one client connection.
+
+    Every grab gets a segment of its own, held until the client releases
+    it, so grabs in flight at the same time never write over each other or
+    free a segment a reply already named. The ``SPARE`` largest released
+    segments are kept for reuse; a client that never releases gets an error after
+    ``MAX_HELD`` grabs instead of using up memory. Grabs that finish after
+    the client disconnected (``close``) get an error instead of a segment
+    nobody would free.
+    """
+
+    SPARE = 2
+    MAX_HELD = 8
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.held = {}
+        self.spare = []
+        self.seq = 0
+        self.closed = False
+
+    def write(self, frame):
+        stride = frame.width * 4
+        size = HEADER.size + stride * frame.height
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("el cliente se ha desconectado")
+            if len(self.held) >= self.MAX_HELD:
+                raise RuntimeError(f"hay {len(self.held)} capturas sin liberar")
+            shm = next((s for s in self.spare if s.size >= size), None)
+            if shm is not None:
+                self.spare.remove(shm)
+            else:
+                shm = shared_memory.SharedMemory(create=True, size=size)
+            self.held[_key(shm.name)] = shm
+            self.seq += 1
+            HEADER.pack_into(
+                shm.buf, 0, MAGIC, frame.width, frame.height, stride,
+                frame.left, frame.top, self.seq, frame.timestamp,
+            )
+            shm.buf[HEADER.size:size] = frame.bgra
+            return shm.name, shm.size, self.seq
+
+    def release(self, names):
+        """Take back the segments in *names*; returns how many were held."""
+        released = 0
+        with self.lock:
+            for name in names:
+                shm = self.held.pop(_key(str(name)), None)
+                if shm is None:
+                    continue
+                released += 1
+                self.spare.append(shm)
+            # The largest fit the most grabs
+            self.spare.sort(key=lambda s: s.size, reverse=True)
+            for shm in self.spare[self.SPARE:]:
+                _free(shm)
+            del self.spare[self.SPARE:]
+        return released
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            for shm in [*self.held.values(), *self.spare]:
+                _free(shm)
+            self.held.clear()
+            self.spare.clear()
+
+
+def _key(name):
+    # POSIX names may or may not come with the leading slash
+    return name.lstrip("/")
+
+
+def _free(shm):
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class AutomationService:
+    """Handles automation requests for ``InstanceServer``."""
+
+    MAX_WORKERS = 4
+
+    def __init__(self):
+        self.pool = ThreadPoolExecutor(self.MAX_WORKERS, thread_name_prefix="automation")
+
+    def handle(self, request, conn):
+        cmd = request.get("cmd")
+        segments = conn.state.setdefault("segments", _ClientSegments())
+        # Before the grab, so it can reuse what the client let go of
+        released = segments.release(request.get("release") or ())
+        if cmd == "release":
+            return {"ok": True, "released": released}
+        if cmd == "monitors":
+            return self.pool.submit(lambda: {"ok": True, "monitors": capture.monitors()})
+        if cmd == "grab":
+            return self.pool.submit(self._grab, request, segments)
+        return {"ok": False, "error": f"comando desconocido: {cmd}"}
+
+    def release(self, conn):
+        segments = conn.state.pop("segments", None)
+        if segments is not None:
+            segments.close()
+
+    def _grab(self, request, segments):
+        mode = request.get("mode", "full")
+        region, monitor = None, 0
+        if mode == "region":
+            left, top, width, height = (int(v) for v in request["region"])
+            if width <= 0 or height <= 0:
+                raise ValueError("la región debe tener ancho y alto positivos")
+            region = {"left": left, "top": top, "width": width, "height": height}
+        elif mode == "monitor":
+            monitor = int(request.get("monitor", 1))
+        elif mode != "full":
+            raise ValueError(f"modo desconocido: {mode}")
+
+        extra = {}
+        if request.get("stable"):
+            from src.core import stability
+            frame, report = stability.wait_until_stable(
+                region, monitor,
+                threshold=float(request.get("threshold", stability.THRESHOLD)),
+                timeout_ms=int(request.get("timeout_ms", stability.TIMEOUT_MS)),
+            )
+            extra = {"stable": report.stable, "stable_ms": round(report.waited_ms, 1)}
+        else:
+            frame = capture.grab(region, monitor)
+
+        name, size, seq = segments.write(frame)
+        return {
+            **extra,
+            "ok": True,
+            "shm": name,
+            "size": size,
+            "header": HEADER.size,
+            "format": "BGRA",
+            "width": frame.width,
+            "height": frame.height,
+            "stride": frame.width * 4,
+            "left": frame.left,
+            "top": frame.top,
+            "seq": seq,
+            "timestamp": frame.timestamp,
+        }
+
+
+class AutomationClient:
+    """Blocking client for scripts; keeps one connection open.
+
+    Each grab is copied out of its segment, which is handed back with the
+    next request (so the server can reuse it).
+
+    >>> client = AutomationClient()
+    >>> frame = client.grab(mode="region", region=[0, 0, 640, 480])
+    >>> frame.to_qimage().save("shot.png")
+    """
+
+    def __init__(self, timeout_ms=5000):
+        from PyQt6.QtNetwork import QLocalSocket
+        from src.core.instance import server_name
+
+        self.timeout_ms = timeout_ms
+        self.sock = QLocalSocket()
+        self.sock.connectToServer(server_name())
+        if not self.sock.waitForConnected(timeout_ms):
+            raise ConnectionError("PixelCatchr no se está ejecutando")
+        self._buffer = b""
+        self._shm = None
+        self._done = []
+
+    def request(self, **request):
+        if self._done:
+            request["release"], self._done = self._done, []
+        self.sock.write(QByteArray(json.dumps(request).encode("utf-8") + b"\n"))
+        self.sock.waitForBytesWritten(self.timeout_ms)
+        while b"\n" not in self._buffer:
+            if not self.sock.waitForReadyRead(self.timeout_ms):
+                raise TimeoutError("sin respuesta de PixelCatchr")
+            self._buffer += bytes(self.sock.readAll())
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return json.loads(line.decode("utf-8"))
+
+    def grab(self, **request) -> capture.Frame:
+        reply = self.request(cmd="grab", **request)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error", "error desconocido"))
+
+        if self._shm is None or _key(self._shm.name) != _key(reply["shm"]):
+            self._close_shm()
+            self._shm = _attach(reply["shm"])
+
+        magic, width, height, stride, left, top, _, timestamp = HEADER.unpack_from(self._shm.buf, 0)
+        if magic != MAGIC:
+            raise RuntimeError("segmento de memoria compartida inválido")
+        bgra = bytes(self._shm.buf[HEADER.size:HEADER.size + stride * height])
+        self._done.append(reply["shm"])
+        return capture.Frame(bgra, width, height, left, top, timestamp)
+
+    def close(self):
+        self._close_shm()
+        self.sock.disconnectFromServer()
+
+    def _close_shm(self):
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
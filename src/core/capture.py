@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import deque
+
+from PyQt6.QtGui import QImage
+
+# mss handles are bound to the thread that created them (GDI DCs on Windows,
+# X connections on Linux), so every thread gets its own.
+_local = threading.local()
+
+
+def _sct():
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        # Imported here so importing this module stays cheap at startup
+        import mss
+        sct = mss.mss()
+        _local.sct = sct
+    return sct
+
+
+class Frame:
+    """Raw BGRA pixels of one grab, in physical (device) pixels.
+
+    ``left``/``top`` are the position of the grabbed area on the virtual
+    desktop. ``timestamp`` is ``time.time()`` at grab time.
+    """
+
+    __slots__ = ("bgra", "width", "height", "left", "top", "timestamp")
+
+    def __init__(self, bgra, width, height, left=0, top=0, timestamp=None):
+        self.bgra = bgra
+        self.width = width
+        self.height = height
+        self.left = left
+        self.top = top
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def to_qimage(self) -> QImage:
+        # BGRA in memory == QImage.Format_RGB32 on little-endian; alpha is ignored
+        img = QImage(self.bgra, self.width, self.height, self.width * 4, QImage.Format.Format_RGB32)
+        # Detach from the Python buffer
+        return img.copy()
+
+
+def grab(region=None, monitor=0) -> Frame:
+    """Grab pixels with mss. Safe to call from any thread.
+
+    :param region: dict with ``left``, ``top``, ``width``, ``height`` in
+        physical pixels, or ``None`` to grab ``monitor``.
+    :param monitor: mss monitor index; ``0`` is the whole virtual desktop.
+    """
+    sct = _sct()
+    area = region or sct.monitors[monitor]
+    shot = sct.grab(area)
+    return Frame(shot.bgra, shot.width, shot.height, shot.left, shot.top)
+
+
+def monitors():
+    """Return mss monitor dicts; index 0 is the union of all monitors."""
+    return list(_sct().monitors)
+
+
+class FrameSlot:
+    """Single-frame mailbox between a producer thread and the GUI thread.
+
+    Backed by ``deque(maxlen=1)`` whose ``append``/``popleft`` are atomic in
+    CPython, so neither side ever takes a lock and the newest frame wins.
+    """
+
+    def __init__(self):
+        self._slot = deque(maxlen=1)
+
+    def put(self, frame: Frame):
+        self._slot.append(frame)
+
+    def take(self):
+        try:
+            return self._slot.popleft()
+        except IndexError:
+            return None
@@ -0,0 +1,77 @@
+import os
+from datetime import datetime
+
+from PyQt6.QtCore import Qt, QPoint, QRect, QStandardPaths
+from PyQt6.QtGui import QPainter, QPen, QFontMetrics, QFont, QImage
+
+DEFAULT_PATTERN = "%Y-%m-%d_%H-%M-%S"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def draw_timestamp(painter: QPainter, pos: QPoint, font: QFont, when=None):
+    """Draw the white-on-black timestamp label with its baseline at *pos*."""
+    timestamp = (when or datetime.now()).strftime(TIMESTAMP_FORMAT)
+    fm = QFontMetrics(font)
+    ts_w = fm.horizontalAdvance(timestamp)
+    ts_h = fm.height()
+
+    # Draw Black Background
+    ts_bg_rect = QRect(pos.x() - 4, pos.y() - ts_h + 4, ts_w + 8, ts_h)
+    painter.fillRect(ts_bg_rect, Qt.GlobalColor.black)
+
+    painter.setFont(font)
+    painter.setPen(QPen(Qt.GlobalColor.white))
+    painter.drawText(pos, timestamp)
+
+
+def burn_timestamp(image: QImage, when=None, font: QFont = None) -> QImage:
+    """Burn the timestamp into the top-left corner of *image* (in place)."""
+    painter = QPainter(image)
+    draw_timestamp(painter, QPoint(10, 20), font or QFont(), when)
+    painter.end()
+    return image
+
+
+def save_image(image: QImage, path: str, fmt=None, quality=-1) -> bool:
+    """Encode *image* to *path*. *fmt* defaults to the file extension;
+    *quality* is 0-100 for lossy formats, -1 for Qt's default."""
+    if fmt is None:
+        fmt = os.path.splitext(path)[1].lstrip(".") or "png"
+    return image.save(path, fmt.upper(), quality)
+
+
+def default_filename(settings, when=None) -> str:
+    """Build ``<pattern>.<ext>`` from the ``filename_pattern``/``image_format`` settings."""
+    fmt = settings.value("image_format", "PNG").lower()
+    pattern = settings.value("filename_pattern", DEFAULT_PATTERN)
+    when = when or datetime.now()
+    try:
+        name = when.strftime(pattern)
+    except ValueError:
+        # Fallback if pattern is invalid
+        name = when.strftime(DEFAULT_PATTERN)
+    if not name.lower().endswith(f".{fmt}"):
+        name += f".{fmt}"
+    return name
+
+
+def save_dir(settings) -> str:
+    """Folder used for captures saved without a dialog (bursts, queued captures)."""
+    folder = settings.value("save_dir", "")
+    if not folder:
+        pictures = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.PicturesLocation)
+        folder = os.path.join(pictures or os.path.expanduser("~"), "PixelCatchr")
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+def unique_path(folder: str, name: str, taken=None) -> str:
+    """Return ``folder/name``, adding ``_1``, ``_2``... if it already exists
+    (or is in *taken*, for paths handed out but not written yet)."""
+    path = os.path.join(folder, name)
+    root, ext = os.path.splitext(path)
+    n = 1
+    while os.path.exists(path) or (taken is not None and path in taken):
+        path = f"{root}_{n}{ext}"
+        n += 1
+    return path
@@ -0,0 +1,209 @@
+"""Undo/redo history for the overlay's annotations.
+
+Every change is a command that knows how to undo and redo itself against
+a *document*, the object holding the annotations. The document has to
+provide:
+
+* ``_insert_annotation(item, position, z)``: put *item* back at list
+  *position* with stacking order *z*;
+* ``_remove_annotation(item)``: take *item* out, returning its
+  ``(position, z)``;
+* ``_move_annotation(item, delta)`` and ``_set_annotation_text(item, text)``.
+
+Commands hold the annotations themselves, not copies; a blurred patch's
+pixmap is shared with the annotation on screen. An annotation still in
+the document costs the history nothing, since dropping the step would not
+free it. Only annotations the history alone keeps alive are charged: a
+deleted one while its deletion can be undone, an added one while its
+addition can be redone. ``History`` keeps that memory under
+``limit_bytes`` by dropping the oldest steps, so a long session settles at
+a fixed footprint instead of growing.
+"""
+import collections
+
+# Bookkeeping of a command object, on top of what it references
+COMMAND_BYTES = 128
+
+
+class Command:
+    __slots__ = ()
+
+    def undo(self, doc):
+        raise NotImplementedError
+
+    def redo(self, doc):
+        raise NotImplementedError
+
+    def nbytes(self, done=True) -> int:
+        """Memory only this command keeps alive, while it is *done* (on the
+        undo stack) or undone (on the redo stack)."""
+        return COMMAND_BYTES
+
+
+class AddAnnotation(Command):
+    """An annotation was drawn, typed or pasted (blur redactions too)."""
+
+    __slots__ = ("item", "position", "z")
+
+    def __init__(self, item):
+        self.item = item
+        self.position = self.z = None
+
+    def undo(self, doc):
+        self.position, self.z = doc._remove_annotation(self.item)
+
+    def redo(self, doc):
+        doc._insert_annotation(self.item, self.position, self.z)
+
+    def nbytes(self, done=True):
+        # Done, the item is in the document
+        return COMMAND_BYTES + (0 if done else self.item.nbytes())
+
+
+class RemoveAnnotation(Command):
+    __slots__ = ("item", "position", "z")
+
+    def __init__(self, item, position, z):
+        self.item = item
+        self.position = position
+        self.z = z
+
+    def undo(self, doc):
+        doc._insert_annotation(self.item, self.position, self.z)
+
+    def redo(self, doc):
+        self.position, self.z = doc._remove_annotation(self.item)
+
+    def nbytes(self, done=True):
+        return COMMAND_BYTES + (self.item.nbytes() if done else 0)
+
+
+class MoveAnnotation(Command):
+    """A whole drag with the move tool, from press to release."""
+
+    __slots__ = ("item", "delta")
+
+    def __init__(self, item, delta):
+        self.item = item
+        self.delta = delta
+
+    def undo(self, doc):
+        doc._move_annotation(self.item, -self.delta)
+
+    def redo(self, doc):
+        doc._move_annotation(self.item, self.delta)
+
+
+class EditText(Command):
+    __slots__ = ("item", "old", "new")
+
+    def __init__(self, item, old, new):
+        self.item = item
+        self.old = old
+        self.new = new
+
+    def undo(self, doc):
+        doc._set_annotation_text(self.item, self.old)
+
+    def redo(self, doc):
+        doc._set_annotation_text(self.item, self.new)
+
+    def nbytes(self, done=True):
+        return COMMAND_BYTES + 2 * (len(self.old) + len(self.new))
+
+
+class History:
+    """Undo and redo stacks with a memory budget.
+
+    ``record`` is called after the document already made the change, and
+    drops the redo steps as any editor does. The budget covers both stacks.
+    It is enforced by dropping the oldest undo steps while they hold any of
+    the memory, then the redo steps furthest from the present; the newest
+    step of each stack is always kept, however large.
+    """
+
+    DEFAULT_LIMIT_MB = 64
+    MAX_STEPS = 1000
+
+    def __init__(self, doc, limit_bytes=DEFAULT_LIMIT_MB * 1024 * 1024):
+        self.doc = doc
+        self.limit_bytes = limit_bytes
+        # (command, size) pairs; a size is taken when the step moves to a
+        # stack, so edits to the annotations later on cannot unbalance
+        # ``nbytes``
+        self._undo = collections.deque()
+        self._redo = []
+        self._undo_bytes = 0
+        self.nbytes = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def record(self, command):
+        for _, size in self._redo:
+            self.nbytes -= size
+        self._redo.clear()
+        self._push_undo(command)
+        self._trim()
+
+    def undo(self):
+        if not self._undo:
+            return False
+        command = self._pop_undo()
+        command.undo(self.doc)
+        size = command.nbytes(done=False)
+        self._redo.append((command, size))
+        self.nbytes += size
+        self._trim()
+        return True
+
+    def redo(self):
+        if not self._redo:
+            return False
+        command, size = self._redo.pop()
+        self.nbytes -= size
+        command.redo(self.doc)
+        self._push_undo(command)
+        self._trim()
+        return True
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._undo_bytes = self.nbytes = 0
+
+    def _push_undo(self, command):
+        size = command.nbytes(done=True)
+        self._undo.append((command, size))
+        self._undo_bytes += size
+        self.nbytes += size
+
+    def _pop_undo(self, oldest=False):
+        command, size = self._undo.popleft() if oldest else self._undo.pop()
+        self._undo_bytes -= size
+        self.nbytes -= size
+        return command
+
+    def _trim(self):
+        while len(self._undo) > self.MAX_STEPS:
+            self._pop_undo(oldest=True)
+            self.evicted += 1
+        while self.nbytes > self.limit_bytes:
+            # What the undo steps but the newest keep alive beyond their own
+            # bookkeeping, i.e. what evicting them could actually free
+            older = len(self._undo) - 1
+            if older > 0 and self._undo_bytes - self._undo[-1][1] > older * COMMAND_BYTES:
+                self._pop_undo(oldest=True)
+            elif len(self._redo) > 1:
+                _, size = self._redo.pop(0)
+                self.nbytes -= size
+            else:
+                break
+            self.evicted += 1
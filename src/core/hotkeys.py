@@ -1,14 +1,65 @@
+import threading
+import time
+
 from pynput import keyboard
 from PyQt6.QtCore import QSettings
 
+
+class HotkeyStats:
+    """Per-hotkey counters and latency (OS event -> Qt signal emitted), in ms."""
+
+    def __init__(self):
+        self.count = 0
+        self.debounced = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, latency_ms):
+        self.count += 1
+        self.total_ms += latency_ms
+        self.last_ms = latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "debounced": self.debounced,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "last_ms": self.last_ms,
+        }
+
+
 class GlobalHotkeyListener:
+    """Long-lived global hotkey listener.
+
+    A single ``keyboard.Listener`` thread is started once. Hotkeys are matched
+    against a dispatch table that ``reload()`` replaces atomically (a single
+    reference assignment), so saving settings never tears the OS hook down
+    and no key events are lost while the new configuration is applied.
+    """
+
+    # Presses of the same hotkey closer than this are ignored (bouncy keys,
+    # double taps on Print Screen, ...)
+    DEBOUNCE_MS = 250
+
     def __init__(self):
         self.listener = None
-        self.on_zone_capture = None 
+        self.on_zone_capture = None
         self.on_full_capture = None
         self.on_datetime_toggle = None
         self.settings = QSettings("Webtechcrafter", "PixelCatchr")
 
+        # name -> (frozenset of canonical keys, callback). Never mutated in
+        # place, only swapped, so the listener thread can read it lock-free.
+        self._table = {}
+        self._pressed = set()
+        self._last_fired = {}
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
     def _map_qt_to_pynput(self, qt_str):
         """Map a Qt key sequence string to a pynput-compatible format.
         Handles extra whitespace, spaces as keys, and ignores empty parts.
@@ -45,47 +96,48 @@ class GlobalHotkeyListener:
                 mapped_parts.append(part)
         return '+'.join(mapped_parts) if mapped_parts else None
 
-    def start(self):
-        # 1. Read hotkeys from settings (or defaults)
+    def _build_table(self):
+        """Read hotkeys from settings and build a new dispatch table."""
         # Note: We must match the defaults used in settings.py
-        hk_capture_str = self.settings.value("hk_capture", "Print")
-        hk_full_str = self.settings.value("hk_full", "Ctrl+Print")
-        hk_datetime_str = self.settings.value("hk_datetime", "Alt+D")
-        
-        # 2. Map to pynput format
-        pynput_capture = self._map_qt_to_pynput(hk_capture_str)
-        pynput_full = self._map_qt_to_pynput(hk_full_str)
-        pynput_datetime = self._map_qt_to_pynput(hk_datetime_str)
-        
-        print(f"Buscando atajos: Zona='{pynput_capture}', Completa='{pynput_full}', Fecha='{pynput_datetime}'")
-
-        # 3. Build the mapping dict
-        hotkey_map = {}
-        
-        if pynput_capture and self.on_zone_capture:
-            hotkey_map[pynput_capture] = self.on_zone_capture
-            
-        if pynput_full and self.on_full_capture:
-            hotkey_map[pynput_full] = self.on_full_capture
-
-        if pynput_datetime and self.on_datetime_toggle:
-            hotkey_map[pynput_datetime] = self.on_datetime_toggle
-            
-        if not hotkey_map:
-            print("No se pudieron configurar atajos globales.")
+        configured = {
+            "zone": (self.settings.value("hk_capture", "Print"), self.on_zone_capture),
+            "full": (self.settings.value("hk_full", "Ctrl+Print"), self.on_full_capture),
+            "datetime": (self.settings.value("hk_datetime", "Alt+D"), self.on_datetime_toggle),
+        }
+
+        table = {}
+        for name, (qt_str, callback) in configured.items():
+            combo = self._map_qt_to_pynput(qt_str)
+            if not combo or not callback:
+                continue
+            try:
+                keys = frozenset(keyboard.HotKey.parse(combo))
+            except ValueError as e:
+                print(f"Atajo inválido para '{name}' ({qt_str}): {e}")
+                continue
+            table[name] = (keys, callback)
+            print(f"Atajo '{name}' = '{combo}'")
+        return table
+
+    def start(self):
+        self.reload()
+        if self.listener:
             return
 
         try:
-            self.listener = keyboard.GlobalHotKeys(hotkey_map)
+            self.listener = keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
             self.listener.start()
-        except ValueError as e:
-            print(f"Error al iniciar hotkeys: {e}")
-            # Fallback a hotkeys por defecto si falla la carga
-            if hotkey_map:
-                print("Reintentando con configuración básica...")
-                # Aquí podrías intentar una configuración de emergencia si fuera necesario.
         except Exception as e:
             print(f"Error inesperado en listener: {e}")
+            self.listener = None
+
+    def reload(self):
+        """Re-read hotkeys from settings and swap them in without restarting the listener."""
+        self.settings.sync()
+        table = self._build_table()
+        if not table:
+            print("No se pudieron configurar atajos globales.")
+        self._table = table
 
     def stop(self):
         if self.listener:
@@ -95,4 +147,70 @@ class GlobalHotkeyListener:
             except Exception as e:
                 print(f"Error al detener listener: {e}")
             self.listener = None
-            
\ No newline at end of file
+        self._pressed.clear()
+
+    def stats(self):
+        """Return a snapshot of per-hotkey stats: ``{name: {count, debounced, mean_ms, ...}}``."""
+        with self._stats_lock:
+            return {name: s.as_dict() for name, s in self._stats.items()}
+
+    # ---------------------------------------------------------------------
+    # Event handling (listener thread)
+    # ---------------------------------------------------------------------
+    def _canonical(self, key):
+        if self.listener:
+            return self.listener.canonical(key)
+        return key
+
+    def _on_press(self, key, injected=False):
+        # Like keyboard.GlobalHotKeys, ignore events synthesized by other programs
+        if not injected:
+            self._handle_press(self._canonical(key), time.perf_counter())
+
+    def _on_release(self, key, injected=False):
+        if not injected:
+            self._pressed.discard(self._canonical(key))
+
+    def _handle_press(self, key, t0):
+        if key in self._pressed:
+            # OS auto-repeat
+            return
+        self._pressed.add(key)
+
+        # Only the combination that is exactly what is held fires, like
+        # keyboard.HotKey: Ctrl+Print is the full capture, not Print too
+        table = self._table
+        for name, (keys, callback) in table.items():
+            if keys == self._pressed:
+                self._fire(name, callback, t0)
+
+    def _fire(self, name, callback, t0):
+        last = self._last_fired.get(name)
+        if last is not None and (t0 - last) * 1000 < self.DEBOUNCE_MS:
+            with self._stats_lock:
+                self._stats.setdefault(name, HotkeyStats()).debounced += 1
+            return
+        self._last_fired[name] = t0
+
+        try:
+            callback()
+        except Exception as e:
+            print(f"Error en atajo '{name}': {e}")
+        latency_ms = (time.perf_counter() - t0) * 1000
+        with self._stats_lock:
+            self._stats.setdefault(name, HotkeyStats()).record(latency_ms)
+
+    # ---------------------------------------------------------------------
+    # Synthetic input (test harness)
+    # ---------------------------------------------------------------------
+    def inject(self, combo, hold_ms=0):
+        """Feed a synthetic key combination (pynput format, e.g. ``'<ctrl>+<print_screen>'``)
+        through the same path as real OS events. Works without ``start()``.
+        """
+        keys = keyboard.HotKey.parse(combo)
+        for key in keys:
+            self._handle_press(key, time.perf_counter())
+        if hold_ms:
+            time.sleep(hold_ms / 1000)
+        for key in reversed(keys):
+            self._pressed.discard(key)
@@ -0,0 +1,178 @@
+import getpass
+import json
+from concurrent.futures import Future
+
+from PyQt6.QtCore import QObject, QByteArray, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+# Commands a second launch can forward to the running instance
+COMMANDS = ("capture", "full", "settings", "activate")
+# Commands served by src.core.automation
+AUTOMATION_COMMANDS = ("grab", "monitors", "release")
+
+
+def server_name():
+    """Per-user name of the local socket (named pipe on Windows)."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return f"PixelCatchr-{user}"
+
+
+def send_request(request: dict, timeout_ms=500):
+    """Send one JSON request to the running instance and return its reply.
+
+    Returns ``None`` when no instance is listening. Only needs QtCore /
+    QtNetwork, no QApplication, so a second launch stays cheap.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(server_name())
+    if not sock.waitForConnected(timeout_ms):
+        return None
+
+    sock.write(QByteArray(json.dumps(request).encode("utf-8") + b"\n"))
+    sock.waitForBytesWritten(timeout_ms)
+
+    data = b""
+    while not data.endswith(b"\n"):
+        if not sock.waitForReadyRead(timeout_ms):
+            break
+        data += bytes(sock.readAll())
+    sock.disconnectFromServer()
+
+    try:
+        return json.loads(data.decode("utf-8"))
+    except ValueError:
+        return {"ok": False, "error": "respuesta inválida"}
+
+
+def instance_alive(timeout_ms=1000):
+    """True if something accepts connections on the socket.
+
+    The OS completes the connection even while the running instance is too
+    busy to read from it, so unlike a request this does not mistake a slow
+    instance for a dead one. A socket left behind by a crash refuses it.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(server_name())
+    alive = sock.waitForConnected(timeout_ms)
+    sock.abort()
+    return alive
+
+
+def forward_command(command, timeout_ms=500):
+    """Forward *command* to an already running instance. True if one handled it."""
+    reply = send_request({"cmd": command}, timeout_ms)
+    return reply is not None
+
+
+class ClientConnection:
+    """One connected client. ``state`` is free for handlers to keep
+    per-connection resources in (released on ``client_disconnected``)."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.buffer = b""
+        self.state = {}
+        self.closed = False
+
+
+class InstanceServer(QObject):
+    """Local socket server that makes this process the single instance.
+
+    Speaks newline-delimited JSON: each request line gets one reply line
+    produced by ``handler(request, conn)``. The handler runs on the GUI
+    thread and returns either a dict or a ``concurrent.futures.Future``
+    resolving to one, so slow requests run on worker threads and many
+    clients are served concurrently. A request's ``id``, if any, is echoed
+    in its reply.
+    """
+
+    client_disconnected = pyqtSignal(object)
+    _reply_ready = pyqtSignal(object, object, object)
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        # Worker threads hand finished replies back to the GUI thread here
+        self._reply_ready.connect(self._write_reply)
+        self._connections = {}
+
+    # A busy instance may take a while to read the forwarded command
+    FORWARD_TIMEOUT_MS = 2000
+
+    def listen(self, command=None):
+        """Become the single instance. If another one already is, hand it
+        *command* (the one this process was launched with, or "activate")
+        and return False."""
+        name = server_name()
+        if self.server.listen(name):
+            return True
+        if instance_alive():
+            forward_command(command or "activate", self.FORWARD_TIMEOUT_MS)
+            return False
+        # A crashed instance left its socket behind
+        QLocalServer.removeServer(name)
+        ok = self.server.listen(name)
+        if not ok:
+            print(f"No se pudo iniciar el servidor de instancia única: {self.server.errorString()}")
+        return ok
+
+    def close(self):
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            conn = ClientConnection(sock)
+            self._connections[sock] = conn
+            sock.readyRead.connect(lambda c=conn: self._on_ready_read(c))
+            sock.disconnected.connect(lambda c=conn: self._on_disconnected(c))
+
+    def _on_disconnected(self, conn):
+        conn.closed = True
+        self._connections.pop(conn.sock, None)
+        self.client_disconnected.emit(conn)
+        conn.sock.deleteLater()
+
+    def _on_ready_read(self, conn):
+        buf = conn.buffer + bytes(conn.sock.readAll())
+        while b"\n" in buf:
+            line, buf = buf.split(b"\n", 1)
+            if line.strip():
+                self._dispatch(conn, line)
+        conn.buffer = buf
+
+    def _dispatch(self, conn, line):
+        request = {}
+        try:
+            parsed = json.loads(line.decode("utf-8"))
+            if not isinstance(parsed, dict):
+                raise ValueError("se esperaba un objeto JSON")
+            request = parsed
+            reply = self.handler(request, conn)
+        except ValueError as e:
+            reply = {"ok": False, "error": f"petición inválida: {e}"}
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+
+        if isinstance(reply, Future):
+            reply.add_done_callback(lambda f: self._reply_ready.emit(conn, request, f))
+        else:
+            self._write_reply(conn, request, reply)
+
+    def _write_reply(self, conn, request, reply):
+        if isinstance(reply, Future):
+            try:
+                reply = reply.result()
+            except Exception as e:
+                reply = {"ok": False, "error": str(e)}
+        if conn.closed:
+            return
+        if "id" in request:
+            reply = dict(reply, id=request["id"])
+        conn.sock.write(QByteArray(json.dumps(reply).encode("utf-8") + b"\n"))
+        conn.sock.flush()
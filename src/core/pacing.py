@@ -0,0 +1,89 @@
+"""Pacing of pointer input to the display's refresh, and frame timings.
+
+A 1000 Hz mouse delivers a move event every millisecond, but the screen
+only shows a new image every 1000 / refresh-rate ms. ``FramePacer`` turns
+any number of ``request`` calls into one ``frame`` signal per refresh
+interval, so the overlay handles the latest pointer position once per
+frame. Qt widgets expose no vblank signal. The ticks instead fall on a
+fixed grid of refresh periods (see ``next_delay``), rather than a fixed
+delay after whichever event came first, so consecutive frames are evenly
+spaced as they would be with vsync.
+"""
+import math
+import time
+
+import numpy as np
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+
+class FrameStats:
+    """The last ``SAMPLES`` paint durations, for percentiles."""
+
+    SAMPLES = 240
+
+    __slots__ = ("_ms", "_next", "count")
+
+    def __init__(self):
+        self._ms = np.zeros(self.SAMPLES)
+        self._next = 0
+        self.count = 0
+
+    def add(self, ms):
+        self._ms[self._next] = ms
+        self._next = (self._next + 1) % self.SAMPLES
+        self.count += 1
+
+    def percentiles(self, q=(50, 95, 99)):
+        n = min(self.count, self.SAMPLES)
+        if not n:
+            return tuple(0.0 for _ in q)
+        return tuple(np.percentile(self._ms[:n], q))
+
+
+class FramePacer(QObject):
+    """Emits ``frame`` at most once per refresh interval, when requested.
+
+    ``events`` and ``frames`` count ``request`` calls and emitted frames,
+    so their ratio is how many inputs each frame stands for.
+    """
+
+    frame = pyqtSignal()
+
+    def __init__(self, refresh_hz=60.0):
+        super().__init__()
+        self.period = 1.0 / refresh_hz
+        self._epoch = time.perf_counter()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+        self.events = 0
+        self.frames = 0
+
+    def set_refresh_rate(self, hz):
+        if hz > 0:
+            self.period = 1.0 / hz
+
+    def next_delay(self, now=None) -> float:
+        """Seconds from *now* to the next tick of the refresh grid."""
+        now = time.perf_counter() if now is None else now
+        ticks = math.ceil((now - self._epoch) / self.period)
+        return self._epoch + ticks * self.period - now
+
+    def request(self):
+        self.events += 1
+        if not self._timer.isActive():
+            self._timer.start(round(self.next_delay() * 1000))
+
+    def pending(self):
+        return self._timer.isActive()
+
+    def flush(self):
+        """Emit a pending frame now (before a press or release, say)."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._tick()
+
+    def _tick(self):
+        self.frames += 1
+        self.frame.emit()
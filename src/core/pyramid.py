@@ -0,0 +1,69 @@
+"""Mipmap pyramid of a screenshot, for drawing it zoomed out.
+
+Level 0 is the screenshot itself and every further level halves both
+sides, down to ``MIN_SIDE`` pixels. A view drawn at scale *s* uses the
+smallest level that still has at least *s* times level 0's pixels, so it
+only ever shrinks an image by less than 2x instead of filtering the full
+resolution one on every repaint.
+"""
+import threading
+
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from PyQt6.QtGui import QPixmap
+
+
+class ImagePyramid(QObject):
+    """Builds the levels of a QImage on a worker thread.
+
+    Levels appear in ``levels`` as they are built and ``ready`` is emitted
+    once all of them are; until then ``level_for`` picks among the levels
+    that exist, so drawing never waits on the build. QImage is safe to use
+    off the GUI thread; the QPixmaps handed to the painter are made from the
+    levels on first use, on the GUI thread.
+    """
+
+    MIN_SIDE = 64
+
+    ready = pyqtSignal()
+
+    def __init__(self, image):
+        super().__init__()
+        self.levels = [image]
+        self._pixmaps = {}
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._build, name="image-pyramid", daemon=True)
+            self._thread.start()
+
+    def _build(self):
+        image = self.levels[0]
+        while min(image.width(), image.height()) // 2 >= self.MIN_SIDE:
+            image = image.scaled(
+                image.width() // 2,
+                image.height() // 2,
+                Qt.AspectRatioMode.IgnoreAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+            # list.append is atomic; readers only look at what is there
+            self.levels.append(image)
+        self.ready.emit()
+
+    def level_for(self, scale):
+        """Index of the level to draw at *scale* (1 = level 0's size)."""
+        level = 0
+        levels = len(self.levels)
+        while level + 1 < levels and scale <= 0.5 ** (level + 1):
+            level += 1
+        return level
+
+    def scale_of(self, level):
+        """Size of *level* relative to level 0 (halving rounds down)."""
+        return self.levels[level].width() / self.levels[0].width()
+
+    def pixmap(self, level):
+        pixmap = self._pixmaps.get(level)
+        if pixmap is None:
+            pixmap = self._pixmaps[level] = QPixmap.fromImage(self.levels[level])
+        return pixmap
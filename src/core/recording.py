@@ -0,0 +1,371 @@
+import collections
+import io
+import os
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime
+
+import numpy as np
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+
+from src.core import capture
+from src.core.export import default_filename, save_dir, unique_path
+from src.core.timelapse import frame_array
+
+FORMATS = {"webp": "WEBP", "apng": "PNG", "gif": "GIF"}
+EXTENSIONS = {"webp": "webp", "apng": "png", "gif": "gif"}
+
+TILE = 32
+
+
+def changed_tiles(cur, prev, tile=TILE):
+    """Boolean (rows, cols) grid of the tiles that differ between two frames."""
+    changed = cur != prev
+    changed = np.logical_or.reduceat(changed, np.arange(0, changed.shape[0], tile), axis=0)
+    return np.logical_or.reduceat(changed, np.arange(0, changed.shape[1], tile), axis=1)
+
+
+class DeltaFrame:
+    """Tiles that changed since the previous frame, as (y, x, pixels)."""
+
+    __slots__ = ("timestamp", "tiles", "nbytes")
+
+    def __init__(self, timestamp, tiles):
+        self.timestamp = timestamp
+        self.tiles = tiles
+        self.nbytes = sum(t[2].nbytes for t in tiles)
+
+    def apply(self, arr):
+        for y, x, pixels in self.tiles:
+            arr[y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+
+    def box(self, arr):
+        """``(left, top, right, bottom)`` around the pixels that differ
+        from *arr*, the frame this delta applies to."""
+        left = top = np.inf
+        right = bottom = 0
+        for y, x, pixels in self.tiles:
+            ys, xs = np.nonzero(pixels != arr[y:y + pixels.shape[0], x:x + pixels.shape[1]])
+            if len(ys):
+                left, right = min(left, x + xs.min()), max(right, x + xs.max() + 1)
+                top, bottom = min(top, y + ys.min()), max(bottom, y + ys.max() + 1)
+        if not right:
+            return None
+        return int(left), int(top), int(right), int(bottom)
+
+
+class DeltaRing:
+    """The last few seconds of a recording, stored as a base frame plus deltas.
+
+    Evicting the oldest delta folds it into the base, so the buffer never
+    needs periodic key frames and its size follows how much of the region
+    changes rather than how long it has been recording.
+    """
+
+    def __init__(self, max_frames, max_bytes):
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.base = None
+        self.base_time = 0.0
+        self.deltas = collections.deque()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.deltas) + (self.base is not None)
+
+    def push(self, arr, prev, timestamp):
+        if self.base is None:
+            self.base, self.base_time = arr.copy(), timestamp
+            return
+        tiles = [
+            (ty * TILE, tx * TILE, arr[ty * TILE:(ty + 1) * TILE, tx * TILE:(tx + 1) * TILE].copy())
+            for ty, tx in zip(*np.nonzero(changed_tiles(arr, prev)))
+        ]
+        delta = DeltaFrame(timestamp, tiles)
+        self.deltas.append(delta)
+        self.nbytes += delta.nbytes
+        while self.deltas and (len(self.deltas) >= self.max_frames or self.nbytes > self.max_bytes):
+            oldest = self.deltas.popleft()
+            oldest.apply(self.base)
+            self.base_time = oldest.timestamp
+            self.nbytes -= oldest.nbytes
+
+    def frames(self):
+        """Yield ``(array, duration_s, box)``, merging frames where nothing
+        changed. *box* is the part that differs from the previous frame
+        (see ``DeltaFrame.box``), ``None`` for the first one or if nothing
+        did.
+
+        The same array is updated in place between yields.
+        """
+        if self.base is None:
+            return
+        arr = self.base.copy()
+        start = self.base_time
+        box = None
+        for delta in self.deltas:
+            if delta.tiles:
+                yield arr, delta.timestamp - start, box
+                box = delta.box(arr)
+                delta.apply(arr)
+                start = delta.timestamp
+        last = self.deltas[-1].timestamp if self.deltas else start
+        yield arr, max(last - start, 0.0), box
+
+    def durations(self):
+        """The durations ``frames`` yields, without rebuilding any frame."""
+        if self.base is None:
+            return []
+        times = [self.base_time] + [d.timestamp for d in self.deltas if d.tiles]
+        last = self.deltas[-1].timestamp if self.deltas else self.base_time
+        return [b - a for a, b in zip(times, times[1:])] + [max(last - times[-1], 0.0)]
+
+
+class RecordingStats:
+    def __init__(self):
+        self.frames = 0
+        self.dropped = 0
+        self.grab_ms = 0.0
+        self.diff_ms = 0.0
+        self.max_gap_ms = 0.0
+
+    def summary(self):
+        per_frame = (self.grab_ms + self.diff_ms) / self.frames if self.frames else 0.0
+        return (
+            f"{self.frames} fotogramas, {self.dropped} descartados, "
+            f"{per_frame:.1f} ms por fotograma, separación máxima {self.max_gap_ms:.0f} ms"
+        )
+
+
+class RegionRecorder(QObject):
+    """Records a screen region to an animated WebP, APNG or GIF.
+
+    A worker thread grabs the region at ``record_fps`` on fixed deadlines;
+    ticks it can't keep up with are counted as dropped frames. Frames are
+    kept in a ``DeltaRing`` holding only the tiles that changed, capped at
+    the last ``record_max_s`` seconds and ``record_buffer_mb``. On ``stop()``
+    the same thread encodes the buffer, so the GUI never waits on it.
+    """
+
+    finished = pyqtSignal(str)
+
+    def __init__(self, region):
+        super().__init__()
+        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
+        self.region = region
+        self.stats = RecordingStats()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self.fps = min(60, max(1, self.settings.value("record_fps", 15, type=int)))
+        self.fmt = self.settings.value("record_format", "webp").lower()
+        if self.fmt not in FORMATS:
+            self.fmt = "webp"
+        max_s = max(1, self.settings.value("record_max_s", 60, type=int))
+        max_mb = max(1, self.settings.value("record_buffer_mb", 256, type=int))
+        self.ring = DeltaRing(self.fps * max_s, max_mb * 1024 * 1024)
+        self.stats = RecordingStats()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="region-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        try:
+            first = self._record()
+            if first is None:
+                self.finished.emit("Grabación cancelada: no se pudo capturar la región")
+                return
+            path = self._encode(first)
+        except Exception as e:
+            self.finished.emit(f"Error en la grabación: {e}")
+            return
+        print(f"Grabación: {self.stats.summary()}")
+        self.finished.emit(f"Grabación guardada en: {path} ({self.stats.summary()})")
+
+    def _record(self):
+        interval = 1.0 / self.fps
+        first = prev = None
+        last_grab = None
+        start = time.monotonic()
+        tick = 0
+        while not self._stop.is_set():
+            deadline = start + tick * interval
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            late_ticks = int((time.monotonic() - deadline) // interval)
+            if late_ticks > 0:
+                self.stats.dropped += late_ticks
+                tick += late_ticks
+            tick += 1
+
+            try:
+                t0 = time.perf_counter()
+                frame = capture.grab(self.region)
+                t1 = time.perf_counter()
+            except Exception as e:
+                print(f"Error en la grabación: {e}")
+                continue
+            arr = frame_array(frame)
+            self.ring.push(arr, prev, frame.timestamp)
+            t2 = time.perf_counter()
+
+            self.stats.frames += 1
+            self.stats.grab_ms += (t1 - t0) * 1000
+            self.stats.diff_ms += (t2 - t1) * 1000
+            if last_grab is not None:
+                self.stats.max_gap_ms = max(self.stats.max_gap_ms, (t0 - last_grab) * 1000)
+            last_grab = t0
+            if first is None:
+                first = frame
+            prev = arr
+        return first
+
+    def _encode(self, first):
+        # QSettings instances must not be shared across threads
+        settings = QSettings("Webtechcrafter", "PixelCatchr")
+        when = datetime.fromtimestamp(first.timestamp)
+        name = os.path.splitext(default_filename(settings, when))[0] + f".{EXTENSIONS[self.fmt]}"
+        path = unique_path(save_dir(settings), name)
+        encode_animation(self.ring, (first.width, first.height), self.fmt, path)
+        return path
+
+
+def _ms(duration):
+    # Animated formats store whole milliseconds; GIF only hundredths
+    return max(20, round(duration * 1000))
+
+
+def _rgb(arr, size):
+    from PIL import Image
+
+    return Image.frombuffer("RGB", size, arr, "raw", "BGRX", 0, 1)
+
+
+def encode_animation(ring, size, fmt, path):
+    """Write the frames of *ring* (a ``DeltaRing`` of *size*) to *path* as
+    an animated ``fmt`` (a key of ``FORMATS``).
+
+    Frames are rebuilt and encoded one at a time, and only the part that
+    changed is encoded after the first, so memory use stays at a frame or
+    two however long the recording is.
+    """
+    if fmt == "gif":
+        _write_gif(ring, size, path)
+    elif fmt == "apng":
+        _write_apng(ring, size, path)
+    else:
+        _write_webp(ring, size, path)
+
+
+def _write_gif(ring, size, path):
+    from PIL import GifImagePlugin, Image
+
+    with open(path, "wb") as f:
+        for i, (arr, duration, box) in enumerate(ring.frames()):
+            im = _rgb(arr, size)
+            if box is not None:
+                im = im.crop(box)
+            # Each frame gets its own palette
+            im = im.convert("P", palette=Image.Palette.ADAPTIVE)
+            if i == 0:
+                header, _ = GifImagePlugin.getheader(im, info={"loop": 0})
+                f.writelines(header)
+            f.writelines(GifImagePlugin.getdata(
+                im, box[:2] if box else (0, 0), duration=_ms(duration), include_color_table=i > 0,
+            ))
+        f.write(b";")
+
+
+def _png_chunk(f, kind, data):
+    f.write(struct.pack(">I", len(data)) + kind + data)
+    f.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def _write_apng(ring, size, path):
+    """APNG by hand: each frame is encoded as a PNG by Pillow, and its
+    IDAT chunks are copied into the animation (as fdAT after the first)."""
+    seq = 0
+    count = 0
+    with open(path, "wb") as f:
+        for arr, duration, box in ring.frames():
+            im = _rgb(arr, size)
+            if box is not None:
+                im = im.crop(box)
+            buf = io.BytesIO()
+            im.save(buf, "PNG")
+            png = buf.getvalue()
+            chunks = []
+            pos = 8
+            while pos < len(png):
+                length, kind = struct.unpack_from(">I4s", png, pos)
+                chunks.append((kind, png[pos + 8:pos + 8 + length]))
+                pos += 12 + length
+            if count == 0:
+                f.write(png[:8])
+                _png_chunk(f, b"IHDR", chunks[0][1])
+                actl = f.tell()
+                # The frame count is filled in at the end
+                _png_chunk(f, b"acTL", struct.pack(">II", 0, 0))
+            x, y = box[:2] if box else (0, 0)
+            _png_chunk(f, b"fcTL", struct.pack(
+                ">IIIIIHHBB", seq, im.width, im.height, x, y, _ms(duration), 1000, 0, 0,
+            ))
+            seq += 1
+            for kind, data in chunks:
+                if kind != b"IDAT":
+                    continue
+                if count == 0:
+                    _png_chunk(f, b"IDAT", data)
+                else:
+                    _png_chunk(f, b"fdAT", struct.pack(">I", seq) + data)
+                    seq += 1
+            count += 1
+        _png_chunk(f, b"IEND", b"")
+        f.seek(actl)
+        _png_chunk(f, b"acTL", struct.pack(">II", count, 0))
+
+
+def _write_webp(ring, size, path):
+    from PIL import Image
+
+    class Frames(Image.Image):
+        """The ring as one multi-frame image. Pillow's WebP encoder takes
+        the frames one by one through ``seek``, so only the current one
+        is ever built."""
+
+        def __init__(self):
+            super().__init__()
+            self._mode = "RGB"
+            self._size = size
+            self.n_frames = len(ring.durations())
+            self._frames = None
+            self._index = -1
+            self.seek(0)
+
+        def seek(self, frame):
+            if frame == self._index:
+                return
+            if frame < self._index or self._frames is None:
+                self._frames, self._index = ring.frames(), -1
+            while self._index < frame:
+                arr = next(self._frames)[0]
+                self._index += 1
+            self.im = _rgb(arr, size).im
+
+        def tell(self):
+            return self._index
+
+    durations = [_ms(d) for d in ring.durations()]
+    Frames().save(path, "WEBP", save_all=True, duration=durations, loop=0, lossless=False, quality=80)
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+
+from src.core import capture
+from src.core.export import burn_timestamp, default_filename, save_dir, save_image, unique_path
+
+
+class CaptureRequest:
+    __slots__ = ("first_frame", "count", "interval")
+
+    def __init__(self, first_frame, count, interval):
+        self.first_frame = first_frame
+        self.count = count
+        self.interval = interval
+
+
+class CaptureScheduler(QObject):
+    """Queues full-screen captures requested while the overlay is open.
+
+    Each request is a burst of ``burst_count`` shots taken ``burst_interval_ms``
+    apart and saved straight to ``save_dir`` (no dialog). Two worker threads
+    keep the GUI thread free:
+
+    * the grabber takes requests from a bounded queue and grabs the shots;
+    * the encoder takes frames from a second bounded queue and writes them.
+
+    A full request queue rejects new requests (``capture_dropped``); a full
+    frame queue blocks the grabber, so a slow disk slows bursts down instead
+    of losing shots. Presses arriving within ``COALESCE_WINDOW_S`` of the
+    last accepted request are coalesced into it (key repeat, double presses);
+    the window is fixed so that a short or zero burst interval does not turn
+    it off and a long one does not swallow deliberate presses.
+    """
+
+    MAX_PENDING_REQUESTS = 16
+    MAX_PENDING_FRAMES = 8
+    COALESCE_WINDOW_S = 0.15
+
+    capture_finished = pyqtSignal(str)
+    capture_dropped = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
+
+        self._requests = queue.Queue(self.MAX_PENDING_REQUESTS)
+        self._frames = queue.Queue(self.MAX_PENDING_FRAMES)
+        self._last_accepted = None
+
+        self.coalesced = 0
+        self.dropped = 0
+
+        threading.Thread(target=self._grab_loop, name="capture-grabber", daemon=True).start()
+        threading.Thread(target=self._encode_loop, name="capture-encoder", daemon=True).start()
+
+    def request(self, frame=None):
+        """Queue a burst. *frame*, if given, is used as its first shot."""
+        count = max(1, self.settings.value("burst_count", 1, type=int))
+        interval = max(0, self.settings.value("burst_interval_ms", 250, type=int)) / 1000
+
+        now = time.monotonic()
+        if self._last_accepted is not None and now - self._last_accepted < self.COALESCE_WINDOW_S:
+            self.coalesced += 1
+            return False
+
+        try:
+            self._requests.put_nowait(CaptureRequest(frame, count, interval))
+        except queue.Full:
+            self.dropped += 1
+            self.capture_dropped.emit(f"Cola de capturas llena, captura descartada ({self.dropped})")
+            return False
+
+        self._last_accepted = now
+        return True
+
+    def pending(self):
+        return self._requests.qsize() + self._frames.qsize()
+
+    # ---------------------------------------------------------------------
+    # Worker threads
+    # ---------------------------------------------------------------------
+    def _grab_loop(self):
+        while True:
+            req = self._requests.get()
+            start = time.monotonic()
+            for i in range(req.count):
+                # Sleep until this shot's slot so encode time doesn't add drift
+                delay = start + i * req.interval - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                try:
+                    frame = req.first_frame if i == 0 and req.first_frame else capture.grab()
+                except Exception as e:
+                    print(f"Error en captura en ráfaga: {e}")
+                    frame = None
+                # Blocks when the encoder falls behind (back-pressure)
+                self._frames.put((frame, i == req.count - 1))
+
+    def _encode_loop(self):
+        # QSettings instances must not be shared across threads
+        settings = QSettings("Webtechcrafter", "PixelCatchr")
+        folder = None
+        saved = 0
+        while True:
+            frame, last_of_burst = self._frames.get()
+            if frame is not None:
+                try:
+                    folder = save_dir(settings)
+                    when = datetime.fromtimestamp(frame.timestamp)
+                    img = frame.to_qimage()
+                    if settings.value("show_datetime", True, type=bool):
+                        burn_timestamp(img, when)
+                    path = unique_path(folder, default_filename(settings, when))
+                    if save_image(img, path):
+                        saved += 1
+                    else:
+                        print(f"No se pudo guardar la captura en: {path}")
+                except Exception as e:
+                    print(f"Error al guardar captura en ráfaga: {e}")
+
+            if last_of_burst and saved:
+                self.capture_finished.emit(f"{saved} captura(s) guardada(s) en: {folder}")
+                saved = 0
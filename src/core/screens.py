@@ -0,0 +1,46 @@
+"""Mapping between Qt's logical coordinates and physical (device) pixels.
+
+With high-DPI scaling each screen keeps its top-left corner at its native
+position and only its size is divided by the device pixel ratio, so on a
+mixed-DPI desktop there is no single factor between the two spaces: every
+point maps through the screen it is on. mss, the frames in
+``src.core.capture`` and exported images all work in physical pixels.
+"""
+from PyQt6.QtCore import QPointF, QRect, QRectF, QSizeF
+
+
+def native_geometry(screen, monitors=()) -> QRect:
+    """*screen*'s rectangle in physical desktop pixels.
+
+    Qt rounds logical sizes, so scaling them back can be a pixel off (1600
+    px at 150% is 1067 logical, 1600.5 back). When *monitors* (mss monitor
+    dicts) include one at the same origin with a size within a pixel of
+    the estimate, its exact size is used.
+    """
+    geo = screen.geometry()
+    dpr = screen.devicePixelRatio()
+    size = QSizeF(geo.size()) * dpr
+    for m in monitors:
+        if (m["left"], m["top"]) == (geo.x(), geo.y()) \
+                and abs(m["width"] - size.width()) <= dpr and abs(m["height"] - size.height()) <= dpr:
+            return QRect(m["left"], m["top"], m["width"], m["height"])
+    return QRect(geo.topLeft(), size.toSize())
+
+
+def to_native(screen, point: QPointF) -> QPointF:
+    """Map a logical desktop point on *screen* to physical pixels."""
+    origin = QPointF(screen.geometry().topLeft())
+    return origin + (QPointF(point) - origin) * screen.devicePixelRatio()
+
+
+def native_rect(screen, rect) -> QRect:
+    """Map a logical desktop rectangle on *screen* to whole physical pixels.
+
+    Edges are rounded to the nearest device pixel, so a rectangle covering
+    the whole screen maps exactly onto ``native_geometry(screen)``.
+    """
+    rect = QRectF(rect)
+    top_left = to_native(screen, rect.topLeft())
+    bottom_right = to_native(screen, rect.topLeft() + QPointF(rect.width(), rect.height()))
+    left, top = round(top_left.x()), round(top_left.y())
+    return QRect(left, top, round(bottom_right.x()) - left, round(bottom_right.y()) - top)
@@ -0,0 +1,209 @@
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+from PyQt6.QtGui import QImage
+
+from src.core import capture
+from src.core.export import burn_timestamp, default_filename, save_dir, save_image, unique_path
+from src.core.timelapse import frame_array
+
+# Right-hand columns left out of row hashes: a scrollbar thumb moves on every
+# scroll and would otherwise make otherwise identical rows differ.
+SCROLLBAR_MARGIN = 24
+MIN_OVERLAP_MATCH = 0.8
+
+_rng = np.random.default_rng(0x5C0111)
+_weights = {}
+
+
+def row_hashes(arr):
+    """One uint64 hash per row of a (height, width) uint32 frame array."""
+    width = arr.shape[1]
+    if width > 2 * SCROLLBAR_MARGIN:
+        arr = arr[:, : width - SCROLLBAR_MARGIN]
+        width = arr.shape[1]
+    w = _weights.get(width)
+    if w is None:
+        # Odd weights keep every column significant under mod 2**64 wraparound
+        w = _weights[width] = _rng.integers(1, 2**63, size=width, dtype=np.uint64) | np.uint64(1)
+    return (arr.astype(np.uint64) * w).sum(axis=1, dtype=np.uint64)
+
+
+def _unique_rows(h):
+    values, index, counts = np.unique(h, return_index=True, return_counts=True)
+    keep = counts == 1
+    return values[keep], index[keep]
+
+
+def find_scroll_offset(prev_h, cur_h):
+    """How many rows the content moved up between two frames, or None.
+
+    Rows whose hash is unique in both frames act as anchors; each anchor
+    votes for ``row_in_prev - row_in_cur`` and the winning offset is then
+    checked against the whole overlap. Returns 0 when nothing moved and
+    None when the frames can't be aligned (scrolled up, or too far).
+    """
+    if np.array_equal(prev_h, cur_h):
+        return 0
+    pv, pi = _unique_rows(prev_h)
+    cv, ci = _unique_rows(cur_h)
+    _, p_at, c_at = np.intersect1d(pv, cv, assume_unique=True, return_indices=True)
+    offsets = pi[p_at] - ci[c_at]
+    offsets = offsets[offsets > 0]
+    if offsets.size == 0:
+        return None
+
+    offset = int(np.bincount(offsets).argmax())
+    overlap = len(prev_h) - offset
+    matched = np.count_nonzero(prev_h[offset:] == cur_h[:overlap])
+    return offset if matched >= MIN_OVERLAP_MATCH * overlap else None
+
+
+class ScrollStats:
+    def __init__(self):
+        self.frames = 0
+        self.moved = 0
+        self.unaligned = 0
+        self.missed_ticks = 0
+        self.align_ms = 0.0
+
+    def summary(self):
+        per_frame = self.align_ms / self.frames if self.frames else 0.0
+        return (
+            f"{self.frames} fotogramas, {self.moved} con desplazamiento, "
+            f"{self.unaligned} sin alinear, {self.missed_ticks} intervalos perdidos, "
+            f"{per_frame:.1f} ms de alineación por fotograma"
+        )
+
+
+class ScrollCapture(QObject):
+    """Captures a region repeatedly while its content scrolls and stitches
+    the frames into one tall image.
+
+    Each frame's row hashes are matched against the last stitched frame to
+    find the vertical offset, and only the newly revealed rows are appended.
+    Those strips are written to a temporary file as they arrive, so memory
+    holds two frames no matter how long the page is; the final image is
+    assembled from the file when capture stops. Capture stops on ``stop()``,
+    after ``scroll_idle_s`` without movement, or at ``scroll_max_height``.
+    """
+
+    FPS = 60
+    # The user needs a moment to start scrolling once the overlay closes
+    START_GRACE_S = 5.0
+
+    finished = pyqtSignal(str)
+
+    def __init__(self, region):
+        super().__init__()
+        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
+        self.region = region
+        self.stats = ScrollStats()
+        self.height = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running():
+            return
+        self.idle_s = max(0.5, self.settings.value("scroll_idle_s", 2.0, type=float))
+        self.max_height = max(1, self.settings.value("scroll_max_height", 20000, type=int))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="scroll-capture", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        try:
+            with tempfile.TemporaryFile(prefix="pixelcatchr-scroll-") as strips:
+                first = self._capture(strips)
+                if first is None:
+                    self.finished.emit("Captura con desplazamiento cancelada: no se pudo capturar la región")
+                    return
+                path = self._save(strips, first)
+        except Exception as e:
+            self.finished.emit(f"Error en captura con desplazamiento: {e}")
+            return
+        print(f"Captura con desplazamiento: {self.stats.summary()}")
+        self.finished.emit(f"Captura con desplazamiento guardada en: {path} ({self.height} px de alto)")
+
+    def _capture(self, strips):
+        """Grab and stitch until stopped; returns the first frame."""
+        interval = 1.0 / self.FPS
+        first = prev_h = None
+        start = last_move = time.monotonic()
+        tick = 0
+        while not self._stop.is_set():
+            deadline = start + tick * interval
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            late_ticks = int((time.monotonic() - deadline) // interval)
+            if late_ticks > 0:
+                self.stats.missed_ticks += late_ticks
+                tick += late_ticks
+            tick += 1
+
+            try:
+                frame = capture.grab(self.region)
+            except Exception as e:
+                print(f"Error en captura con desplazamiento: {e}")
+                continue
+            self.stats.frames += 1
+
+            t0 = time.perf_counter()
+            arr = frame_array(frame)
+            cur_h = row_hashes(arr)
+            if first is None:
+                first, prev_h = frame, cur_h
+                strips.write(frame.bgra)
+                self.height = frame.height
+                continue
+            offset = find_scroll_offset(prev_h, cur_h)
+            self.stats.align_ms += (time.perf_counter() - t0) * 1000
+
+            now = time.monotonic()
+            if offset is None:
+                # Keep matching against the last stitched frame; scrolling
+                # back down to it resumes stitching where it left off
+                self.stats.unaligned += 1
+            elif offset > 0:
+                offset = min(offset, self.max_height - self.height)
+                strips.write(arr[frame.height - offset:].tobytes())
+                self.height += offset
+                prev_h = cur_h
+                last_move = now
+                self.stats.moved += 1
+                if self.height >= self.max_height:
+                    break
+
+            idle_limit = self.idle_s if self.stats.moved else self.START_GRACE_S
+            if now - last_move > idle_limit:
+                break
+        return first
+
+    def _save(self, strips, first):
+        # QSettings instances must not be shared across threads
+        settings = QSettings("Webtechcrafter", "PixelCatchr")
+        img = QImage(first.width, self.height, QImage.Format.Format_RGB32)
+        ptr = img.bits()
+        ptr.setsize(img.sizeInBytes())
+        strips.seek(0)
+        strips.readinto(memoryview(ptr))
+
+        when = datetime.fromtimestamp(first.timestamp)
+        if settings.value("show_datetime", True, type=bool):
+            burn_timestamp(img, when)
+        path = unique_path(save_dir(settings), default_filename(settings, when))
+        if not save_image(img, path):
+            raise OSError(f"no se pudo guardar {path}")
+        return path
@@ -0,0 +1,195 @@
+"""Rectangles of UI elements (windows, panels, buttons) found in a screenshot.
+
+``detect_rects`` looks for long straight edges: a pixel is on a horizontal
+edge when its luma differs from the pixel above it by more than about
+``THRESHOLD`` levels per channel, and runs of at least ``MIN_SIDE`` such
+pixels on a row are segments. Two segments with the same ends make a
+rectangle when the columns at both ends are mostly vertical edge between
+them.
+``RectIndex`` answers "smallest rectangle containing this point".
+"""
+import collections
+import threading
+import time
+
+import numpy as np
+from PyQt6.QtCore import QObject, pyqtSignal
+
+# Per channel, in 0-255 levels
+THRESHOLD = 24
+MIN_SIDE = 16
+# Segment ends within this many pixels are the same corner
+CORNER_TOLERANCE = 2
+# Share of a side's pixels that must be on an edge
+MIN_COVERAGE = 0.85
+MAX_RECTS = 20000
+# Bottom segments tried per top segment (table rows would be quadratic)
+MAX_PAIRS = 64
+
+
+def luma(arr):
+    """Cheap luma (B + 2G + R, 0-1020) of a (h, w) uint32 BGRA array, as int16."""
+    channels = arr.view(np.uint8).reshape(arr.shape[0], arr.shape[1], 4)
+    lum = channels[:, :, 1].astype(np.int16) * 2
+    lum += channels[:, :, 0]
+    lum += channels[:, :, 2]
+    return lum
+
+
+def runs(mask, min_len):
+    """``(line, start, end)`` arrays of the runs of True along axis 1 that
+    are at least *min_len* long (*end* exclusive)."""
+    starts = mask.copy()
+    starts[:, 1:] &= ~mask[:, :-1]
+    ends = mask.copy()
+    ends[:, :-1] &= ~mask[:, 1:]
+    line, start = np.nonzero(starts)
+    _, last = np.nonzero(ends)
+    end = last + 1
+    keep = end - start >= min_len
+    return line[keep], start[keep], end[keep]
+
+
+def detect_rects(arr, min_side=MIN_SIDE):
+    """Candidate rectangles in *arr*, as a list of ``(x, y, w, h)``.
+
+    The screen border counts as an edge, so maximized windows are found.
+    """
+    height, width = arr.shape
+    lum = luma(arr)
+    threshold = THRESHOLD * 4
+    # Row y: the edge above pixel row y (0 and ``height`` are the border)
+    horizontal = np.ones((height + 1, width), dtype=bool)
+    horizontal[1:-1] = np.abs(lum[1:] - lum[:-1]) > threshold
+    rows, x0s, x1s = runs(horizontal, min_side)
+
+    # Vertical edges are only needed on the columns of candidate sides;
+    # each is computed once, as running sums so coverage is a subtraction
+    columns = {}
+
+    def covered(x, top, bottom):
+        if x <= 0 or x >= width:
+            return True
+        sums = columns.get(x)
+        if sums is None:
+            edge = np.abs(lum[:, x] - lum[:, x - 1]) > threshold
+            sums = columns[x] = np.concatenate(([0], np.cumsum(edge)))
+        return sums[bottom] - sums[top] >= MIN_COVERAGE * (bottom - top)
+
+    # Segments grouped by their (rounded) ends, top to bottom
+    groups = collections.defaultdict(list)
+    t = CORNER_TOLERANCE * 2 + 1
+    for y, x0, x1 in zip(rows.tolist(), x0s.tolist(), x1s.tolist()):
+        groups[(x0 // t, x1 // t)].append((y, x0, x1))
+
+    found = set()
+    for segments in groups.values():
+        for i, (top, x0, x1) in enumerate(segments):
+            for bottom, bx0, bx1 in segments[i + 1:i + 1 + MAX_PAIRS]:
+                if bottom - top < min_side:
+                    continue
+                left = min(x0, bx0)
+                right = max(x1, bx1)  # exclusive; the right side is the edge at ``right``
+                if covered(left, top, bottom) and covered(right, top, bottom):
+                    found.add((left, top, right - left, bottom - top))
+                    if len(found) >= MAX_RECTS:
+                        return list(found)
+    return list(found)
+
+
+class RectIndex:
+    """Static R-tree over rectangles, bulk-loaded with Sort-Tile-Recursive.
+
+    Nodes hold up to ``NODE_SIZE`` children, so a point query visits
+    O(log n) nodes on each path it follows; with UI rectangles, which nest
+    rather than overlap, that is close to a single path.
+    """
+
+    NODE_SIZE = 16
+
+    def __init__(self, rects):
+        # Entries are (x0, y0, x1, y1, payload); payload is a rect or a node
+        level = [(x, y, x + w, y + h, (x, y, w, h)) for x, y, w, h in rects]
+        self.root = None
+        if not level:
+            return
+        leaf = True
+        while True:
+            nodes = self._pack(level, leaf)
+            leaf = False
+            if len(nodes) == 1:
+                self.root = nodes[0]
+                break
+            level = nodes
+
+    def _pack(self, entries, leaf):
+        size = self.NODE_SIZE
+        count = -(-len(entries) // size)
+        slices = max(1, int(np.ceil(np.sqrt(count))))
+        per_slice = slices * size
+        entries = sorted(entries, key=lambda e: e[0] + e[2])
+        nodes = []
+        for i in range(0, len(entries), per_slice):
+            column = sorted(entries[i:i + per_slice], key=lambda e: e[1] + e[3])
+            for j in range(0, len(column), size):
+                children = column[j:j + size]
+                nodes.append((
+                    min(c[0] for c in children),
+                    min(c[1] for c in children),
+                    max(c[2] for c in children),
+                    max(c[3] for c in children),
+                    (leaf, children),
+                ))
+        return nodes
+
+    def smallest_at(self, x, y):
+        """Smallest-area rectangle containing (x, y), or ``None``."""
+        best, best_area = None, None
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            x0, y0, x1, y1, (leaf, children) = stack.pop()
+            if not (x0 <= x < x1 and y0 <= y < y1):
+                continue
+            for child in children:
+                if child[0] <= x < child[2] and child[1] <= y < child[3]:
+                    if leaf:
+                        area = (child[2] - child[0]) * (child[3] - child[1])
+                        if best_area is None or area < best_area:
+                            best, best_area = child[4], area
+                    else:
+                        stack.append(child)
+        return best
+
+
+class SnapDetector(QObject):
+    """Runs ``detect_rects`` on a worker thread and indexes the result.
+
+    ``index`` stays ``None`` until ``ready`` is emitted. ``detect_ms`` is the
+    time the detection took.
+    """
+
+    ready = pyqtSignal()
+
+    def __init__(self, arr):
+        super().__init__()
+        self.arr = arr
+        self.index = None
+        self.count = 0
+        self.detect_ms = 0.0
+
+    def start(self):
+        threading.Thread(target=self._run, name="snap-detector", daemon=True).start()
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            rects = detect_rects(self.arr)
+        except Exception as e:
+            print(f"Error detectando elementos: {e}")
+            return
+        index = RectIndex(rects)
+        self.detect_ms = (time.perf_counter() - t0) * 1000
+        self.count = len(rects)
+        self.arr = None
+        self.index = index
+        self.ready.emit()
@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+
+from src.core import capture
+
+# Defaults for the "capture when stable" settings (stable_*)
+THRESHOLD = 1.0
+STABLE_MS = 200
+INTERVAL_MS = 40
+TIMEOUT_MS = 3000
+# Every STEP-th pixel on each axis is compared (1/16 of the frame)
+STEP = 4
+
+
+def sample(frame, step=STEP):
+    """Subsampled BGR channels of a Frame as an (h, w, 3) uint8 array."""
+    pixels = np.frombuffer(frame.bgra, dtype=np.uint8, count=frame.width * frame.height * 4)
+    return pixels.reshape(frame.height, frame.width, 4)[::step, ::step, :3]
+
+
+def mean_abs_diff(a, b):
+    """Mean absolute difference per channel, in 0-255 levels."""
+    if a.shape != b.shape:
+        return 255.0
+    return float(np.abs(a.astype(np.int16) - b).mean())
+
+
+class StabilityReport:
+    def __init__(self):
+        self.samples = 0
+        self.waited_ms = 0.0
+        self.sample_ms = 0.0
+        self.last_mad = None
+        self.stable = False
+
+    def summary(self):
+        per_sample = self.sample_ms / self.samples if self.samples else 0.0
+        state = "estable" if self.stable else "sin estabilizar (tiempo agotado)"
+        mad = f"{self.last_mad:.2f}" if self.last_mad is not None else "-"
+        return (
+            f"Pantalla {state} en {self.waited_ms:.0f} ms: {self.samples} muestras, "
+            f"{per_sample:.1f} ms por muestra, diferencia media {mad}"
+        )
+
+
+def wait_until_stable(region=None, monitor=0, threshold=THRESHOLD, stable_ms=STABLE_MS,
+                      interval_ms=INTERVAL_MS, timeout_ms=TIMEOUT_MS):
+    """Grab until consecutive frames stay within *threshold* for *stable_ms*.
+
+    Returns ``(frame, report)``. The frame is the last one grabbed, either
+    the first one after the screen settled or the one at *timeout_ms*.
+    """
+    report = StabilityReport()
+    start = time.monotonic()
+    frame = prev = None
+    calm_since = None
+    while True:
+        t0 = time.perf_counter()
+        frame = capture.grab(region, monitor)
+        cur = sample(frame)
+        if prev is not None:
+            report.last_mad = mean_abs_diff(cur, prev)
+        report.sample_ms += (time.perf_counter() - t0) * 1000
+        report.samples += 1
+
+        now = time.monotonic()
+        if report.last_mad is not None and report.last_mad <= threshold:
+            calm_since = calm_since if calm_since is not None else now - interval_ms / 1000
+            if (now - calm_since) * 1000 >= stable_ms:
+                report.stable = True
+                break
+        else:
+            calm_since = None
+        if (now - start) * 1000 >= timeout_ms:
+            break
+        prev = cur
+        time.sleep(max(0.0, interval_ms / 1000 - (time.perf_counter() - t0)))
+
+    report.waited_ms = (time.monotonic() - start) * 1000
+    return frame, report
+
+
+def wait_from_settings(settings, region=None, monitor=0):
+    """``wait_until_stable`` with the ``stable_*`` settings."""
+    return wait_until_stable(
+        region,
+        monitor,
+        threshold=settings.value("stable_threshold", THRESHOLD, type=float),
+        stable_ms=settings.value("stable_ms", STABLE_MS, type=int),
+        interval_ms=settings.value("stable_interval_ms", INTERVAL_MS, type=int),
+        timeout_ms=settings.value("stable_timeout_ms", TIMEOUT_MS, type=int),
+    )
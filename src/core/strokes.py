@@ -0,0 +1,123 @@
+"""Point reduction for freehand pen and highlighter strokes.
+
+Mouse-move events arrive at up to the pointer's report rate, so a few
+seconds of drawing would make a path of thousands of elements, which is
+re-stroked on every repaint and at export. ``StrokeBuilder`` drops points
+closer than ``MIN_DISTANCE`` to the last one while drawing. When the
+stroke is finished, Ramer-Douglas-Peucker removes points within
+``EPSILON`` of the line through their neighbours. Both are well under the
+narrowest stroke (3 px), so the line looks the same. Optionally the
+result is smoothed with a centripetal Catmull-Rom spline, written as
+cubic Béziers.
+"""
+import numpy as np
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QPainterPath
+
+# In overlay (logical) pixels at 100% zoom
+MIN_DISTANCE = 1.0
+EPSILON = 0.75
+
+
+def simplify(points, epsilon=EPSILON):
+    """Ramer-Douglas-Peucker on an (n, 2) array; returns the kept rows.
+
+    Iterative, and each step measures all the points of a span at once.
+    """
+    n = len(points)
+    if n < 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        a, b = points[first], points[last]
+        span = points[first + 1:last]
+        ab = b - a
+        length = np.hypot(ab[0], ab[1])
+        if length == 0:
+            dist = np.hypot(span[:, 0] - a[0], span[:, 1] - a[1])
+        else:
+            dist = np.abs(ab[0] * (span[:, 1] - a[1]) - ab[1] * (span[:, 0] - a[0])) / length
+        i = int(np.argmax(dist))
+        if dist[i] > epsilon:
+            mid = first + 1 + i
+            keep[mid] = True
+            stack.append((first, mid))
+            stack.append((mid, last))
+    return points[keep]
+
+
+def polyline_path(points) -> QPainterPath:
+    path = QPainterPath(QPointF(*points[0]))
+    for x, y in points[1:]:
+        path.lineTo(x, y)
+    return path
+
+
+def smooth_path(points, alpha=0.5) -> QPainterPath:
+    """Path through *points* along a Catmull-Rom spline (*alpha* 0.5 is
+    centripetal, which does not overshoot or loop at sharp turns)."""
+    n = len(points)
+    if n < 3:
+        return polyline_path(points)
+    # Repeat the ends so the curve reaches them
+    p = np.vstack((points[0], points, points[-1])).astype(float)
+    path = QPainterPath(QPointF(*p[1]))
+    for i in range(1, n):
+        p0, p1, p2, p3 = p[i - 1], p[i], p[i + 1], p[i + 2]
+        d1 = max(np.hypot(*(p1 - p0)) ** alpha, 1e-6)
+        d2 = max(np.hypot(*(p2 - p1)) ** alpha, 1e-6)
+        d3 = max(np.hypot(*(p3 - p2)) ** alpha, 1e-6)
+        # Tangents of the non-uniform spline, scaled to the segment
+        m1 = (p2 - p1) + d2 * ((p1 - p0) / d1 - (p2 - p0) / (d1 + d2))
+        m2 = (p2 - p1) + d2 * ((p3 - p2) / d3 - (p3 - p1) / (d2 + d3))
+        c1, c2 = p1 + m1 / 3, p2 - m2 / 3
+        path.cubicTo(QPointF(*c1), QPointF(*c2), QPointF(*p2))
+    return path
+
+
+class StrokeBuilder:
+    """Collects the points of a stroke being drawn.
+
+    ``add`` takes every pointer position and says whether it was kept;
+    ``take_new`` hands the kept ones to the live path once per frame.
+    ``finish`` returns the path to store. Tolerances shrink with *zoom*,
+    since a zoomed-in view shows finer detail of the stroke.
+    """
+
+    __slots__ = ("points", "last", "drawn", "min_distance", "epsilon")
+
+    def __init__(self, start: QPointF, zoom=1.0):
+        self.points = [(start.x(), start.y())]
+        self.last = self.points[0]
+        self.drawn = 1
+        self.min_distance = MIN_DISTANCE / zoom
+        self.epsilon = EPSILON / zoom
+
+    def add(self, p: QPointF) -> bool:
+        self.last = (p.x(), p.y())
+        x, y = self.points[-1]
+        if (p.x() - x) ** 2 + (p.y() - y) ** 2 < self.min_distance ** 2:
+            return False
+        self.points.append((p.x(), p.y()))
+        return True
+
+    def take_new(self):
+        """Points kept since the last call, after the last one already
+        taken (so consecutive batches join up); empty if there are none."""
+        if self.drawn == len(self.points):
+            return []
+        new = self.points[self.drawn - 1:]
+        self.drawn = len(self.points)
+        return new
+
+    def finish(self, smooth=False) -> QPainterPath:
+        # The end of the stroke is kept even if it was filtered out
+        if self.last != self.points[-1]:
+            self.points.append(self.last)
+        points = simplify(np.array(self.points, dtype=float), self.epsilon)
+        return smooth_path(points) if smooth else polyline_path(points)
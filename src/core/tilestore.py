@@ -0,0 +1,197 @@
+"""Content-addressed storage for repeated captures of the same area.
+
+Captures are cut into ``TILE`` x ``TILE`` tiles and each tile is keyed by a
+hash of its pixels. A tile is compressed and appended to ``tiles.pack`` the
+first time it is seen; after that, captures only reference it. Each capture
+is a small JSON manifest in ``manifests/`` listing its tile keys row by row.
+
+Layout of a store folder::
+
+    tiles.pack          zlib-compressed BGRA tiles, back to back
+    tiles.idx           one INDEX_RECORD per tile in tiles.pack
+    manifests/<name>.json
+"""
+import collections
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+
+import numpy as np
+
+from src.core.export import unique_path
+from src.core.recording import changed_tiles
+
+TILE = 64
+# key, offset in tiles.pack, compressed length, tile height, tile width
+INDEX_RECORD = struct.Struct("<16sQIHH")
+
+
+def tile_key(pixels):
+    h = hashlib.blake2b(pixels.tobytes(), digest_size=16)
+    h.update(struct.pack("<HH", *pixels.shape))
+    return h.digest()
+
+
+class StoreStats:
+    def __init__(self):
+        self.captures = 0
+        self.tiles = 0
+        self.new_tiles = 0
+        self.raw_bytes = 0
+        self.written_bytes = 0
+
+    def summary(self):
+        ratio = self.raw_bytes / self.written_bytes if self.written_bytes else 0.0
+        return (
+            f"{self.captures} capturas, {self.new_tiles}/{self.tiles} teselas nuevas, "
+            f"{self.written_bytes / 1e6:.1f} MB escritos de {self.raw_bytes / 1e6:.1f} MB ({ratio:.0f}x)"
+        )
+
+
+class TileStore:
+    """Writes captures as tile manifests and rebuilds them on demand.
+
+    ``put`` only hashes the tiles that differ from the previous capture of
+    the same size; the others reuse its keys. ``load`` keeps recently
+    decoded tiles in an LRU cache, so rebuilding a series of similar
+    captures decompresses each distinct tile about once.
+    """
+
+    CACHE_TILES = 4096
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.manifest_dir = os.path.join(folder, "manifests")
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        self.stats = StoreStats()
+        self._lock = threading.Lock()
+        self._index = {}
+        self._cache = collections.OrderedDict()
+        self._prev = None  # (array, keys) of the last capture written
+        self._load_index()
+        self._pack = open(os.path.join(folder, "tiles.pack"), "a+b")
+        self._idx = open(os.path.join(folder, "tiles.idx"), "ab")
+
+    def _load_index(self):
+        path = os.path.join(self.folder, "tiles.idx")
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            data = f.read()
+        # A torn last record (crash mid-write) is ignored
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for key, offset, length, h, w in INDEX_RECORD.iter_unpack(data[:usable]):
+            self._index[key] = (offset, length, h, w)
+
+    def close(self):
+        with self._lock:
+            self._pack.close()
+            self._idx.close()
+
+    def names(self):
+        """Capture names in the order they were stored."""
+        entries = [e for e in os.scandir(self.manifest_dir) if e.name.endswith(".json")]
+        entries.sort(key=lambda e: (e.stat().st_mtime_ns, e.name))
+        return [e.name[:-5] for e in entries]
+
+    # ---------------------------------------------------------------------
+    # Writing
+    # ---------------------------------------------------------------------
+    def put(self, name, arr, timestamp=None):
+        """Store a (height, width) uint32 BGRA array as capture *name*
+        (``_1``, ``_2``... are appended if the name is taken).
+
+        Returns the number of bytes written to disk.
+        """
+        height, width = arr.shape
+        rows = range(0, height, TILE)
+        cols = range(0, width, TILE)
+        with self._lock:
+            prev_arr, prev_keys = self._prev if self._prev else (None, None)
+            if prev_arr is not None and prev_arr.shape == arr.shape:
+                dirty = changed_tiles(arr, prev_arr, TILE)
+            else:
+                dirty = np.ones((len(rows), len(cols)), dtype=bool)
+
+            written = 0
+            keys = []
+            for ty, y in enumerate(rows):
+                for tx, x in enumerate(cols):
+                    if not dirty[ty, tx]:
+                        keys.append(prev_keys[len(keys)])
+                        continue
+                    pixels = arr[y:y + TILE, x:x + TILE]
+                    key = tile_key(pixels)
+                    if key not in self._index:
+                        written += self._append_tile(key, pixels)
+                    keys.append(key)
+            self._pack.flush()
+            self._idx.flush()
+
+            manifest = {
+                "width": width,
+                "height": height,
+                "tile": TILE,
+                "timestamp": timestamp,
+                "tiles": [k.hex() for k in keys],
+            }
+            data = json.dumps(manifest, separators=(",", ":")).encode("utf-8")
+            with open(unique_path(self.manifest_dir, f"{name}.json"), "wb") as f:
+                f.write(data)
+            written += len(data)
+
+            self._prev = (arr.copy(), keys)
+            self.stats.captures += 1
+            self.stats.tiles += len(keys)
+            self.stats.raw_bytes += arr.nbytes
+            self.stats.written_bytes += written
+            return written
+
+    def _append_tile(self, key, pixels):
+        blob = zlib.compress(np.ascontiguousarray(pixels).tobytes(), 1)
+        self._pack.seek(0, os.SEEK_END)
+        offset = self._pack.tell()
+        self._pack.write(blob)
+        h, w = pixels.shape
+        self._idx.write(INDEX_RECORD.pack(key, offset, len(blob), h, w))
+        self._index[key] = (offset, len(blob), h, w)
+        self.stats.new_tiles += 1
+        return len(blob) + INDEX_RECORD.size
+
+    # ---------------------------------------------------------------------
+    # Reading
+    # ---------------------------------------------------------------------
+    def manifest(self, name):
+        with open(os.path.join(self.manifest_dir, f"{name}.json"), "rb") as f:
+            return json.load(f)
+
+    def load(self, name):
+        """Rebuild capture *name*; returns (array, timestamp)."""
+        m = self.manifest(name)
+        tile = m["tile"]
+        arr = np.empty((m["height"], m["width"]), dtype=np.uint32)
+        keys = iter(m["tiles"])
+        with self._lock:
+            self._pack.flush()
+            for y in range(0, m["height"], tile):
+                for x in range(0, m["width"], tile):
+                    pixels = self._tile(bytes.fromhex(next(keys)))
+                    arr[y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+        return arr, m.get("timestamp")
+
+    def _tile(self, key):
+        pixels = self._cache.get(key)
+        if pixels is not None:
+            self._cache.move_to_end(key)
+            return pixels
+        offset, length, h, w = self._index[key]
+        self._pack.seek(offset)
+        raw = zlib.decompress(self._pack.read(length))
+        pixels = np.frombuffer(raw, dtype=np.uint32).reshape(h, w)
+        self._cache[key] = pixels
+        if len(self._cache) > self.CACHE_TILES:
+            self._cache.popitem(last=False)
+        return pixels
@@ -0,0 +1,222 @@
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from PyQt6.QtCore import QObject, QSettings, pyqtSignal
+
+from src.core import capture
+from src.core.export import burn_timestamp, default_filename, save_dir, save_image, unique_path
+
+
+def frame_array(frame):
+    """View a Frame's BGRA bytes as an (height, width) uint32 array (no copy)."""
+    return np.frombuffer(frame.bgra, dtype=np.uint32, count=frame.width * frame.height).reshape(
+        frame.height, frame.width
+    )
+
+
+def changed_pixels(a, b):
+    """Number of pixels that differ between two uint32 frame arrays."""
+    if a is None or b is None or a.shape != b.shape:
+        return a.size if a is not None else 0
+    return int(np.count_nonzero(a != b))
+
+
+class TimelapseStats:
+    def __init__(self):
+        self.ticks = 0
+        self.missed_ticks = 0
+        self.unchanged = 0
+        self.dropped = 0
+        self.written = 0
+        self.bytes_written = 0
+        self.grab_ms = 0.0
+        self.diff_ms = 0.0
+
+    def summary(self):
+        return (
+            f"{self.written} capturas guardadas ({self.bytes_written / 1e6:.1f} MB), "
+            f"{self.unchanged} sin cambios, {self.dropped} descartadas, "
+            f"{self.missed_ticks} intervalos perdidos"
+        )
+
+
+class TimelapseRecorder(QObject):
+    """Periodic full-desktop captures for long unattended runs.
+
+    A worker thread wakes on fixed deadlines (``start + n * interval``), so
+    the cadence doesn't drift; deadlines that were overslept are skipped and
+    counted instead of fired in a burst. Each grab is compared with the
+    previous one (vectorized uint32 compare) and frames with fewer than
+    ``timelapse_min_changed_px`` changed pixels are not encoded at all, so
+    CPU and disk follow how much the screen changes. Changed frames go
+    through a bounded queue to an encoder thread; when it is full the frame
+    is dropped rather than delaying the timer. Recording stops by itself
+    once ``timelapse_budget_mb`` has been written or the disk runs low.
+
+    With ``timelapse_tiles`` set, captures go to a ``TileStore`` in the run
+    folder instead of separate images, so a mostly static screen costs a
+    manifest per capture plus the tiles that changed (``python -m src.cli
+    --unpack`` turns the store back into images).
+    """
+
+    MAX_PENDING_FRAMES = 4
+    MIN_FREE_DISK_MB = 500
+
+    stopped = pyqtSignal(str)
+    # Both threads are done; the frames pending at ``stop`` are written
+    finished = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
+        self.stats = TimelapseStats()
+        self.folder = None
+        self._stop = threading.Event()
+        self._frames = queue.Queue(self.MAX_PENDING_FRAMES)
+        self._threads = []
+        # Cleared by the encoder thread once both threads are done, before
+        # ``finished``: that thread is still alive while the signal goes out
+        self._running = False
+
+    def is_running(self):
+        return self._running
+
+    def is_stopping(self):
+        """Stopped, but still writing the frames that were pending."""
+        return self._stop.is_set() and self.is_running()
+
+    def start(self):
+        if self.is_running():
+            return
+        self.interval = max(0.1, self.settings.value("timelapse_interval_s", 5.0, type=float))
+        self.min_changed = max(1, self.settings.value("timelapse_min_changed_px", 1, type=int))
+        self.budget_bytes = max(1, self.settings.value("timelapse_budget_mb", 1024, type=int)) * 1024 * 1024
+        self.show_datetime = self.settings.value("show_datetime", True, type=bool)
+        self.fmt = self.settings.value("image_format", "PNG").lower()
+        self.use_tiles = self.settings.value("timelapse_tiles", False, type=bool)
+
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        self.folder = os.path.join(save_dir(self.settings), f"timelapse_{stamp}")
+        os.makedirs(self.folder, exist_ok=True)
+        self.store = None
+        if self.use_tiles:
+            from src.core.tilestore import TileStore
+            self.store = TileStore(self.folder)
+
+        self.stats = TimelapseStats()
+        self._stop.clear()
+        self._frames = queue.Queue(self.MAX_PENDING_FRAMES)
+        self._running = True
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="timelapse-capture", daemon=True),
+            threading.Thread(target=self._encode_loop, name="timelapse-encoder", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, reason=None):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self.stopped.emit(f"Timelapse detenido{': ' + reason if reason else ''}. {self.stats.summary()}")
+
+    # ---------------------------------------------------------------------
+    # Worker threads
+    # ---------------------------------------------------------------------
+    def _capture_loop(self):
+        prev = None
+        start = time.monotonic()
+        tick = 0
+        while not self._stop.is_set():
+            deadline = start + tick * self.interval
+            delay = deadline - time.monotonic()
+            if delay > 0 and self._stop.wait(delay):
+                break
+            # Skip deadlines we overslept (suspend, slow grab) instead of catching up
+            late_ticks = int((time.monotonic() - deadline) // self.interval)
+            if late_ticks > 0:
+                self.stats.missed_ticks += late_ticks
+                tick += late_ticks
+            tick += 1
+            self.stats.ticks += 1
+
+            try:
+                t0 = time.perf_counter()
+                frame = capture.grab()
+                t1 = time.perf_counter()
+                cur = frame_array(frame)
+                changed = changed_pixels(cur, prev)
+                self.stats.grab_ms += (t1 - t0) * 1000
+                self.stats.diff_ms += (time.perf_counter() - t1) * 1000
+            except Exception as e:
+                print(f"Error en captura de timelapse: {e}")
+                continue
+
+            if prev is not None and changed < self.min_changed:
+                self.stats.unchanged += 1
+                continue
+            prev = cur
+
+            try:
+                self._frames.put_nowait(frame)
+            except queue.Full:
+                self.stats.dropped += 1
+                # Compare the next frame against the last one actually written
+                prev = None
+
+        # Wake the encoder so it can exit
+        try:
+            self._frames.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def _encode_loop(self):
+        # QSettings instances must not be shared across threads
+        settings = QSettings("Webtechcrafter", "PixelCatchr")
+        while True:
+            try:
+                frame = self._frames.get(timeout=1.0)
+            except queue.Empty:
+                if self._stop.is_set():
+                    break
+                continue
+            if frame is None:
+                break
+
+            try:
+                when = datetime.fromtimestamp(frame.timestamp)
+                name = os.path.splitext(default_filename(settings, when))[0]
+                if self.store is not None:
+                    # The timestamp is burned in when the store is unpacked
+                    self.stats.bytes_written += self.store.put(name, frame_array(frame), frame.timestamp)
+                else:
+                    img = frame.to_qimage()
+                    if self.show_datetime:
+                        burn_timestamp(img, when)
+                    path = unique_path(self.folder, f"{name}.{self.fmt}")
+                    if not save_image(img, path, self.fmt):
+                        raise OSError(f"no se pudo guardar {path}")
+                    self.stats.bytes_written += os.path.getsize(path)
+                self.stats.written += 1
+            except Exception as e:
+                print(f"Error al guardar timelapse: {e}")
+                continue
+
+            if self.stats.bytes_written >= self.budget_bytes:
+                self.stop("límite de disco alcanzado")
+            elif shutil.disk_usage(self.folder).free < self.MIN_FREE_DISK_MB * 1024 * 1024:
+                self.stop("poco espacio libre en disco")
+
+        if self.store is not None:
+            print(f"Timelapse en teselas: {self.store.stats.summary()}")
+            self.store.close()
+        for t in self._threads:
+            if t is not threading.current_thread():
+                t.join()
+        self._running = False
+        self.finished.emit()
@@ -0,0 +1,185 @@
+"""Recording of the input an overlay receives, for replaying it later.
+
+With ``PIXELCATCHR_TRACE=<file>`` set, every overlay records the mouse,
+wheel and key events its windows get, plus the tool and action picked on
+the toolbar, and writes them to *file* when it closes. The same trace
+replays against an offscreen overlay (``scripts/replay_trace.py``), so a
+slow interaction can be measured again after every change.
+
+File layout::
+
+    MAGIC                  b"PCTR" and a format version byte
+    header length          uint32
+    header                 JSON: screens (geometry, dpr, refresh rate)
+    records                zlib-compressed RECORD structs, back to back
+
+Positions are window-local logical pixels of the window with index
+``surface``, as Qt delivered them, so zoomed views replay the same way.
+"""
+import json
+import struct
+import time
+import zlib
+
+from PyQt6.QtCore import QEvent, QObject, QPoint, QPointF, Qt
+from PyQt6.QtGui import QKeyEvent, QMouseEvent, QWheelEvent
+
+MAGIC = b"PCTR\x02"
+# t (µs since start), kind, surface, button, buttons, modifiers, x, y, data.
+# Mouse buttons are Qt flags, ExtraButton6 and up do not fit a byte
+RECORD = struct.Struct("<QBBIIIffi")
+# Earlier format versions, still loaded: version byte -> RECORD
+OLD_RECORDS = {1: struct.Struct("<IBBBBIffi")}
+
+PRESS, RELEASE, MOVE, DOUBLE_CLICK, WHEEL, KEY_PRESS, KEY_RELEASE, TOOL, ACTION = range(9)
+
+MOUSE_KINDS = {
+    QEvent.Type.MouseButtonPress: PRESS,
+    QEvent.Type.MouseButtonRelease: RELEASE,
+    QEvent.Type.MouseMove: MOVE,
+    QEvent.Type.MouseButtonDblClick: DOUBLE_CLICK,
+}
+KEY_KINDS = {QEvent.Type.KeyPress: KEY_PRESS, QEvent.Type.KeyRelease: KEY_RELEASE}
+
+# Tool and action names are stored as indexes into these
+TOOLS = ("none", "pen", "highlighter", "arrow", "rect", "text", "blur", "move")
+ACTIONS = ("undo", "redo", "copy", "save", "close", "scroll", "record")
+
+
+class Record:
+    __slots__ = ("t", "kind", "surface", "button", "buttons", "modifiers", "x", "y", "data")
+
+    def __init__(self, t, kind, surface=0, button=0, buttons=0, modifiers=0, x=0.0, y=0.0, data=0):
+        self.t = t
+        self.kind = kind
+        self.surface = surface
+        self.button = button
+        self.buttons = buttons
+        self.modifiers = modifiers
+        self.x = x
+        self.y = y
+        self.data = data
+
+    def pack(self):
+        return RECORD.pack(
+            round(self.t * 1e6), self.kind, self.surface, self.button, self.buttons,
+            self.modifiers, self.x, self.y, self.data,
+        )
+
+    def to_event(self):
+        """The Qt event to send to the window, or ``None`` for toolbar picks."""
+        pos = QPointF(self.x, self.y)
+        modifiers = Qt.KeyboardModifier(self.modifiers)
+        if self.kind in (PRESS, RELEASE, MOVE, DOUBLE_CLICK):
+            qt_type = next(t for t, k in MOUSE_KINDS.items() if k == self.kind)
+            return QMouseEvent(
+                qt_type, pos, pos, Qt.MouseButton(self.button), Qt.MouseButton(self.buttons), modifiers
+            )
+        if self.kind == WHEEL:
+            return QWheelEvent(
+                pos, pos, QPoint(0, 0), QPoint(0, self.data),
+                Qt.MouseButton(self.buttons), modifiers, Qt.ScrollPhase.NoScrollPhase, False,
+            )
+        if self.kind in (KEY_PRESS, KEY_RELEASE):
+            qt_type = QEvent.Type.KeyPress if self.kind == KEY_PRESS else QEvent.Type.KeyRelease
+            return QKeyEvent(qt_type, self.data, modifiers)
+        return None
+
+
+class Trace:
+    """A header (the screens) and the records, in time order."""
+
+    def __init__(self, screens=(), records=()):
+        self.screens = list(screens)
+        self.records = list(records)
+
+    @property
+    def duration(self):
+        return self.records[-1].t if self.records else 0.0
+
+    def save(self, path):
+        header = json.dumps({"screens": self.screens}).encode("utf-8")
+        body = zlib.compress(b"".join(r.pack() for r in self.records), 6)
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(body)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        version = data[len(MAGIC) - 1] if len(data) >= len(MAGIC) else None
+        record = RECORD if version == MAGIC[-1] else OLD_RECORDS.get(version)
+        if not data.startswith(MAGIC[:-1]) or record is None:
+            raise ValueError(f"{path} no es una traza de PixelCatchr")
+        offset = len(MAGIC)
+        (length,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        header = json.loads(data[offset:offset + length])
+        body = zlib.decompress(data[offset + length:])
+        records = []
+        for t, *fields in record.iter_unpack(body):
+            records.append(Record(t / 1e6, *fields))
+        return cls(header["screens"], records)
+
+
+def screen_info(screen):
+    geo = screen.geometry()
+    return {
+        "x": geo.x(), "y": geo.y(), "width": geo.width(), "height": geo.height(),
+        "dpr": screen.devicePixelRatio(), "refresh": screen.refreshRate(),
+    }
+
+
+class TraceRecorder(QObject):
+    """Event filter on an overlay's windows that collects a ``Trace``.
+
+    Filtering never consumes an event, so recording does not change what
+    the overlay does; it costs one struct per event.
+    """
+
+    def __init__(self, overlay, path):
+        super().__init__()
+        self.path = path
+        self.surfaces = list(overlay.surfaces)
+        self.trace = Trace([screen_info(s.screen()) for s in self.surfaces])
+        self._t0 = time.perf_counter()
+        for surface in self.surfaces:
+            surface.installEventFilter(self)
+        overlay.toolbar.tool_selected.connect(lambda tool: self._add_pick(TOOL, TOOLS, tool))
+        overlay.toolbar.action_triggered.connect(lambda action: self._add_pick(ACTION, ACTIONS, action))
+
+    def _now(self):
+        return time.perf_counter() - self._t0
+
+    def _add_pick(self, kind, names, name):
+        if name in names:
+            self.trace.records.append(Record(self._now(), kind, data=names.index(name)))
+
+    def eventFilter(self, obj, event):
+        kind = MOUSE_KINDS.get(event.type())
+        if kind is not None:
+            pos = event.position()
+            self.trace.records.append(Record(
+                self._now(), kind, self.surfaces.index(obj), event.button().value,
+                event.buttons().value, event.modifiers().value, pos.x(), pos.y(),
+            ))
+        elif event.type() == QEvent.Type.Wheel:
+            pos = event.position()
+            self.trace.records.append(Record(
+                self._now(), WHEEL, self.surfaces.index(obj), 0, event.buttons().value,
+                event.modifiers().value, pos.x(), pos.y(), event.angleDelta().y(),
+            ))
+        elif event.type() in KEY_KINDS and not event.isAutoRepeat():
+            self.trace.records.append(Record(
+                self._now(), KEY_KINDS[event.type()], self.surfaces.index(obj), 0, 0,
+                event.modifiers().value, 0.0, 0.0, event.key(),
+            ))
+        return False
+
+    def save(self):
+        for surface in self.surfaces:
+            surface.removeEventFilter(self)
+        self.trace.save(self.path)
@@ -1,6 +1,13 @@
+import os
 import sys
+import threading
+import time
 import traceback
-from PyQt6.QtCore import Qt, pyqtSignal, QObject, QSettings
+
+# Reference point for the startup budget (see scripts/bench_startup.py)
+STARTUP_T0 = time.perf_counter()
+
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QSettings, QTimer
 from PyQt6.QtWidgets import QApplication, QMessageBox, QSystemTrayIcon
 
 # Set HighDPI policy BEFORE creating QApplication or importing other Qt modules if possible
@@ -29,10 +36,15 @@ def exception_hook(exctype, value, tb):
 
 sys.excepthook = exception_hook
 
+# Only what is needed to show the tray and arm the hotkeys is imported here.
+# The overlay (and the toolbar/icon font it pulls in), the settings window and
+# the capture scheduler are imported on first use or warmed up after the tray
+# is visible.
 try:
     from src.ui.tray import SystemTrayIcon
-    from src.ui.overlay import SnippingOverlay
     from src.core.hotkeys import GlobalHotkeyListener
+    from src.core import capture
+    from src.core.instance import InstanceServer, COMMANDS, AUTOMATION_COMMANDS
 except Exception as e:
     exception_hook(type(e), e, e.__traceback__)
 
@@ -41,21 +53,40 @@ class PixelCatchrApp(QObject):
     request_full_capture_signal = pyqtSignal()
     request_toggle_datetime_signal = pyqtSignal()
 
-    def __init__(self):
+    def __init__(self, initial_command=None):
         super().__init__()
         
         self.app = QApplication.instance() or QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
+
+        # Single instance: later launches forward their command here.
+        # The same socket serves the automation API (see _get_automation).
+        self.automation = None
+        self.instance_server = InstanceServer(self.handle_request)
+        self.is_primary = self.instance_server.listen(initial_command)
+        if not self.is_primary:
+            # Another instance won the race while we were starting up
+            return
         
         from src.utils import resource_path
         from PyQt6.QtGui import QIcon
         self.app.setWindowIcon(QIcon(resource_path("assets/icon.png")))
 
         self.overlay = None 
+        # Frame grabbed in the hotkey thread, picked up by the GUI thread
+        self.frame_slot = capture.FrameSlot()
+        # Captures requested while the overlay is already open (see _get_scheduler)
+        self.scheduler = None
+        self.timelapse = None
+        # Timelapse switched back on while the last run was still writing
+        self.timelapse_restart = False
+        # Scrolling capture or recording in progress; the capture hotkey stops it
+        self.region_job = None
         
         self.tray_icon = SystemTrayIcon(self.app)
         self.tray_icon.capture_triggered.connect(self.start_capture)
         self.tray_icon.full_capture_triggered.connect(self.start_full_capture)
+        self.tray_icon.timelapse_toggled.connect(self.toggle_timelapse)
         self.tray_icon.settings_changed.connect(self.reload_hotkeys)
         self.tray_icon.show()
 
@@ -69,48 +100,199 @@ class PixelCatchrApp(QObject):
         self.hotkey_listener.on_datetime_toggle = self.trigger_datetime_signal_from_thread
         self.hotkey_listener.start()
 
+        self.tray_ready_ms = (time.perf_counter() - STARTUP_T0) * 1000
+        self._startup_probe = bool(os.environ.get("PIXELCATCHR_STARTUP_PROBE"))
+        if self._startup_probe:
+            print(f"startup: tray_ready_ms={self.tray_ready_ms:.1f}", file=sys.stderr, flush=True)
+
+        if initial_command:
+            QTimer.singleShot(0, lambda: self.handle_command(initial_command))
+        QTimer.singleShot(0, self._warm_up)
+
+    def handle_request(self, request, conn):
+        """Reply to a JSON request from another process (see src.core.instance)."""
+        cmd = request.get("cmd")
+        if cmd in AUTOMATION_COMMANDS:
+            return self._get_automation().handle(request, conn)
+        if cmd not in COMMANDS:
+            return {"ok": False, "error": f"comando desconocido: {cmd}"}
+        # Run after replying so the caller is never kept waiting on the GUI
+        QTimer.singleShot(0, lambda: self.handle_command(cmd))
+        return {"ok": True}
+
+    def handle_command(self, cmd):
+        if cmd == "capture":
+            self.start_capture()
+        elif cmd == "full":
+            self.start_full_capture()
+        elif cmd == "settings":
+            self.tray_icon.show_settings()
+        elif cmd == "activate":
+            self.show_notification("PixelCatchr ya se está ejecutando")
+
+    def _warm_up(self, steps=None):
+        """Load what the first capture needs, one step per event-loop turn,
+        after the tray is already visible."""
+        if steps is None:
+            steps = [self.tray_icon.load_icons, self._import_overlay, self._get_scheduler]
+        step = steps.pop(0)
+        try:
+            step()
+        except Exception as e:
+            print(f"Error en precarga: {e}")
+
+        if steps:
+            QTimer.singleShot(0, lambda: self._warm_up(steps))
+        elif self._startup_probe:
+            warm_ms = (time.perf_counter() - STARTUP_T0) * 1000
+            print(f"startup: warm_ms={warm_ms:.1f}", file=sys.stderr, flush=True)
+            self.app.quit()
+
+    def _import_overlay(self):
+        from src.ui.overlay import SnippingOverlay
+        return SnippingOverlay
+
+    def _get_scheduler(self):
+        if self.scheduler is None:
+            from src.core.scheduler import CaptureScheduler
+            self.scheduler = CaptureScheduler()
+            self.scheduler.capture_finished.connect(self.show_notification)
+            self.scheduler.capture_dropped.connect(self.show_notification)
+        return self.scheduler
+
+    def _get_automation(self):
+        if self.automation is None:
+            from src.core.automation import AutomationService
+            self.automation = AutomationService()
+            self.instance_server.client_disconnected.connect(self.automation.release)
+        return self.automation
+
+    def _open_overlay(self, frame):
+        SnippingOverlay = self._import_overlay()
+        self.overlay = SnippingOverlay(frame)
+        self.overlay.on_close_signal.connect(self.finish_capture)
+        self.overlay.capture_finished.connect(self.show_notification)
+        self.overlay.scroll_capture_requested.connect(self.start_scroll_capture)
+        self.overlay.record_requested.connect(self.start_recording)
+
     def trigger_signal_from_thread(self):
-        self.request_capture_signal.emit()
+        self._grab_then_emit(self.request_capture_signal)
 
     def trigger_full_signal_from_thread(self):
-        self.request_full_capture_signal.emit()
+        self._grab_then_emit(self.request_full_capture_signal)
+
+    def _grab_then_emit(self, signal):
+        # QSettings instances must not be shared across threads
+        settings = QSettings("Webtechcrafter", "PixelCatchr")
+        if not settings.value("capture_when_stable", False, type=bool):
+            self._grab_from_thread()
+            signal.emit()
+            return
+        # Waiting can take seconds; the OS hook thread must not block that long
+        threading.Thread(
+            target=self._grab_stable_then_emit, args=(signal,), name="stable-grab", daemon=True
+        ).start()
+
+    def _grab_stable_then_emit(self, signal):
+        from src.core.stability import wait_from_settings
+        try:
+            frame, report = wait_from_settings(QSettings("Webtechcrafter", "PixelCatchr"))
+            print(report.summary())
+            self.frame_slot.put(frame)
+        except Exception as e:
+            print(f"Error al esperar a que la pantalla se estabilice: {e}")
+        signal.emit()
+
+    def _grab_from_thread(self):
+        """Freeze the screen at keypress time, before the Qt event loop runs.
+
+        Menus and tooltips open when the hotkey fired are still on screen here;
+        by the time the signal is dispatched and the overlay built they may be gone.
+        """
+        try:
+            self.frame_slot.put(capture.grab())
+        except Exception as e:
+            print(f"Error al capturar desde el hilo de atajos: {e}")
 
     def trigger_datetime_signal_from_thread(self):
         self.request_toggle_datetime_signal.emit()
 
     def reload_hotkeys(self):
         print("Recargando configuración de atajos...")
-        if self.hotkey_listener:
-            self.hotkey_listener.stop()
-        
-        self.hotkey_listener = GlobalHotkeyListener()
-        self.hotkey_listener.on_zone_capture = self.trigger_signal_from_thread
-        self.hotkey_listener.on_full_capture = self.trigger_full_signal_from_thread
-        self.hotkey_listener.on_datetime_toggle = self.trigger_datetime_signal_from_thread
-        self.hotkey_listener.start()
+        # Swap the dispatch table in place; the OS listener thread keeps running
+        self.hotkey_listener.reload()
 
     def start_capture(self):
+        frame = self.frame_slot.take()
+        if self.region_job and self.region_job.is_running():
+            self.region_job.stop()
+            return
         if self.overlay and self.overlay.isVisible():
+            self._get_scheduler().request(frame)
             return
 
         print(i18n.tr("capture_started"))
-        self.overlay = SnippingOverlay()
-        self.overlay.on_close_signal.connect(self.finish_capture)
-        self.overlay.capture_finished.connect(self.show_notification)
-        self.overlay.show_fullscreen()
+        self._open_overlay(frame)
 
     def start_full_capture(self):
+        frame = self.frame_slot.take()
         if self.overlay and self.overlay.isVisible():
+            self._get_scheduler().request(frame)
             return
             
         print(i18n.tr("capture_started"))
-        self.overlay = SnippingOverlay()
-        self.overlay.on_close_signal.connect(self.finish_capture)
-        self.overlay.capture_finished.connect(self.show_notification)
-        self.overlay.show_fullscreen()
+        self._open_overlay(frame)
         self.overlay.select_all()
         self.overlay.save_capture()
 
+    def start_scroll_capture(self, region):
+        from src.core.scrolling import ScrollCapture
+        self._start_region_job(ScrollCapture(region), "Desplace el contenido; pulse el atajo de captura para terminar")
+
+    def start_recording(self, region):
+        from src.core.recording import RegionRecorder
+        self._start_region_job(RegionRecorder(region), "Grabando; pulse el atajo de captura para terminar")
+
+    def _start_region_job(self, job, message):
+        self.region_job = job
+        job.finished.connect(self.show_notification)
+        self.show_notification(message)
+        # Give the overlay a moment to disappear from the screen
+        QTimer.singleShot(200, job.start)
+
+    def toggle_timelapse(self, enabled):
+        if self.timelapse is None:
+            from src.core.timelapse import TimelapseRecorder
+            self.timelapse = TimelapseRecorder()
+            self.timelapse.stopped.connect(self._on_timelapse_stopped)
+            self.timelapse.finished.connect(self._on_timelapse_finished)
+
+        if not enabled:
+            self.timelapse_restart = False
+            self.timelapse.stop()
+        elif self.timelapse.is_stopping():
+            # Started once the last run has written its pending frames
+            self.timelapse_restart = True
+            self.show_notification("El timelapse empezará en cuanto termine de guardarse el anterior")
+        elif not self.timelapse.is_running():
+            self._start_timelapse()
+
+    def _start_timelapse(self):
+        self.timelapse.start()
+        self.show_notification(f"Timelapse iniciado en: {self.timelapse.folder}")
+
+    def _on_timelapse_finished(self):
+        if self.timelapse_restart:
+            self.timelapse_restart = False
+            self._start_timelapse()
+
+    def _on_timelapse_stopped(self, message):
+        # The recorder may stop on its own (disk budget); keep the menu in sync
+        self.tray_icon.timelapse_action.blockSignals(True)
+        self.tray_icon.timelapse_action.setChecked(False)
+        self.tray_icon.timelapse_action.blockSignals(False)
+        self.show_notification(message)
+
     def finish_capture(self):
         print(i18n.tr("capture_finished"))
         self.overlay = None
@@ -140,6 +322,8 @@ class PixelCatchrApp(QObject):
             )
 
     def run(self):
+            if not self.is_primary:
+                sys.exit(0)
             try:
                 sys.exit(self.app.exec())
             except KeyboardInterrupt:
@@ -0,0 +1,198 @@
+import json
+import os
+from importlib import metadata
+
+from PyQt6.QtCore import Qt, QRect, QSize, QStandardPaths, QTimer
+from PyQt6.QtGui import QColor, QGuiApplication, QIcon, QImage, QPainter, QPixmap
+
+# 2: atlases no longer hold the user's picked colors
+ATLAS_VERSION = 2
+ATLAS_MAX_WIDTH = 1024
+
+
+def _default_cache_dir():
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+    return os.path.join(base or os.path.expanduser("~"), "PixelCatchr", "icons")
+
+
+def _qtawesome_version():
+    try:
+        return metadata.version("QtAwesome")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class IconCache:
+    """Rasterized qtawesome icons, cached in memory and on disk.
+
+    Each (name, color, size, device pixel ratio) is rendered once. Rendered
+    pixmaps are packed into a PNG atlas (``atlas.png`` + ``atlas.json``) in
+    the cache directory, so later launches slice the atlas instead of
+    loading the icon font at all. The atlas is invalidated when the
+    qtawesome version changes.
+
+    Icons in colors that come from the user (``persist=False``, e.g. the
+    toolbar's color button) are never written to the atlas, which would
+    otherwise grow with every color picked; only the last
+    ``MAX_TRANSIENT`` of them are kept in memory.
+    """
+
+    SAVE_DELAY_MS = 2000
+    MAX_TRANSIENT = 16
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._pixmaps = {}
+        self._transient = {}
+        self._icons = {}
+        self._atlas_loaded = False
+        self._save_pending = False
+        self.hits = 0
+        self.misses = 0
+
+    # ---------------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------------
+    def pixmap(self, name, color=None, size=16, dpr=None, persist=True) -> QPixmap:
+        """Return the icon as a pixmap of *size* logical pixels at *dpr*.
+        With *persist* false it is not added to the atlas."""
+        if dpr is None:
+            dpr = self._screen_dprs()[-1]
+        if not self._atlas_loaded:
+            self._load_atlas()
+
+        key = self._key(name, color, size, dpr)
+        pm = self._pixmaps.get(key)
+        if pm is None and not persist:
+            pm = self._transient.pop(key, None)
+            if pm is not None:
+                # Most recently used last
+                self._transient[key] = pm
+        if pm is not None:
+            self.hits += 1
+            return pm
+
+        self.misses += 1
+        pm = self._render(name, color, size, dpr)
+        if persist:
+            self._pixmaps[key] = pm
+            self._schedule_save()
+        else:
+            self._transient[key] = pm
+            if len(self._transient) > self.MAX_TRANSIENT:
+                del self._transient[next(iter(self._transient))]
+        return pm
+
+    def icon(self, name, color=None, size=16, persist=True) -> QIcon:
+        """Return a QIcon holding one pixmap per distinct screen DPR."""
+        dprs = self._screen_dprs()
+        key = (name, self._color_key(color), size, tuple(dprs))
+        qicon = self._icons.get(key)
+        if qicon is None:
+            qicon = QIcon()
+            for dpr in dprs:
+                qicon.addPixmap(self.pixmap(name, color, size, dpr, persist))
+            if persist:
+                self._icons[key] = qicon
+        return qicon
+
+    def save(self):
+        """Write every rendered pixmap to the atlas (blocking)."""
+        self._save_pending = False
+        if not self._pixmaps:
+            return
+
+        # Simple shelf packing, rows of at most ATLAS_MAX_WIDTH pixels
+        entries = {}
+        x = y = row_h = width = 0
+        for key, pm in sorted(self._pixmaps.items()):
+            w, h = pm.width(), pm.height()
+            if x and x + w > ATLAS_MAX_WIDTH:
+                x, y, row_h = 0, y + row_h, 0
+            entries[key] = [x, y, w, h, pm.devicePixelRatio()]
+            x += w
+            row_h = max(row_h, h)
+            width = max(width, x)
+
+        atlas = QImage(width, y + row_h, QImage.Format.Format_ARGB32_Premultiplied)
+        atlas.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(atlas)
+        for key, (ex, ey, _, _, _) in entries.items():
+            img = self._pixmaps[key].toImage()
+            # Draw device pixels 1:1
+            img.setDevicePixelRatio(1)
+            painter.drawImage(ex, ey, img)
+        painter.end()
+
+        folder = self._cache_dir()
+        try:
+            os.makedirs(folder, exist_ok=True)
+            if not atlas.save(os.path.join(folder, "atlas.png"), "PNG"):
+                raise OSError("no se pudo escribir atlas.png")
+            index = {
+                "version": ATLAS_VERSION,
+                "qtawesome": _qtawesome_version(),
+                "entries": entries,
+            }
+            with open(os.path.join(folder, "atlas.json"), "w", encoding="utf-8") as f:
+                json.dump(index, f)
+        except Exception as e:
+            print(f"Error al guardar caché de iconos: {e}")
+
+    # ---------------------------------------------------------------------
+    # Helpers
+    # ---------------------------------------------------------------------
+    def _cache_dir(self):
+        if self.cache_dir is None:
+            self.cache_dir = _default_cache_dir()
+        return self.cache_dir
+
+    @staticmethod
+    def _color_key(color):
+        # None means qtawesome's own default color
+        return QColor(color).name(QColor.NameFormat.HexArgb) if color is not None else "default"
+
+    def _key(self, name, color, size, dpr):
+        return f"{name}|{self._color_key(color)}|{size}|{dpr:g}"
+
+    @staticmethod
+    def _screen_dprs():
+        dprs = sorted({screen.devicePixelRatio() for screen in QGuiApplication.screens()})
+        return dprs or [1.0]
+
+    def _render(self, name, color, size, dpr):
+        # Only reached on a cache miss: this is what loads the icon font
+        import qtawesome as qta
+        options = {"color": color} if color is not None else {}
+        pm = qta.icon(name, **options).pixmap(QSize(size, size), dpr)
+        pm.setDevicePixelRatio(dpr)
+        return pm
+
+    def _load_atlas(self):
+        self._atlas_loaded = True
+        folder = self._cache_dir()
+        try:
+            with open(os.path.join(folder, "atlas.json"), "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        if index.get("version") != ATLAS_VERSION or index.get("qtawesome") != _qtawesome_version():
+            return
+
+        atlas = QPixmap(os.path.join(folder, "atlas.png"))
+        if atlas.isNull():
+            return
+        for key, (x, y, w, h, dpr) in index.get("entries", {}).items():
+            pm = atlas.copy(QRect(x, y, w, h))
+            pm.setDevicePixelRatio(dpr)
+            self._pixmaps.setdefault(key, pm)
+
+    def _schedule_save(self):
+        if self._save_pending:
+            return
+        self._save_pending = True
+        QTimer.singleShot(self.SAVE_DELAY_MS, self.save)
+
+
+# Global instance
+icons = IconCache()
@@ -1,63 +1,245 @@
-import sys
 import os
 import math
-import mss
-import mss.tools
-import qtawesome as qta
+import time
+import collections
 
+import numpy as np
 
 from PyQt6.QtWidgets import (
     QApplication,
     QWidget,
-    QRubberBand,
     QFileDialog,
     QInputDialog,
 )
 from PyQt6.QtGui import QFontMetrics, QKeySequence
 from PyQt6.QtCore import (
     Qt,
+    QObject,
     QRect,
     QPoint,
     QPointF,
     QLineF,
     pyqtSignal,
     QRectF,
-    QRectF,
     QSize,
-    QDateTime,
+    QSizeF,
     QSettings,
+    QTimer,
 )
 from PyQt6.QtGui import QPainter, QColor, QPen, QImage, QPainterPath, QPolygonF, QCursor, QPixmap
 
 from src.ui.toolbar import OverlayToolbar
+from src.core import capture
 from src.core.i18n import i18n
-
-
-class SnippingOverlay(QWidget):
-    """Overlay window for full‑screen screenshot and annotation.
-
-    Supports pen, rectangle, arrow and **editable text** annotations.
+from src.core.pyramid import ImagePyramid
+from src.core.snapping import SnapDetector
+from src.core import annotations as ann
+from src.core.annotations import AnnotationIndex, draw_annotation
+from src.core import history, strokes
+from src.core.pacing import FramePacer, FrameStats
+from src.core.trace import TraceRecorder
+from src.core.export import draw_timestamp, default_filename, save_image
+from src.core.screens import native_geometry, native_rect
+
+
+def image_array(image: QImage):
+    """A QImage's pixels as a (height, width) uint32 0xAARRGGBB array."""
+    image = image.convertToFormat(QImage.Format.Format_RGB32)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    rows = np.frombuffer(ptr, dtype=np.uint32).reshape(image.height(), image.bytesPerLine() // 4)
+    return rows[:, :image.width()].copy()
+
+
+def pixel_readout(cells, pixel, mask):
+    """Pixel inspector text: *pixel*'s color and the min/max/mean luma of
+    the *mask*ed *cells* (Rec. 601, 0-255)."""
+    r, g, b = (int(pixel) >> 16) & 0xFF, (int(pixel) >> 8) & 0xFF, int(pixel) & 0xFF
+    lines = [f"#{r:02X}{g:02X}{b:02X}", f"RGB {r}, {g}, {b}"]
+    values = cells[mask]
+    if values.size:
+        channels = [((values >> shift) & 0xFF).astype(np.float32) for shift in (16, 8, 0)]
+        luma = 0.299 * channels[0] + 0.587 * channels[1] + 0.114 * channels[2]
+        lines.append(f"Luma mín {luma.min():.0f} · máx {luma.max():.0f} · media {luma.mean():.1f}")
+    return lines
+
+
+class ScreenSurface(QWidget):
+    """Full-screen window over a single monitor.
+
+    Holds that monitor's pixels at its own device pixel ratio and hands
+    painting and input to the ``SnippingOverlay``, translated to overlay
+    coordinates (logical pixels from the virtual desktop's top-left).
+
+    Each window can zoom (mouse wheel, about the cursor) and pan (middle
+    button drag) on its own. Zoomed in, it magnifies part of its monitor
+    with nearest-neighbour pixels for picking exact edges; zoomed out, it
+    also shows the neighbouring monitors, drawn from their ``ImagePyramid``.
+    The "0" key goes back to 1:1.
     """
 
-    capture_finished = pyqtSignal(str)
-    on_close_signal = pyqtSignal()
+    ZOOM_STEPS = (0.125, 0.25, 0.5, 1, 2, 4, 8, 16, 32)
 
-    def __init__(self):
+    def __init__(self, overlay, screen, pixmap, area):
         super().__init__()
-        # --- Settings ---
-        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
-
-        # --- Window configuration ---
+        self.overlay = overlay
+        self.pixmap = pixmap
+        # This monitor's rectangle in overlay coordinates, and in physical
+        # desktop pixels (where ``pixmap`` sits)
+        self.area = area
+        self.native = QRect(screen.geometry().topLeft(), pixmap.size())
+        self.pyramid = None
+        self.snap = None
+        # View: the overlay point shown at this window's top-left, and scale
+        self.zoom = 1
+        self.view_origin = QPointF(area.topLeft())
+        self._pan_from = None
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint
             | Qt.WindowType.WindowStaysOnTopHint
             | Qt.WindowType.Tool
+            | Qt.WindowType.X11BypassWindowManagerHint # Helpful on some systems
         )
         # We want to receive mouse events over the whole screen.
         self.setMouseTracking(True)
+        self.setScreen(screen)
+        self.setGeometry(screen.geometry())
+
+    # "Screen" points below are this monitor's unzoomed overlay
+    # coordinates (``area``), where the view is drawn
+    def scene_rect(self) -> QRectF:
+        """The part of the overlay this window shows."""
+        return QRectF(self.view_origin, QSizeF(self.area.size()) / self.zoom)
+
+    def to_scene(self, point: QPointF) -> QPointF:
+        return self.view_origin + (QPointF(point) - QPointF(self.area.topLeft())) / self.zoom
+
+    def from_scene(self, point) -> QPointF:
+        return QPointF(self.area.topLeft()) + (QPointF(point) - self.view_origin) * self.zoom
+
+    def from_scene_rect(self, rect) -> QRect:
+        rect = QRectF(rect)
+        return QRectF(self.from_scene(rect.topLeft()), rect.size() * self.zoom).toRect()
+
+    def set_zoom(self, zoom, anchor: QPointF = None):
+        """Zoom keeping the overlay point under the screen point *anchor*
+        (default: the middle of the monitor) where it is."""
+        anchor = QPointF(anchor) if anchor is not None else QPointF(self.area.center())
+        fixed = self.to_scene(anchor)
+        self.zoom = zoom
+        if zoom == 1:
+            self.view_origin = QPointF(self.area.topLeft())
+        else:
+            self._set_origin(fixed - (anchor - QPointF(self.area.topLeft())) / zoom)
+        self.overlay.view_changed(self)
+
+    def _set_origin(self, origin: QPointF):
+        # Keep the middle of the view on the virtual desktop
+        bounds = QRectF(self.overlay.rect())
+        half = QPointF(self.area.width(), self.area.height()) / (2 * self.zoom)
+        center = origin + half
+        center = QPointF(
+            min(max(center.x(), bounds.left()), bounds.right()),
+            min(max(center.y(), bounds.top()), bounds.bottom()),
+        )
+        # Whole device pixels per step, so magnified pixels stay the same size
+        step = self.zoom * self.pixmap.devicePixelRatio()
+        origin = center - half
+        self.view_origin = QPointF(round(origin.x() * step) / step, round(origin.y() * step) / step)
+
+    def _pos(self, event):
+        self.overlay.cursor_surface = self
+        if self.zoom == 1:
+            return event.position().toPoint() + self.area.topLeft()
+        # Zoomed in, every device pixel of a magnified pixel picks that pixel
+        p = self.to_scene(event.position() + QPointF(self.area.topLeft()))
+        return QPoint(math.floor(p.x()), math.floor(p.y()))
+
+    def paintEvent(self, event):
+        t0 = time.perf_counter()
+        painter = QPainter(self)
+        painter.scale(self.zoom, self.zoom)
+        painter.translate(-self.view_origin)
+        # The repainted part, as overlay coordinates
+        dirty = QRectF(event.rect().translated(self.area.topLeft()))
+        self.overlay.paint(painter, self, QRectF(self.to_scene(dirty.topLeft()), dirty.size() / self.zoom))
+        painter.end()
+        self.overlay.frame_stats.add((time.perf_counter() - t0) * 1000)
+
+    def wheelEvent(self, event):
+        delta = event.angleDelta().y()
+        i = self.ZOOM_STEPS.index(self.zoom) + (1 if delta > 0 else -1)
+        if delta and 0 <= i < len(self.ZOOM_STEPS):
+            self.set_zoom(self.ZOOM_STEPS[i], event.position() + QPointF(self.area.topLeft()))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.MiddleButton:
+            if self.zoom != 1:
+                self._pan_from = event.position()
+            return
+        # Moves waiting for the next frame happened before this press
+        self.overlay.pacer.flush()
+        self.overlay.mouse_press(event, self._pos(event))
+
+    def mouseDoubleClickEvent(self, event):
+        self.overlay.pacer.flush()
+        self.overlay.mouse_double_click(event, self._pos(event))
+
+    def mouseMoveEvent(self, event):
+        if self._pan_from is not None:
+            self._set_origin(self.view_origin - (event.position() - self._pan_from) / self.zoom)
+            self._pan_from = event.position()
+            self.overlay.view_changed(self)
+            return
+        self.overlay.queue_move(self._pos(event))
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.MouseButton.MiddleButton:
+            self._pan_from = None
+            return
+        self.overlay.pacer.flush()
+        self.overlay.mouse_release(event, self._pos(event))
+
+    def keyPressEvent(self, event):
+        self.overlay.keyPressEvent(event)
+
+
+class SnippingOverlay(QObject):
+    """Overlay for full‑screen screenshot and annotation.
+
+    One ``ScreenSurface`` window covers each monitor; this object keeps the
+    state they share (selection, annotations, tools), so a selection can
+    span monitors while each repaint only touches the monitors it affects.
+
+    Supports pen, rectangle, arrow and **editable text** annotations.
+    """
+
+    capture_finished = pyqtSignal(str)
+    on_close_signal = pyqtSignal()
+    scroll_capture_requested = pyqtSignal(dict)
+    record_requested = pyqtSignal(dict)
+
+    # Window pixels around the selection that also need repainting when it
+    # changes (resize handles), and around its top-left corner (dimensions
+    # label)
+    DIRTY_MARGIN = 60
+    LABEL_REACH = 200
+    MAGNIFIER_ZOOM = 5
+    MAGNIFIER_SIZE = 120
+    # Magnified tiles kept for cursor positions seen recently
+    MAGNIFIER_CACHE = 64
+    # Debug HUD (F3), in window coordinates, below the cursor coordinates
+    HUD_RECT = QRect(12, 40, 360, 52)
+
+    def __init__(self, frame=None):
+        super().__init__()
+        # --- Settings ---
+        self.settings = QSettings("Webtechcrafter", "PixelCatchr")
 
         # --- Initial screenshot ---
-        self.screenshot = self._capture_full_screen()
+        # ``frame`` is a src.core.capture.Frame grabbed earlier (e.g. in the
+        # hotkey thread at keypress time); otherwise grab now.
+        self.surfaces = self._create_surfaces(frame)
 
         # --- State variables ---
         self.begin = QPoint()
@@ -69,11 +251,43 @@ class SnippingOverlay(QWidget):
         # --- Drawing state ---
         self.current_tool = "none"
         self.current_color = QColor(Qt.GlobalColor.red)
-        self.annotations = []  # list of dicts: {'type': ..., 'data': ..., 'pos': QPoint, 'color': QColor}
+        self.annotations = []  # src.core.annotations objects, bottom to top
+        # Kept in step with ``annotations`` (see _add_annotation and friends)
+        self.annotation_index = AnnotationIndex(self.font())
         self.current_drawing_item = None
+        self.drawing_origin = None
+        self.stroke_builder = None
+        # Annotation picked with the "move" tool, and whether it is being dragged
+        self.selected_annotation = None
+        self.dragging_annotation = False
+        self.annotation_drag_origin = QPoint()
+        # Every change to ``annotations`` made by the user goes through here
+        self.history = history.History(
+            self, self.settings.value("undo_memory_mb", history.History.DEFAULT_LIMIT_MB, type=int) * 1024 * 1024
+        )
         
         # --- Cursor tracking ---
         self.cursor_pos = QPoint(0, 0)
+        # Window the mouse was last over (crosshair, magnifier, view)
+        self.cursor_surface = self.surfaces[0] if self.surfaces else None
+        # Detected element under the cursor, clicked to select it
+        self.snap_rect = QRect()
+        self._magnifier_tiles = collections.OrderedDict()
+        self._magnifier_grids = {}
+
+        # --- Frame pacing ---
+        # Pointer moves are handled once per display refresh (latest
+        # position wins); pen points are still all recorded as they come
+        refresh = max((s.screen().refreshRate() for s in self.surfaces), default=60.0)
+        self.pacer = FramePacer(refresh or 60.0)
+        self.pacer.frame.connect(self._on_frame)
+        self.pending_move = None
+        # Paint times, shown with the debug HUD (F3)
+        self.frame_stats = FrameStats()
+        self.show_hud = False
+        self._hud_timer = QTimer(self)
+        self._hud_timer.setInterval(250)
+        self._hud_timer.timeout.connect(self._update_hud)
 
         # --- Resizing/Moving State ---
         self.resize_handle_size = 16
@@ -84,7 +298,7 @@ class SnippingOverlay(QWidget):
 
 
         # --- Toolbar ---
-        self.toolbar = OverlayToolbar(self)
+        self.toolbar = OverlayToolbar(self.surfaces[0] if self.surfaces else None)
         self.toolbar.hide()
         self.toolbar_moved_manually = False
         self.toolbar.tool_selected.connect(self.set_tool)
@@ -92,84 +306,265 @@ class SnippingOverlay(QWidget):
         self.toolbar.action_triggered.connect(self.handle_action)
         self.toolbar.manually_moved.connect(self._on_toolbar_manually_moved)
 
+        # Input trace for scripts/replay_trace.py, written on close
+        trace_path = os.environ.get("PIXELCATCHR_TRACE")
+        self.trace_recorder = TraceRecorder(self, trace_path) if trace_path else None
+
         self.show_fullscreen()
+        # Only needed to zoom out and snap, so done once the overlay is up
+        QTimer.singleShot(0, self._analyze_screens)
 
     # ---------------------------------------------------------------------
     # Helper methods
     # ---------------------------------------------------------------------
-    def _capture_full_screen(self):
+    def _create_surfaces(self, frame=None):
         screens = QApplication.screens()
         if not screens:
-            return QPixmap()
-            
-        virtual_geometry = screens[0].geometry()
+            self.virtual_geometry = QRect()
+            return []
+
+        self.virtual_geometry = screens[0].geometry()
         for screen in screens[1:]:
-            virtual_geometry = virtual_geometry.united(screen.geometry())
-            
-        # 2. Create master pixmap covering the whole virtual desktop
-        full_pixmap = QPixmap(virtual_geometry.size())
-        full_pixmap.fill(Qt.GlobalColor.black)
-        
-        painter = QPainter(full_pixmap)
-        
-        # 3. Stitch each screen's capture
+            self.virtual_geometry = self.virtual_geometry.united(screen.geometry())
+        origin = self.virtual_geometry.topLeft()
+
+        image = monitors = None
+        if frame is not None:
+            image = frame.to_qimage()
+            try:
+                monitors = capture.monitors()[1:]
+            except Exception:
+                monitors = ()
+        surfaces = []
         for screen in screens:
-            grab = screen.grabWindow(0)
-            # specific screen geometry
-            geo = screen.geometry()
-            # Draw at position relative to virtual desktop top-left
-            painter.drawPixmap(geo.x() - virtual_geometry.x(), geo.y() - virtual_geometry.y(), grab)
-
-        # 4. Draw cursor if enabled in settings
+            pixmap = self._screen_pixmap(screen, image, frame, monitors)
+            area = screen.geometry().translated(-origin)
+            surfaces.append(ScreenSurface(self, screen, pixmap, area))
+        return surfaces
+
+    def _screen_pixmap(self, screen, image=None, frame=None, monitors=()):
+        """This screen's pixels at its device pixel ratio, cut from *frame*
+        when it covers the screen, otherwise grabbed now."""
+        geo = screen.geometry()
+        dpr = screen.devicePixelRatio()
+        pixmap = None
+        if image is not None:
+            # mss works in physical pixels (see src.core.screens)
+            src = native_geometry(screen, monitors).translated(-frame.left, -frame.top)
+            if image.rect().contains(src):
+                pixmap = QPixmap.fromImage(image.copy(src))
+        if pixmap is None:
+            pixmap = screen.grabWindow(0)
+        pixmap.setDevicePixelRatio(dpr)
+
+        # Draw cursor if enabled in settings
         if self.settings.value("capture_cursor", False, type=bool):
             cursor_pos = QCursor.pos()
-            # Adjust global cursor pos to local coordinates (relative to virtual_geometry)
-            local_pos = QPointF(cursor_pos - virtual_geometry.topLeft())
-            
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            
-            pointer_polygon = QPolygonF([
-                QPointF(0, 0),
-                QPointF(0, 17),
-                QPointF(5, 12),
-                QPointF(9, 19), 
-                QPointF(11, 18), 
-                QPointF(7, 11),
-                QPointF(12, 11)
-            ])
-            
-            pointer_polygon.translate(local_pos)
-            
-            painter.setPen(QPen(Qt.GlobalColor.black, 1))
-            painter.setBrush(Qt.GlobalColor.white)
-            painter.drawPolygon(pointer_polygon)
+            if geo.contains(cursor_pos):
+                self._draw_cursor(pixmap, QPointF(cursor_pos - geo.topLeft()))
+        return pixmap
+
+    def _analyze_screens(self):
+        snap = self.settings.value("snap_to_elements", True, type=bool)
+        for surface in self.surfaces:
+            image = surface.pixmap.toImage()
+            if surface.pyramid is None:
+                surface.pyramid = ImagePyramid(image)
+                surface.pyramid.start()
+            if snap and surface.snap is None:
+                surface.snap = SnapDetector(image_array(image))
+                surface.snap.ready.connect(self._on_snap_ready)
+                surface.snap.start()
+
+    def _on_snap_ready(self):
+        if not self.selection_done and not self.is_selecting:
+            self._update_snap(self.cursor_pos)
+
+    def _snap_at(self, pos: QPoint) -> QRect:
+        """The smallest detected element containing *pos*, in overlay coordinates."""
+        surface = self._surface_at(pos)
+        if surface is None or surface.snap is None or surface.snap.index is None:
+            return QRect()
+        dpr = surface.pixmap.devicePixelRatio()
+        local = pos - surface.area.topLeft()
+        found = surface.snap.index.smallest_at(math.floor(local.x() * dpr), math.floor(local.y() * dpr))
+        if found is None:
+            return QRect()
+        x, y, w, h = found
+        return QRectF(x / dpr, y / dpr, w / dpr, h / dpr).toRect().translated(surface.area.topLeft())
+
+    def _update_snap(self, pos: QPoint):
+        snap = self._snap_at(pos) if self.current_tool == "none" else QRect()
+        if snap != self.snap_rect:
+            old, self.snap_rect = self.snap_rect, snap
+            self._update_selection(old, snap)
+
+    def _draw_cursor(self, pixmap, local_pos):
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
+        pointer_polygon = QPolygonF([
+            QPointF(0, 0),
+            QPointF(0, 17),
+            QPointF(5, 12),
+            QPointF(9, 19), 
+            QPointF(11, 18), 
+            QPointF(7, 11),
+            QPointF(12, 11)
+        ])
+
+        pointer_polygon.translate(local_pos)
+
+        painter.setPen(QPen(Qt.GlobalColor.black, 1))
+        painter.setBrush(Qt.GlobalColor.white)
+        painter.drawPolygon(pointer_polygon)
         painter.end()
-        return full_pixmap
+
+    def _native_parts(self, rect: QRect):
+        """``(surface, physical rect)`` for each monitor *rect* (overlay
+        coordinates) touches, the physical rects in desktop pixels."""
+        parts = []
+        for surface in self.surfaces:
+            part = surface.area.intersected(rect)
+            if not part.isEmpty():
+                native = native_rect(surface.screen(), part.translated(self.virtual_geometry.topLeft()))
+                # Rounded logical sizes can overshoot the monitor by a pixel
+                parts.append((surface, native.intersected(surface.native)))
+        return parts
+
+    def _grab_rect(self, rect: QRect) -> QPixmap:
+        """Pixels under *rect* (overlay coordinates).
+
+        Within one monitor this is a straight copy of its native pixels.
+        A rectangle spanning monitors with different device pixel ratios is
+        composed at the highest one, scaling only the lower-DPI parts.
+        """
+        parts = self._native_parts(rect)
+        if len(parts) == 1:
+            surface, native = parts[0]
+            out = surface.pixmap.copy(native.translated(-surface.native.topLeft()))
+            out.setDevicePixelRatio(surface.pixmap.devicePixelRatio())
+            return out
+
+        dpr = max((s.pixmap.devicePixelRatio() for s, _ in parts), default=1.0)
+        out = QPixmap((QSizeF(rect.size()) * dpr).toSize())
+        out.setDevicePixelRatio(dpr)
+        out.fill(Qt.GlobalColor.black)
+        painter = QPainter(out)
+        for surface, native in parts:
+            part = surface.area.intersected(rect)
+            painter.drawPixmap(
+                QRectF(part.translated(-rect.topLeft())),
+                surface.pixmap,
+                QRectF(native.translated(-surface.native.topLeft())),
+            )
+        painter.end()
+        return out
+
+    def _blur_rect(self, rect: QRect) -> QPixmap:
+        """The pixels under *rect*, scaled down heavily and back up."""
+        original_chunk = self._grab_rect(rect)
+        small_w = max(1, original_chunk.width() // 10)
+        small_h = max(1, original_chunk.height() // 10)
+
+        small = original_chunk.scaled(small_w, small_h, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        blurred = small.scaled(original_chunk.width(), original_chunk.height(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        blurred.setDevicePixelRatio(original_chunk.devicePixelRatio())
+        return blurred
 
     def show_fullscreen(self):
-        # Use full geometry of all screens to cover everything (including taskbars)
-        screens = QApplication.screens()
-        if not screens:
-            return
-            
-        virtual_geometry = screens[0].geometry()
-        for screen in screens[1:]:
-            virtual_geometry = virtual_geometry.united(screen.geometry())
-            
-        self.setGeometry(virtual_geometry)
-        
-        # Ensure it actually covers everything on Windows multi-monitor
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint
-            | Qt.WindowType.WindowStaysOnTopHint
-            | Qt.WindowType.Tool
-            | Qt.WindowType.X11BypassWindowManagerHint # Helpful on some systems
-        )
-        
-        self.show()
-        self.activateWindow()
-        self.raise_()
+        for surface in self.surfaces:
+            surface.show()
+            surface.raise_()
+        surface = self._surface_at(self.mapFromGlobal(QCursor.pos())) or (self.surfaces[0] if self.surfaces else None)
+        if surface:
+            surface.activateWindow()
+
+    # ---------------------------------------------------------------------
+    # What the rest of the class used to get from QWidget, over all surfaces
+    # ---------------------------------------------------------------------
+    def _surface_at(self, pos: QPoint):
+        for surface in self.surfaces:
+            if surface.area.contains(pos):
+                return surface
+        return None
+
+    def _dialog_parent(self):
+        return self._surface_at(self.cursor_pos) or (self.surfaces[0] if self.surfaces else None)
+
+    def isVisible(self):
+        return any(s.isVisible() for s in self.surfaces)
+
+    def update(self, rect: QRect = None, margin=2):
+        """Repaint the part of each window that shows *rect*, or all of them.
+
+        *margin* is in window pixels, whatever the zoom: the default covers
+        rounding and antialiasing, larger ones UI drawn at screen size
+        around *rect*.
+        """
+        for surface in self.surfaces:
+            if rect is None:
+                surface.update()
+                continue
+            shown = surface.from_scene_rect(rect).translated(-surface.area.topLeft())
+            shown = shown.adjusted(-margin, -margin, margin, margin)
+            if shown.intersects(surface.rect()):
+                surface.update(shown)
+
+    def _update_at(self, pos: QPoint):
+        """Repaint what follows the cursor at *pos*. The crosshair crosses
+        the whole window, so that is the whole window showing *pos*."""
+        for surface in self.surfaces:
+            if surface.scene_rect().intersects(QRectF(QRect(pos, QSize(1, 1)))):
+                surface.update()
+
+    def view_changed(self, surface):
+        surface.update()
+        if self.selection_done and self.toolbar.isVisible():
+            self._show_toolbar()
+
+    def _update_selection(self, old: QRect, new: QRect):
+        for rect in (old.normalized(), new.normalized()):
+            self.update(rect, self.DIRTY_MARGIN)
+            # The dimensions label starts at the top-left corner and can be
+            # wider than the selection
+            self.update(QRect(rect.topLeft(), QSize(1, 1)), self.LABEL_REACH)
+
+    def close(self):
+        if self.trace_recorder is not None:
+            recorder, self.trace_recorder = self.trace_recorder, None
+            try:
+                recorder.save()
+            except OSError as e:
+                print(f"Error guardando la traza: {e}")
+        self.toolbar.hide()
+        for surface in self.surfaces:
+            surface.close()
+
+    def setCursor(self, cursor):
+        for surface in self.surfaces:
+            surface.setCursor(cursor)
+
+    def font(self):
+        return QApplication.font()
+
+    def rect(self):
+        return QRect(QPoint(0, 0), self.virtual_geometry.size())
+
+    def width(self):
+        return self.virtual_geometry.width()
+
+    def height(self):
+        return self.virtual_geometry.height()
+
+    def mapToGlobal(self, pos: QPoint) -> QPoint:
+        return pos + self.virtual_geometry.topLeft()
+
+    def mapFromGlobal(self, pos: QPoint) -> QPoint:
+        return pos - self.virtual_geometry.topLeft()
+
+    def screen(self):
+        return QApplication.primaryScreen()
 
     def select_all(self):
         """Selects the entire screen area automatically."""
@@ -179,13 +574,27 @@ class SnippingOverlay(QWidget):
         self.update()
         self._show_toolbar()
 
+    def selection_region(self) -> dict:
+        """The selection in physical desktop pixels, as ``capture.grab`` expects."""
+        native = QRect()
+        for _, part in self._native_parts(self.selection_rect.normalized()):
+            native = native.united(part)
+        return {
+            "left": native.left(),
+            "top": native.top(),
+            "width": max(1, native.width()),
+            "height": max(1, native.height()),
+        }
+
     def _hit_test_handle(self, pos: QPoint):
         if not self.selection_done:
             return None
         
         r = self.selection_rect
-        hs = self.resize_handle_size
-        hw = hs // 2  # half width
+        # Handles keep their on-screen size whatever the zoom
+        zoom = self.cursor_surface.zoom if self.cursor_surface else 1
+        hs = self.resize_handle_size / zoom
+        hw = hs / 2  # half width
         
         # Handle centers
         handles = {
@@ -200,8 +609,8 @@ class SnippingOverlay(QWidget):
         }
         
         for name, p in handles.items():
-            rect = QRect(p.x() - hw, p.y() - hw, hs, hs)
-            if rect.contains(pos):
+            rect = QRectF(p.x() - hw, p.y() - hw, hs, hs)
+            if rect.contains(QPointF(pos)):
                 return name
                 
         if r.contains(pos):
@@ -231,7 +640,12 @@ class SnippingOverlay(QWidget):
     # Toolbar callbacks
     # ---------------------------------------------------------------------
     def set_tool(self, tool_id):
+        if self.selection_done and (tool_id == "none") != (self.current_tool == "none"):
+            # Resize handles are only shown without a tool
+            self._update_selection(self.selection_rect, self.selection_rect)
         self.current_tool = tool_id
+        if self.selected_annotation is not None:
+            self._select_annotation(None)
         self.setCursor(
             Qt.CursorShape.ArrowCursor if tool_id == "none" else Qt.CursorShape.CrossCursor
         )
@@ -247,25 +661,42 @@ class SnippingOverlay(QWidget):
             self.save_capture()
         elif action_id == "copy":
             self.copy_to_clipboard()
+        elif action_id in ("scroll", "record"):
+            # The overlay has to go away so the live content can be captured
+            region = self.selection_region()
+            self.close()
+            self.on_close_signal.emit()
+            if action_id == "scroll":
+                self.scroll_capture_requested.emit(region)
+            else:
+                self.record_requested.emit(region)
         elif action_id == "undo":
-            if self.annotations:
-                self.annotations.pop()
-                self.update()
+            self.history.undo()
+        elif action_id == "redo":
+            self.history.redo()
 
     # ---------------------------------------------------------------------
     # Paint
     # ---------------------------------------------------------------------
-    def paintEvent(self, event):
-        painter = QPainter(self)
+    def paint(self, painter: QPainter, surface: ScreenSurface, dirty: QRectF = None):
+        """Paint *surface*'s part of the overlay; *painter* is in overlay coordinates.
+
+        Only what intersects *dirty* (default: the whole view) is drawn.
+        """
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        area = surface.area
+        view = surface.scene_rect()
+        has_cursor = surface is self.cursor_surface
 
-        # 1️⃣ Draw background screenshot
-        if hasattr(self, "screenshot") and not self.screenshot.isNull():
-            painter.drawPixmap(0, 0, self.screenshot)
+        # 1️⃣ Draw background screenshot (1:1 in device pixels unless zoomed)
+        if surface.zoom == 1:
+            painter.drawPixmap(area.topLeft(), surface.pixmap)
+        else:
+            self._draw_zoomed_background(painter, surface, view)
 
         # 2️⃣ Dim the whole screen and cut a hole for the selected area
         path = QPainterPath()
-        path.addRect(QRectF(self.rect()))
+        path.addRect(view)
         current_rect = QRect()
         if self.is_selecting:
             current_rect = QRect(self.begin, self.end).normalized()
@@ -282,15 +713,15 @@ class SnippingOverlay(QWidget):
 
         # 3️⃣ Draw selection border
         if not current_rect.isNull() and current_rect.isValid():
-            painter.setPen(QPen(QColor("white"), 1, Qt.PenStyle.DashLine))
+            painter.setPen(self._cosmetic_pen(QColor("white"), Qt.PenStyle.DashLine))
             painter.setBrush(Qt.BrushStyle.NoBrush)
             painter.drawRect(current_rect)
             
             # Draw resize handles if selection is done and no tool is active
             if self.selection_done and self.current_tool == "none":
-                hs = self.resize_handle_size
-                hw = hs // 2
-                painter.setPen(QPen(Qt.GlobalColor.white))
+                hs = self.resize_handle_size / surface.zoom
+                hw = hs / 2
+                painter.setPen(self._cosmetic_pen(QColor(Qt.GlobalColor.white)))
                 painter.setBrush(Qt.GlobalColor.white)
                 
                 r = current_rect
@@ -301,52 +732,69 @@ class SnippingOverlay(QWidget):
                 ]
                 
                 for p in points:
-                    painter.drawRect(p.x() - hw, p.y() - hw, hs, hs)
-
-        # 4️⃣ Persistent annotations
-        for item in self.annotations:
-            self._draw_annotation(painter, item)
+                    painter.drawRect(QRectF(p.x() - hw, p.y() - hw, hs, hs))
+
+        # Element the cursor is over, selected by a click
+        if not self.selection_done and not self.is_selecting and self.snap_rect.isValid():
+            painter.setPen(self._cosmetic_pen(QColor(0, 120, 215)))
+            painter.setBrush(QColor(0, 120, 215, 40))
+            painter.drawRect(self.snap_rect)
+
+        # 4️⃣ Persistent annotations (only those in the repainted part: the
+        # rest would be clipped away, but stroking them would still cost)
+        for item in self.annotation_index.in_rect(view if dirty is None else view.intersected(dirty)):
+            draw_annotation(painter, item)
+        if self.selected_annotation is not None:
+            painter.setPen(self._cosmetic_pen(QColor("white"), Qt.PenStyle.DashLine))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(self.annotation_index.bounds(self.selected_annotation).adjusted(-2, -2, 2, 2))
 
         if self.current_drawing_item:
-            self._draw_annotation(painter, self.current_drawing_item)
+            draw_annotation(painter, self.current_drawing_item)
 
         # 6️⃣ Draw cursor coordinates and Crosshair (when selecting)
-        if self.is_selecting or (not self.selection_done and self.current_tool == "none"):
+        # (only on the monitor under the cursor, so moving it repaints one monitor)
+        choosing = self.is_selecting or (not self.selection_done and self.current_tool == "none")
+        if has_cursor and choosing:
             # Draw Crosshair
-            crosshair_pen = QPen(QColor(255, 255, 255, 120), 1, Qt.PenStyle.SolidLine)
+            crosshair_pen = self._cosmetic_pen(QColor(255, 255, 255, 120))
             painter.setPen(crosshair_pen)
             # Vertical line
-            painter.drawLine(self.cursor_pos.x(), 0, self.cursor_pos.x(), self.height())
+            painter.drawLine(QLineF(self.cursor_pos.x(), view.top(), self.cursor_pos.x(), view.bottom()))
             # Horizontal line
-            painter.drawLine(0, self.cursor_pos.y(), self.width(), self.cursor_pos.y())
-
-        if self.settings.value("show_coords", True, type=bool):
+            painter.drawLine(QLineF(view.left(), self.cursor_pos.y(), view.right(), self.cursor_pos.y()))
+            if surface.zoom > 1:
+                # The pixel that a click picks
+                painter.setPen(self._cosmetic_pen(QColor(Qt.GlobalColor.red)))
+                painter.drawRect(QRect(self.cursor_pos, QSize(1, 1)))
+
+        # --- Timestamp (Inside, Black Background) ---
+        # Part of the exported image, so it zooms with it
+        if not current_rect.isNull() and current_rect.isValid() and self.settings.value("show_datetime", True, type=bool):
+            # Pos: Top-Left + padding
+            draw_timestamp(painter, current_rect.topLeft() + QPoint(10, 20), self.font())
+
+        # From here on, UI drawn at screen size whatever the zoom
+        painter.resetTransform()
+        painter.translate(-QPointF(area.topLeft()))
+
+        if has_cursor and self.settings.value("show_coords", True, type=bool):
             painter.setPen(QPen(Qt.GlobalColor.white))
-            painter.drawText(20, 30, f"X: {self.cursor_pos.x()} Y: {self.cursor_pos.y()}")
+            text = f"X: {self.cursor_pos.x()} Y: {self.cursor_pos.y()}"
+            if surface.zoom != 1:
+                text += f"  {surface.zoom * 100:g}%"
+            painter.drawText(area.topLeft() + QPoint(20, 30), text)
             
-        # 7️⃣ Draw Magnifier (when selecting or choosing first point)
-        if self.is_selecting or (not self.selection_done and self.current_tool == "none"):
-            self._draw_magnifier(painter)
+        # 7️⃣ Draw Magnifier (when selecting or choosing first point; a
+        # view zoomed in at least as much already is one)
+        if has_cursor and choosing and surface.zoom < self.MAGNIFIER_ZOOM:
+            self._draw_magnifier(painter, surface)
 
-        # 8️⃣ Draw Date/Time & Dimensions (if valid)
+        # 8️⃣ Draw Dimensions (if valid)
         if not current_rect.isNull() and current_rect.isValid():
             fm = QFontMetrics(self.font())
             ts_h = fm.height()
-            
-            # --- Timestamp (Inside, Black Background) ---
-            if self.settings.value("show_datetime", True, type=bool):
-                timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-                ts_w = fm.horizontalAdvance(timestamp)
-                
-                # Pos: Top-Left + padding
-                ts_pos = current_rect.topLeft() + QPoint(10, 20)
-                
-                # Draw Black Background
-                ts_bg_rect = QRect(ts_pos.x() - 4, ts_pos.y() - ts_h + 4, ts_w + 8, ts_h)
-                painter.fillRect(ts_bg_rect, Qt.GlobalColor.black)
-                
-                painter.setPen(QPen(Qt.GlobalColor.white))
-                painter.drawText(ts_pos, timestamp)
+            shown = surface.from_scene_rect(current_rect) if surface.zoom != 1 else current_rect
 
             # --- Dimensions (Outside, Black Background) ---
             if self.settings.value("show_coords", True, type=bool):
@@ -354,10 +802,10 @@ class SnippingOverlay(QWidget):
                 dim_w = fm.horizontalAdvance(dim_text)
                 
                 # Pos: Above Top-Left
-                dim_pos = current_rect.topLeft() - QPoint(0, 8)
+                dim_pos = shown.topLeft() - QPoint(0, 8)
                 # Ensure it doesn't clip top of screen
                 if dim_pos.y() < ts_h:
-                    dim_pos = current_rect.topLeft() + QPoint(0, ts_h + 30)
+                    dim_pos = shown.topLeft() + QPoint(0, ts_h + 30)
                 
                 dim_bg_rect = QRect(dim_pos.x() - 4, dim_pos.y() - ts_h + 4, dim_w + 8, ts_h)
                 painter.fillRect(dim_bg_rect, Qt.GlobalColor.black)
@@ -365,127 +813,185 @@ class SnippingOverlay(QWidget):
                 painter.setPen(QPen(Qt.GlobalColor.white))
                 painter.drawText(dim_pos, dim_text)
 
-    def _draw_annotation(self, painter: QPainter, item: dict):
-        if item["type"] == "pen":
-            pen = QPen(item["color"], 3, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawPath(item["data"])
-        elif item["type"] == "highlighter":
-            # Highlighter: thick, semi-transparent
-            c = QColor(item["color"])
-            c.setAlpha(80)
-            pen = QPen(c, 24, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawPath(item["data"])
-        elif item["type"] == "rect":
-            pen = QPen(item["color"], 3, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawRect(item["data"])
-        elif item["type"] == "arrow":
-            pen = QPen(item["color"], 3, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap, Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            self._draw_arrow(painter, item["data"])
-        elif item["type"] == "text":
-            painter.setPen(QPen(item["color"], 3))
-            painter.drawText(item["pos"], item["data"])
-        elif item["type"] == "image":
-            # Used for blurred patches
-            painter.drawPixmap(item["pos"], item["data"])
-        elif item["type"] == "blur":
-            # Preview while dragging
-            painter.setPen(QPen(QColor("white"), 1, Qt.PenStyle.DashLine))
-            painter.setBrush(QColor(255, 255, 255, 50))
-            painter.drawRect(item["data"])
-
-    def _draw_arrow(self, painter: QPainter, line: QLineF):
-        painter.drawLine(line)
-        angle = math.atan2(-line.dy(), line.dx())
-        arrow_size = 15
-        p1 = line.p2() - QPointF(
-            arrow_size * math.cos(angle - math.pi / 6),
-            -arrow_size * math.sin(angle - math.pi / 6),
-        )
-        p2 = line.p2() - QPointF(
-            arrow_size * math.cos(angle + math.pi / 6),
-            -arrow_size * math.sin(angle + math.pi / 6),
+        if self.show_hud and has_cursor:
+            self._draw_hud(painter, area.topLeft() + self.HUD_RECT.topLeft())
+
+    def _draw_hud(self, painter: QPainter, top_left: QPoint):
+        """Frame timings: paint-time percentiles over the last few seconds,
+        the refresh rate frames are paced to, and input events per frame."""
+        p50, p95, p99 = self.frame_stats.percentiles()
+        pacer = self.pacer
+        per_frame = pacer.events / pacer.frames if pacer.frames else 0.0
+        lines = (
+            f"Pintado p50 {p50:.2f} · p95 {p95:.2f} · p99 {p99:.2f} ms",
+            f"{1 / pacer.period:.0f} Hz · {per_frame:.1f} eventos de ratón por fotograma",
         )
-        polygon = QPolygonF([line.p2(), p1, p2])
-        painter.setBrush(painter.pen().color())
-        painter.drawPolygon(polygon)
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-
-    def _draw_magnifier(self, painter: QPainter):
-        """Draws a zoomed-in view of the area under the cursor."""
-        if not hasattr(self, "screenshot") or self.screenshot.isNull():
+        rect = QRect(top_left, self.HUD_RECT.size())
+        painter.fillRect(rect, QColor(0, 0, 0, 180))
+        painter.setPen(QPen(Qt.GlobalColor.white))
+        fm = QFontMetrics(self.font())
+        for i, line in enumerate(lines):
+            painter.drawText(rect.topLeft() + QPoint(8, 6 + fm.ascent() + i * fm.height()), line)
+
+    def _update_hud(self):
+        # Drawn at screen size, so it is updated on the window itself
+        if self.cursor_surface is not None:
+            self.cursor_surface.update(self.HUD_RECT)
+
+    def _cosmetic_pen(self, color, style=Qt.PenStyle.SolidLine):
+        """One device pixel wide at any zoom."""
+        pen = QPen(color, 1, style)
+        pen.setCosmetic(True)
+        return pen
+
+    def _draw_zoomed_background(self, painter: QPainter, surface: ScreenSurface, view: QRectF):
+        """The screenshot under a zoomed view.
+
+        Only the visible part of each monitor is drawn. Zoomed in, it is
+        magnified with nearest-neighbour pixels; zoomed out, it comes from
+        the pyramid level nearest above the view's scale, so the smoothing
+        only ever shrinks by less than 2x.
+        """
+        painter.save()
+        painter.fillRect(view, Qt.GlobalColor.black)
+        view_dpr = surface.pixmap.devicePixelRatio()
+        for source in self.surfaces:
+            part = QRectF(source.area).intersected(view)
+            if part.isEmpty():
+                continue
+            dpr = source.pixmap.devicePixelRatio()
+            # Device pixels of this window per pixel of the screenshot
+            scale = surface.zoom * view_dpr / dpr
+            pixmap, level_scale = source.pixmap, 1.0
+            if scale < 1 and source.pyramid is not None:
+                level = source.pyramid.level_for(scale)
+                if level:
+                    pixmap, level_scale = source.pyramid.pixmap(level), source.pyramid.scale_of(level)
+            src = QRectF(
+                (part.topLeft() - QPointF(source.area.topLeft())) * dpr * level_scale,
+                part.size() * dpr * level_scale,
+            )
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, scale < 1)
+            painter.drawPixmap(part, pixmap, src)
+        painter.restore()
+
+    def _draw_magnifier(self, painter: QPainter, surface: ScreenSurface):
+        """Draws a zoomed-in view of the area under the cursor.
+
+        The magnified tile and the pixel readout for a cursor position are
+        cached, and the grid is a pixmap rendered once, so a repaint costs
+        two pixmap blits however large the screen is.
+        """
+        area = surface.area
+        # Zoomed out, the cursor can be over another monitor's pixels
+        source = self._surface_at(self.cursor_pos)
+        if source is None:
             return
-            
-        zoom_factor = 5
-        mag_size = 120
-        half_mag = mag_size // 2
-        
-        # Source rectangle (small area around cursor)
-        src_size = mag_size // zoom_factor
-        src_rect = QRect(
-            self.cursor_pos.x() - src_size // 2,
-            self.cursor_pos.y() - src_size // 2,
-            src_size,
-            src_size
-        )
-        
+        cursor = surface.from_scene(self.cursor_pos).toPoint()
+        mag_size = self.MAGNIFIER_SIZE
+        tile, readout = self._magnifier_tile(source, self.cursor_pos - source.area.topLeft())
+
         # Determine where to draw the magnifier (offset from cursor)
-        mag_pos = self.cursor_pos + QPoint(20, 20)
-        # Flip to other side if near edge
-        if mag_pos.x() + mag_size > self.width():
-            mag_pos.setX(self.cursor_pos.x() - mag_size - 20)
-        if mag_pos.y() + mag_size > self.height():
-            mag_pos.setY(self.cursor_pos.y() - mag_size - 20)
-            
-        # Draw background
+        mag_pos = cursor + QPoint(20, 20)
+        # Flip to other side if near this monitor's edge
+        if mag_pos.x() + mag_size > area.right():
+            mag_pos.setX(cursor.x() - mag_size - 20)
+        if mag_pos.y() + mag_size > area.bottom():
+            mag_pos.setY(cursor.y() - mag_size - 20)
+
+        # Zoomed image, grid and center pixel highlight
         mag_rect = QRect(mag_pos.x(), mag_pos.y(), mag_size, mag_size)
-        painter.save()
-        painter.setClipRect(mag_rect)
-        
-        # Draw zoomed image
-        painter.drawPixmap(mag_rect, self.screenshot, src_rect)
-        
-        # Draw grid
-        painter.setPen(QPen(QColor(255, 255, 255, 50), 1))
-        for i in range(1, zoom_factor):
-            step = i * (mag_size / zoom_factor)
-            painter.drawLine(int(mag_pos.x() + step), mag_pos.y(), int(mag_pos.x() + step), mag_pos.y() + mag_size)
-            painter.drawLine(mag_pos.x(), int(mag_pos.y() + step), mag_pos.x() + mag_size, int(mag_pos.y() + step))
-            
-        # Draw center pixel highlight
-        center_pixel_rect = QRect(
-            int(mag_pos.x() + (src_size // 2) * zoom_factor),
-            int(mag_pos.y() + (src_size // 2) * zoom_factor),
-            zoom_factor,
-            zoom_factor
-        )
-        painter.setPen(QPen(Qt.GlobalColor.red, 1))
-        painter.drawRect(center_pixel_rect)
-        
-        painter.restore()
-        
+        painter.drawPixmap(mag_rect, tile)
+        painter.drawPixmap(mag_rect, self._magnifier_grid(surface.pixmap.devicePixelRatio()))
+
         # Draw border
         painter.setPen(QPen(Qt.GlobalColor.white, 2))
         painter.drawRect(mag_rect)
 
+        # Pixel inspector: color under the cursor and the magnified area's range
+        if self.settings.value("show_coords", True, type=bool):
+            fm = QFontMetrics(self.font())
+            line_h = fm.height()
+            box = QRect(0, 0, max(mag_size, max(fm.horizontalAdvance(t) for t in readout) + 8),
+                        line_h * len(readout) + 6)
+            box.moveTopLeft(mag_rect.bottomLeft() + QPoint(0, 6))
+            if box.bottom() > area.bottom():
+                box.moveBottomLeft(mag_rect.topLeft() - QPoint(0, 6))
+            painter.fillRect(box, Qt.GlobalColor.black)
+            painter.setPen(QPen(Qt.GlobalColor.white))
+            for i, text in enumerate(readout):
+                painter.drawText(box.left() + 4, box.top() + 3 + fm.ascent() + i * line_h, text)
+
+    def _magnifier_tile(self, source: ScreenSurface, local: QPoint):
+        """``(pixmap, readout lines)`` for the pixels around *local* on *source*."""
+        key = (id(source), local.x(), local.y())
+        cached = self._magnifier_tiles.get(key)
+        if cached is not None:
+            self._magnifier_tiles.move_to_end(key)
+            return cached
+
+        n = self.MAGNIFIER_SIZE // self.MAGNIFIER_ZOOM
+        half = n // 2
+        pixmap = source.pixmap
+        dpr = pixmap.devicePixelRatio()
+        # The device pixel at the top-left of each logical pixel shown
+        xs = np.floor((np.arange(n) + local.x() - half) * dpr).astype(np.int64)
+        ys = np.floor((np.arange(n) + local.y() - half) * dpr).astype(np.int64)
+        valid_x = (xs >= 0) & (xs < pixmap.width())
+        valid_y = (ys >= 0) & (ys < pixmap.height())
+
+        cells = np.full((n, n), 0xFF000000, dtype=np.uint32)
+        if valid_x.any() and valid_y.any():
+            x0, y0 = int(xs[valid_x][0]), int(ys[valid_y][0])
+            part = pixmap.copy(QRect(x0, y0, int(xs[valid_x][-1]) - x0 + 1, int(ys[valid_y][-1]) - y0 + 1))
+            pixels = image_array(part.toImage())
+            cells[np.ix_(valid_y, valid_x)] = pixels[np.ix_(ys[valid_y] - y0, xs[valid_x] - x0)]
+
+        # Nearest-neighbour, integer upscale
+        image = QImage(cells.tobytes(), n, n, n * 4, QImage.Format.Format_RGB32)
+        tile = QPixmap.fromImage(image.scaled(
+            self.MAGNIFIER_SIZE, self.MAGNIFIER_SIZE,
+            Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.FastTransformation,
+        ))
+        cached = (tile, pixel_readout(cells, cells[half, half], valid_y[:, None] & valid_x[None, :]))
+        self._magnifier_tiles[key] = cached
+        if len(self._magnifier_tiles) > self.MAGNIFIER_CACHE:
+            self._magnifier_tiles.popitem(last=False)
+        return cached
+
+    def _magnifier_grid(self, dpr):
+        """Grid and center pixel highlight, drawn once per device pixel ratio."""
+        grid = self._magnifier_grids.get(dpr)
+        if grid is not None:
+            return grid
+        zoom_factor = self.MAGNIFIER_ZOOM
+        mag_size = self.MAGNIFIER_SIZE
+        src_size = mag_size // zoom_factor
+        grid = QPixmap((QSizeF(mag_size, mag_size) * dpr).toSize())
+        grid.setDevicePixelRatio(dpr)
+        grid.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(grid)
+        painter.setPen(QPen(QColor(255, 255, 255, 50), 1))
+        for i in range(1, zoom_factor):
+            step = int(i * (mag_size / zoom_factor))
+            painter.drawLine(step, 0, step, mag_size)
+            painter.drawLine(0, step, mag_size, step)
+        painter.setPen(QPen(Qt.GlobalColor.red, 1))
+        painter.drawRect(QRect((src_size // 2) * zoom_factor, (src_size // 2) * zoom_factor, zoom_factor, zoom_factor))
+        painter.end()
+        self._magnifier_grids[dpr] = grid
+        return grid
 
     # ---------------------------------------------------------------------
     # Mouse handling
     # ---------------------------------------------------------------------
-    def mousePressEvent(self, event):
+    def mouse_press(self, event, pos: QPoint):
         if event.button() != Qt.MouseButton.LeftButton:
             return
             
         if not self.selection_done:
             # Start region selection
-            self.begin = event.pos()
+            self.begin = pos
             self.end = self.begin
             self.is_selecting = True
             self.update()
@@ -495,49 +1001,46 @@ class SnippingOverlay(QWidget):
         # If a tool is active, use it
         if self.current_tool != "none":
             if self.current_tool == "text":
-                idx = self._hit_test_text(event.pos())
-                if idx is not None:
-                    self._edit_text_annotation(idx)
+                item = self._hit_test_text(pos)
+                if item is not None:
+                    self._edit_text_annotation(item)
                 else:
-                    text, ok = QInputDialog.getText(self, i18n.tr("input_add_text_title"), i18n.tr("input_add_text_label"))
+                    text, ok = QInputDialog.getText(self._dialog_parent(), i18n.tr("input_add_text_title"), i18n.tr("input_add_text_label"))
                     if ok and text:
-                        annotation = {
-                            "type": "text",
-                            "data": text,
-                            "pos": event.pos(),
-                            "color": self.current_color,
-                        }
-                        self.annotations.append(annotation)
-                        self.update()
+                        self._add_annotation(ann.Text(self.current_color, pos, text))
+            elif self.current_tool == "move":
+                self._select_annotation(self.annotation_index.at(pos))
+                self.dragging_annotation = self.selected_annotation is not None
+                self.drag_start_pos = self.annotation_drag_origin = pos
             else:
-                self._start_drawing(event.pos())
+                self._start_drawing(pos)
             return
             
         # If NO tool is active, check for resize/move handles
-        handle = self._hit_test_handle(event.pos())
+        handle = self._hit_test_handle(pos)
         if handle:
             self.toolbar.hide() # Hide toolbar while adjusting
             if handle == "INSIDE":
                 self.moving_selection = True
-                self.drag_start_pos = event.pos()
+                self.drag_start_pos = pos
                 self.initial_selection_rect = self.selection_rect
             else:
                 self.active_handle = handle
-                self.drag_start_pos = event.pos()
+                self.drag_start_pos = pos
                 self.initial_selection_rect = self.selection_rect
         else:
             # Clicked outside selection rect -> maybe clear selection?
             # For now, let's just create a new selection like Lightshot does (reset)
             self.selection_done = False
-            self.begin = event.pos()
+            self.begin = pos
             self.end = self.begin
             self.is_selecting = True
-            self.annotations = [] # Clear annotations if re-selecting
+            self._clear_annotations() # Clear annotations if re-selecting
             self.toolbar.hide()
             self.toolbar_moved_manually = False # Reset for new selection
             self.update()
 
-    def mouseDoubleClickEvent(self, event):
+    def mouse_double_click(self, event, pos: QPoint):
         """Double click selects the entire monitor under the cursor."""
         if event.button() != Qt.MouseButton.LeftButton:
             return
@@ -557,18 +1060,36 @@ class SnippingOverlay(QWidget):
         self.update()
         self._show_toolbar()
 
-    def mouseMoveEvent(self, event):
-        self.cursor_pos = event.pos()
+    def queue_move(self, pos: QPoint):
+        """Pointer moved: handled at the next frame with the latest *pos*."""
+        if self.stroke_builder is not None:
+            self.stroke_builder.add(QPointF(pos))
+        self.pending_move = pos
+        self.pacer.request()
+
+    def _on_frame(self):
+        pos, self.pending_move = self.pending_move, None
+        if pos is not None:
+            self.mouse_move(pos)
+        if self.show_hud:
+            self._update_hud()
+
+    def mouse_move(self, pos: QPoint):
+        old_cursor = self.cursor_pos
+        old_selection = QRect(self.selection_rect)
+        self.cursor_pos = pos
         
         if self.is_selecting:
-            self.end = event.pos()
+            self.end = pos
             self.selection_rect = QRect(self.begin, self.end).normalized()
-            self.update()
+            self._update_selection(old_selection, self.selection_rect)
+            self._update_at(old_cursor)
+            self._update_at(pos)
             
         elif self.active_handle:
             # Resizing logic
             r = self.initial_selection_rect
-            delta = event.pos() - self.drag_start_pos
+            delta = pos - self.drag_start_pos
             dx, dy = delta.x(), delta.y()
             
             new_rect = QRect(r)
@@ -583,26 +1104,30 @@ class SnippingOverlay(QWidget):
                 new_rect.setBottom(r.bottom() + dy)
                 
             self.selection_rect = new_rect.normalized()
-            self.update()
+            self._update_selection(old_selection, self.selection_rect)
             
         elif self.moving_selection:
             # Moving logic
-            delta = event.pos() - self.drag_start_pos
+            delta = pos - self.drag_start_pos
             self.selection_rect = self.initial_selection_rect.translated(delta)
             
-            # Constrain to screen
-            screen_geo = self.screen().geometry() # or self.rect()
-            
-            # Simple containment check / clamping could be added here
-            # For now allow free movement, user can bring it back
-            self.update()
+            # Free movement, also across monitors; the user can bring it back
+            self._update_selection(old_selection, self.selection_rect)
             
         elif self.selection_done and self.current_drawing_item:
-            self._update_drawing(event.pos())
+            self._update_drawing(pos)
+
+        elif self.selection_done and self.current_tool == "move":
+            if self.dragging_annotation:
+                self._move_annotation(self.selected_annotation, pos - self.drag_start_pos)
+                self.drag_start_pos = pos
+            else:
+                over = self.annotation_index.at(pos) is not None
+                self.setCursor(Qt.CursorShape.SizeAllCursor if over else Qt.CursorShape.ArrowCursor)
             
         elif self.selection_done and self.current_tool == "none":
             # Update cursor shape based on hover
-            handle = self._hit_test_handle(event.pos())
+            handle = self._hit_test_handle(pos)
             self._update_cursor_shape(handle)
         
         else:
@@ -611,19 +1136,29 @@ class SnippingOverlay(QWidget):
                 self.setCursor(Qt.CursorShape.CrossCursor)
             else:
                  self.setCursor(Qt.CursorShape.ArrowCursor)
-            self.update()
+            # Crosshair, coordinates and magnifier follow the cursor
+            self._update_at(old_cursor)
+            self._update_at(pos)
+            if not self.selection_done:
+                self._update_snap(pos)
 
-    def mouseReleaseEvent(self, event):
+    def mouse_release(self, event, pos: QPoint):
         if event.button() != Qt.MouseButton.LeftButton:
             return
             
         if self.is_selecting:
             self.is_selecting = False
             self.selection_rect = QRect(self.begin, self.end).normalized()
+            if self.selection_rect.width() <= 10 and self.selection_rect.height() <= 10:
+                # A click, not a drag: select the detected element, if any
+                snap = self._snap_at(pos)
+                if snap.isValid():
+                    self.selection_rect = snap
             if self.selection_rect.width() > 10 and self.selection_rect.height() > 10:
                 self.selection_done = True
                 self._show_toolbar()
-                self.setMouseTracking(True) # Ensure tracking is on for hover effects
+                # The crosshair and magnifier go away
+                self.update()
             else:
                 self.selection_done = False
                 self.update()
@@ -635,114 +1170,157 @@ class SnippingOverlay(QWidget):
             self._show_toolbar()
             self.update()
             return
+        if self.dragging_annotation:
+            self.dragging_annotation = False
+            delta = self.drag_start_pos - self.annotation_drag_origin
+            if not delta.isNull():
+                self.history.record(history.MoveAnnotation(self.selected_annotation, delta))
+            return
         if self.current_drawing_item:
+            # Where the preview was drawn
+            dirty = self.current_drawing_item.bounds()
             # If it's a blur tool, we process the image immediately and store it as a static image
-            if self.current_drawing_item["type"] == "blur":
-                rect = self.current_drawing_item["data"]
-                if rect.width() > 0 and rect.height() > 0 and not self.screenshot.isNull():
-                    # 1. Grab original area
-                    # Need to translate from global to screenshot coords?
-                    # The screenshot covers the whole overlay (0,0), so local keys map to global.
-                    # QImage.copy expects rect in image coords.
-                    original_chunk = self.screenshot.copy(rect)
-                    
-                    # 2. Blur effect: Scale down heavily and scale back up
-                    small_w = max(1, original_chunk.width() // 10)
-                    small_h = max(1, original_chunk.height() // 10)
-                    
-                    small = original_chunk.scaled(small_w, small_h, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    blurred = small.scaled(original_chunk.width(), original_chunk.height(), Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    
-                    # 3. Store as 'image' type annotation
-                    self.current_drawing_item = {
-                        "type": "image",
-                        "data": blurred,
-                        "pos": rect.topLeft(),
-                        "color": None
-                    }
+            if isinstance(self.current_drawing_item, ann.BlurPreview):
+                rect = self.current_drawing_item.rect
+                if rect.width() > 0 and rect.height() > 0 and self.surfaces:
+                    # Stored as a static image annotation
+                    self.current_drawing_item = ann.Image(rect.topLeft(), self._blur_rect(rect))
                 else:
                     self.current_drawing_item = None
 
-            if self.current_drawing_item:
-                self.annotations.append(self.current_drawing_item)
-
-            self.current_drawing_item = None
-            self.update()
+            item, self.current_drawing_item = self.current_drawing_item, None
+            if isinstance(item, ann.Stroke):
+                item.path = self.stroke_builder.finish(smooth=self.settings.value("smooth_strokes", False, type=bool))
+                item.changed()
+                self.stroke_builder = None
+            if item:
+                self._add_annotation(item)
+            self.update(dirty.adjusted(-2, -2, 2, 2).toAlignedRect())
 
     # ---------------------------------------------------------------------
     # Drawing helpers
     # ---------------------------------------------------------------------
     def _start_drawing(self, pos: QPoint):
-        if self.current_tool == "pen":
-            path = QPainterPath(QPointF(pos))
-            self.current_drawing_item = {"type": "pen", "data": path, "color": self.current_color}
-        elif self.current_tool == "highlighter":
-            path = QPainterPath(QPointF(pos))
-            self.current_drawing_item = {"type": "highlighter", "data": path, "color": self.current_color}
+        self.drawing_origin = pos
+        if self.current_tool in ("pen", "highlighter"):
+            zoom = self.cursor_surface.zoom if self.cursor_surface is not None else 1
+            self.stroke_builder = strokes.StrokeBuilder(QPointF(pos), zoom)
+            kind = ann.Pen if self.current_tool == "pen" else ann.Highlighter
+            self.current_drawing_item = kind(self.current_color, QPainterPath(QPointF(pos)))
         elif self.current_tool == "rect":
-            self.current_drawing_item = {
-                "type": "rect",
-                "origin": pos,
-                "data": QRect(pos, pos),
-                "color": self.current_color,
-            }
+            self.current_drawing_item = ann.Rect(self.current_color, QRect(pos, pos))
         elif self.current_tool == "blur":
-            self.current_drawing_item = {
-                "type": "blur",
-                "origin": pos,
-                "data": QRect(pos, pos),
-                "color": None, # Blur doesn't use color
-            }
+            # Blur doesn't use color
+            self.current_drawing_item = ann.BlurPreview(None, QRect(pos, pos))
         elif self.current_tool == "arrow":
-            self.current_drawing_item = {
-                "type": "arrow",
-                "origin": pos,
-                "data": QLineF(QPointF(pos), QPointF(pos)),
-                "color": self.current_color,
-            }
+            self.current_drawing_item = ann.Arrow(self.current_color, QLineF(QPointF(pos), QPointF(pos)))
 
     def _update_drawing(self, pos: QPoint):
-        if self.current_tool in ["pen", "highlighter"]:
-            self.current_drawing_item["data"].lineTo(QPointF(pos))
-        elif self.current_tool in ["rect", "blur"]:
-            origin = self.current_drawing_item["origin"]
-            self.current_drawing_item["data"] = QRect(origin, pos).normalized()
-        elif self.current_tool == "arrow":
-            origin = self.current_drawing_item["origin"]
-            self.current_drawing_item["data"] = QLineF(QPointF(origin), QPointF(pos))
-        self.update()
+        item = self.current_drawing_item
+        # Antialiasing can touch a pixel past the stroke
+        pad = item.stroke_width / 2 + 2
+        if isinstance(item, ann.Stroke):
+            # Points were added to the builder as they came (queue_move)
+            new = self.stroke_builder.take_new()
+            if not new:
+                return
+            for x, y in new[1:]:
+                item.path.lineTo(x, y)
+            item.changed()
+            # Only the new segments need repainting
+            xs, ys = [p[0] for p in new], [p[1] for p in new]
+            dirty = QRectF(min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+            self.update(dirty.adjusted(-pad, -pad, pad, pad).toAlignedRect())
+            return
+        old = item.bounds()
+        if isinstance(item, ann.Rect):
+            item.rect = QRect(self.drawing_origin, pos).normalized()
+        elif isinstance(item, ann.Arrow):
+            item.line = QLineF(QPointF(self.drawing_origin), QPointF(pos))
+        item.changed()
+        self.update(old.united(item.bounds()).adjusted(-2, -2, 2, 2).toAlignedRect())
 
     # ---------------------------------------------------------------------
     # Text hit‑test & edit
     # ---------------------------------------------------------------------
     def _hit_test_text(self, pos: QPoint):
-        """Return index of text annotation under *pos* or ``None``.
+        """Return the text annotation under *pos* or ``None``.
 
-        Uses ``QFontMetrics`` to compute the bounding rectangle of each text
-        annotation. Adds a small padding for easier clicking.
+        Looked up in the annotation index, whose text boxes come from cached
+        ``QFontMetrics`` sizes. Adds a small padding for easier clicking.
         """
-        for idx, item in enumerate(self.annotations):
-            if item["type"] != "text":
-                continue
-            fm = QFontMetrics(self.font())
-            width = fm.horizontalAdvance(item["data"])
-            height = fm.height()
-            padding = 4
-            rect = QRect(item["pos"] - QPoint(padding, padding), QSize(width + 2 * padding, height + 2 * padding))
-            if rect.contains(pos):
-                return idx
-        return None
+        return self.annotation_index.at(pos, tolerance=4, types=ann.Text)
 
-    def _edit_text_annotation(self, idx: int):
-        annotation = self.annotations[idx]
-        current_text = annotation["data"]
+    def _edit_text_annotation(self, annotation: ann.Text):
+        current_text = annotation.text
         new_text, ok = QInputDialog.getText(
-            self, i18n.tr("input_edit_text_title"), i18n.tr("input_edit_text_label"), text=current_text
+            self._dialog_parent(), i18n.tr("input_edit_text_title"), i18n.tr("input_edit_text_label"), text=current_text
         )
         if ok and new_text:
-            annotation["data"] = new_text
-            self.annotations[idx] = annotation
-            self.update()
+            if new_text != current_text:
+                self._set_annotation_text(annotation, new_text)
+                self.history.record(history.EditText(annotation, current_text, new_text))
+
+    # ---------------------------------------------------------------------
+    # Annotation list (always through these, to keep the index in step)
+    # ---------------------------------------------------------------------
+    def _add_annotation(self, item: ann.Annotation):
+        """Add a new annotation on top, as an undoable step."""
+        self._insert_annotation(item)
+        self.history.record(history.AddAnnotation(item))
+
+    def _delete_annotation(self, item: ann.Annotation):
+        """Delete an annotation, as an undoable step."""
+        position, z = self._remove_annotation(item)
+        self.history.record(history.RemoveAnnotation(item, position, z))
+
+    # The primitives below are also what the history replays
+
+    def _insert_annotation(self, item: ann.Annotation, position=None, z=None):
+        if position is None:
+            self.annotations.append(item)
+        else:
+            self.annotations.insert(position, item)
+        self.annotation_index.add(item, z)
+        self.update(self.annotation_index.bounds(item).toAlignedRect())
+
+    def _remove_annotation(self, item: ann.Annotation):
+        """Take *item* out; returns its ``(position, z)`` for putting it back."""
+        bounds = self.annotation_index.bounds(item)
+        position = self.annotations.index(item)
+        del self.annotations[position]
+        z = self.annotation_index.remove(item)
+        if item is self.selected_annotation:
+            self.selected_annotation = None
+            self.dragging_annotation = False
+        self.update(bounds.toAlignedRect())
+        return position, z
+
+    def _move_annotation(self, item: ann.Annotation, delta: QPoint):
+        old = self.annotation_index.bounds(item)
+        item.translate(delta)
+        self.annotation_index.update(item)
+        self.update(old.united(self.annotation_index.bounds(item)).toAlignedRect())
+
+    def _set_annotation_text(self, item: ann.Text, text: str):
+        old = self.annotation_index.bounds(item)
+        item.text = text
+        item.changed()
+        self.annotation_index.update(item)
+        self.update(old.united(self.annotation_index.bounds(item)).toAlignedRect())
+
+    def _clear_annotations(self):
+        self.annotations = []
+        self.annotation_index.rebuild(self.annotations)
+        self.history.clear()
+        self.selected_annotation = None
+        self.dragging_annotation = False
+
+    def _select_annotation(self, item):
+        for old in (self.selected_annotation, item):
+            if old is not None:
+                self.update(self.annotation_index.bounds(old).toAlignedRect().adjusted(-4, -4, 4, 4))
+        self.selected_annotation = item
 
     # ---------------------------------------------------------------------
     # Toolbar positioning
@@ -765,16 +1343,20 @@ class SnippingOverlay(QWidget):
         tb_w = self.toolbar.width()
         tb_h = self.toolbar.height()
 
+        # Where the selection is shown: through the view of a zoomed monitor
+        zoomed = self.cursor_surface if self.cursor_surface and self.cursor_surface.zoom != 1 else None
+        sel = zoomed.from_scene_rect(self.selection_rect) if zoomed else self.selection_rect
+
         # Horizontal: Center relative to selection
-        tb_x = self.selection_rect.center().x() - (tb_w // 2)
+        tb_x = sel.center().x() - (tb_w // 2)
         
         # Vertical: Below selection with margin
-        tb_y = self.selection_rect.bottom() + 10
+        tb_y = sel.bottom() + 10
 
         # Screen boundary clamping logic
         # For multi-monitor, we find which monitor the center of the selection is in
-        global_center = self.mapToGlobal(self.selection_rect.center())
-        screen = QApplication.screenAt(global_center) or self.screen()
+        global_center = self.mapToGlobal(sel.center())
+        screen = zoomed.screen() if zoomed else (QApplication.screenAt(global_center) or self.screen())
         screen_geo = screen.geometry()
         
         # Convert screen geometry to our local coordinate system (the giant overlay)
@@ -789,7 +1371,7 @@ class SnippingOverlay(QWidget):
 
         # Check if it fits below, otherwise flip to top
         if tb_y + tb_h > screen_br_local.y():
-            tb_y = self.selection_rect.top() - tb_h - 10
+            tb_y = sel.top() - tb_h - 10
             
         # Final vertical clamping to ensure it's visible on screen
         if tb_y < screen_tl_local.y():
@@ -811,35 +1393,22 @@ class SnippingOverlay(QWidget):
         """Return the selected area with all annotations drawn on it."""
         self.toolbar.hide()
         QApplication.processEvents()
-        if hasattr(self, "screenshot") and not self.screenshot.isNull():
-            img = self.screenshot.copy(self.selection_rect)
-        else:
+        if not self.surfaces:
             return QImage()
+        img = self._grab_rect(self.selection_rect)
         painter = QPainter(img)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         offset = self.selection_rect.topLeft()
         painter.translate(-offset)
         
         # Draw persistent annotations
-        for item in self.annotations:
-            self._draw_annotation(painter, item)
+        for item in self.annotation_index.in_rect(self.selection_rect):
+            draw_annotation(painter, item)
             
         # Draw timestamp burned into image (Black Background) - IF ENABLED
         if self.settings.value("show_datetime", True, type=bool):
-            timestamp = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
-            fm = QFontMetrics(self.font())
-            ts_w = fm.horizontalAdvance(timestamp)
-            ts_h = fm.height()
-            
             # Position relative to global coordinates (since we translated painter)
-            ts_pos = offset + QPoint(10, 20)
-            
-            # Draw Black Background
-            ts_bg_rect = QRect(ts_pos.x() - 4, ts_pos.y() - ts_h + 4, ts_w + 8, ts_h)
-            painter.fillRect(ts_bg_rect, Qt.GlobalColor.black)
-            
-            painter.setPen(QPen(Qt.GlobalColor.white))
-            painter.drawText(ts_pos, timestamp)
+            draw_timestamp(painter, offset + QPoint(10, 20), self.font())
 
         painter.end()
         return img.toImage()
@@ -849,28 +1418,18 @@ class SnippingOverlay(QWidget):
         
         # Determine format and default filename from settings
         fmt = self.settings.value("image_format", "PNG").lower()
-        pattern = self.settings.value("filename_pattern", "%Y-%m-%d_%H-%M-%S")
-        
-        # Format filename using current datetime
-        # Use simple python strftime for %-style formatting
-        try:
-            default_name = QDateTime.currentDateTime().toPyDateTime().strftime(pattern)
-        except ValueError:
-            # Fallback if pattern is invalid
-            default_name = QDateTime.currentDateTime().toPyDateTime().strftime("%Y-%m-%d_%H-%M-%S")
-        if not default_name.lower().endswith(f".{fmt}"):
-            default_name += f".{fmt}"
+        default_name = default_filename(self.settings)
             
         file_path, _ = QFileDialog.getSaveFileName(
-            self, "Guardar Captura", default_name, f"Images (*.{fmt})"
+            self._dialog_parent(), "Guardar Captura", default_name, f"Images (*.{fmt})"
         )
         if file_path:
-            img.save(file_path)
+            save_image(img, file_path)
             self.capture_finished.emit(f"Captura guardada en: {file_path}")
             self.close()
             self.on_close_signal.emit()
         else:
-            self.showFullScreen()
+            self.show_fullscreen()
             self.toolbar.show()
 
     def copy_to_clipboard(self):
@@ -906,7 +1465,22 @@ class SnippingOverlay(QWidget):
             # "Salga de la aplicación" -> entendido como salir del modo captura (cerrar overlay)
             self.close()
             self.on_close_signal.emit()
-        elif event.key() == Qt.Key.Key_Z and (event.modifiers() & Qt.KeyboardModifier.ControlModifier):
-            if self.annotations:
-                self.annotations.pop()
-                self.update()
\ No newline at end of file
+        elif event.matches(QKeySequence.StandardKey.Redo) or (
+            event.key() == Qt.Key.Key_Y and event.modifiers() & Qt.KeyboardModifier.ControlModifier
+        ):
+            self.history.redo()
+        elif event.matches(QKeySequence.StandardKey.Undo):
+            self.history.undo()
+        elif event.key() in (Qt.Key.Key_Delete, Qt.Key.Key_Backspace) and self.selected_annotation is not None:
+            self._delete_annotation(self.selected_annotation)
+        elif event.key() == Qt.Key.Key_F3:
+            self.show_hud = not self.show_hud
+            if self.show_hud:
+                self._hud_timer.start()
+            else:
+                self._hud_timer.stop()
+            self._update_hud()
+        elif event.key() == Qt.Key.Key_0:
+            for surface in self.surfaces:
+                if surface.zoom != 1:
+                    surface.set_zoom(1)
\ No newline at end of file
@@ -1,12 +1,13 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, QLabel, 
     QCheckBox, QComboBox, QFormLayout, QLineEdit, 
-    QPushButton, QKeySequenceEdit, QSlider
+    QPushButton, QKeySequenceEdit, QSlider, QSpinBox
 )
 from PyQt6.QtCore import Qt, QSettings, pyqtSignal
 from PyQt6.QtGui import QIcon
 from src.utils import resource_path
 from src.core.i18n import i18n
+from src.ui.icons import icons
 import sys
 import os
 import platform
@@ -33,17 +34,17 @@ class SettingsWindow(QWidget):
         # Tab 1: Configuración General
         self.tab_general = QWidget()
         self._init_general_tab()
-        self.tabs.addTab(self.tab_general, "General")
+        self.tabs.addTab(self.tab_general, icons.icon("fa5s.cog"), "General")
 
         # Tab 2: Teclas de acceso rápido
         self.tab_hotkeys = QWidget()
         self._init_hotkeys_tab()
-        self.tabs.addTab(self.tab_hotkeys, "Teclas rápidas")
+        self.tabs.addTab(self.tab_hotkeys, icons.icon("fa5s.keyboard"), "Teclas rápidas")
 
         # Tab 3: Formato
         self.tab_format = QWidget()
         self._init_format_tab()
-        self.tabs.addTab(self.tab_format, "Formato")
+        self.tabs.addTab(self.tab_format, icons.icon("fa5s.image"), "Formato")
 
         # Buttons Layout
         btn_layout = QHBoxLayout()
@@ -77,6 +78,9 @@ class SettingsWindow(QWidget):
         self.cb_cursor.setText(i18n.tr("chk_cursor"))
         self.cb_datetime.setText(i18n.tr("chk_datetime"))
         self.cb_coords.setText(i18n.tr("chk_coords"))
+        self.cb_stable.setText(i18n.tr("chk_stable"))
+        self.cb_snap.setText(i18n.tr("chk_snap"))
+        self.cb_smooth.setText(i18n.tr("chk_smooth"))
         self.lang_label.setText(i18n.tr("lang_label"))
         
         self.opacity_label.setText(i18n.tr("lbl_opacity"))
@@ -91,6 +95,15 @@ class SettingsWindow(QWidget):
         # Format Tab
         self.fmt_label.setText(i18n.tr("lbl_image_format"))
         self.pattern_label.setText(i18n.tr("lbl_filename_pattern"))
+        self.save_dir_label.setText(i18n.tr("lbl_save_dir"))
+        self.burst_count_label.setText(i18n.tr("lbl_burst_count"))
+        self.burst_interval_label.setText(i18n.tr("lbl_burst_interval"))
+        self.timelapse_interval_label.setText(i18n.tr("lbl_timelapse_interval"))
+        self.timelapse_budget_label.setText(i18n.tr("lbl_timelapse_budget"))
+        self.timelapse_tiles.setText(i18n.tr("cb_timelapse_tiles"))
+        self.record_format_label.setText(i18n.tr("lbl_record_format"))
+        self.record_fps_label.setText(i18n.tr("lbl_record_fps"))
+        self.undo_memory_label.setText(i18n.tr("lbl_undo_memory"))
 
     def save_settings(self):
         # Save general settings
@@ -100,6 +113,9 @@ class SettingsWindow(QWidget):
         self.settings.setValue("show_datetime", self.cb_datetime.isChecked())
         self.settings.setValue("show_coords", self.cb_coords.isChecked())
         self.settings.setValue("capture_cursor", self.cb_cursor.isChecked())
+        self.settings.setValue("capture_when_stable", self.cb_stable.isChecked())
+        self.settings.setValue("snap_to_elements", self.cb_snap.isChecked())
+        self.settings.setValue("smooth_strokes", self.cb_smooth.isChecked())
         self.settings.setValue("start_with_system", self.cb_startup.isChecked())
         self.settings.setValue("show_notification", self.cb_notify.isChecked())
         self.settings.setValue("overlay_opacity", self.opacity_slider.value())
@@ -116,6 +132,15 @@ class SettingsWindow(QWidget):
         # Save format settings
         self.settings.setValue("image_format", self.fmt_combo.currentText())
         self.settings.setValue("filename_pattern", self.filename_pattern.text())
+        self.settings.setValue("save_dir", self.save_dir_edit.text().strip())
+        self.settings.setValue("burst_count", self.burst_count.value())
+        self.settings.setValue("burst_interval_ms", self.burst_interval.value())
+        self.settings.setValue("timelapse_interval_s", self.timelapse_interval.value())
+        self.settings.setValue("timelapse_budget_mb", self.timelapse_budget.value())
+        self.settings.setValue("timelapse_tiles", self.timelapse_tiles.isChecked())
+        self.settings.setValue("record_format", self.record_format.currentData())
+        self.settings.setValue("record_fps", self.record_fps.value())
+        self.settings.setValue("undo_memory_mb", self.undo_memory.value())
         
         self.settings.sync()
         self.settings_saved.emit()
@@ -167,6 +192,15 @@ class SettingsWindow(QWidget):
         self.cb_coords = QCheckBox("Mostrar coordenadas del cursor (eje X, Y) en la interfaz")
         self.cb_coords.setChecked(show_coords)
 
+        self.cb_stable = QCheckBox("Esperar a que la pantalla se estabilice antes de capturar")
+        self.cb_stable.setChecked(self.settings.value("capture_when_stable", False, type=bool))
+
+        self.cb_snap = QCheckBox("Detectar ventanas y paneles para seleccionarlos con un clic")
+        self.cb_snap.setChecked(self.settings.value("snap_to_elements", True, type=bool))
+
+        self.cb_smooth = QCheckBox("Suavizar los trazos a mano alzada")
+        self.cb_smooth.setChecked(self.settings.value("smooth_strokes", False, type=bool))
+
         # Opacity slider
         opacity_layout = QVBoxLayout()
         self.opacity_label = QLabel("Opacidad del fondo (oscurecimiento):")
@@ -189,6 +223,9 @@ class SettingsWindow(QWidget):
         layout.addWidget(self.cb_cursor)
         layout.addWidget(self.cb_datetime)
         layout.addWidget(self.cb_coords)
+        layout.addWidget(self.cb_stable)
+        layout.addWidget(self.cb_snap)
+        layout.addWidget(self.cb_smooth)
         layout.addLayout(opacity_layout)
         layout.addStretch()
         self.tab_general.setLayout(layout)
@@ -235,12 +272,75 @@ class SettingsWindow(QWidget):
         self.fmt_combo.setCurrentText(current_fmt)
         
         self.filename_pattern = QLineEdit(current_pattern)
+
+        # Folder for captures saved without a dialog (queued / burst captures)
+        self.save_dir_edit = QLineEdit(self.settings.value("save_dir", ""))
+        self.save_dir_edit.setPlaceholderText("~/Pictures/PixelCatchr")
+
+        self.burst_count = QSpinBox()
+        self.burst_count.setRange(1, 50)
+        self.burst_count.setValue(self.settings.value("burst_count", 1, type=int))
+
+        self.burst_interval = QSpinBox()
+        self.burst_interval.setRange(0, 10000)
+        self.burst_interval.setSingleStep(50)
+        self.burst_interval.setSuffix(" ms")
+        self.burst_interval.setValue(self.settings.value("burst_interval_ms", 250, type=int))
+
+        self.timelapse_interval = QSpinBox()
+        self.timelapse_interval.setRange(1, 3600)
+        self.timelapse_interval.setSuffix(" s")
+        self.timelapse_interval.setValue(int(self.settings.value("timelapse_interval_s", 5, type=float)))
+
+        self.timelapse_budget = QSpinBox()
+        self.timelapse_budget.setRange(10, 1024 * 1024)
+        self.timelapse_budget.setSingleStep(100)
+        self.timelapse_budget.setSuffix(" MB")
+        self.timelapse_budget.setValue(self.settings.value("timelapse_budget_mb", 1024, type=int))
+
+        self.timelapse_tiles = QCheckBox("Guardar el timelapse como teselas deduplicadas")
+        self.timelapse_tiles.setChecked(self.settings.value("timelapse_tiles", False, type=bool))
+
+        self.record_format = QComboBox()
+        for label, code in (("WebP", "webp"), ("APNG", "apng"), ("GIF", "gif")):
+            self.record_format.addItem(label, code)
+        index = self.record_format.findData(self.settings.value("record_format", "webp"))
+        if index >= 0:
+            self.record_format.setCurrentIndex(index)
+
+        self.record_fps = QSpinBox()
+        self.record_fps.setRange(1, 60)
+        self.record_fps.setSuffix(" fps")
+        self.record_fps.setValue(self.settings.value("record_fps", 15, type=int))
+
+        self.undo_memory = QSpinBox()
+        self.undo_memory.setRange(8, 4096)
+        self.undo_memory.setSingleStep(16)
+        self.undo_memory.setSuffix(" MB")
+        self.undo_memory.setValue(self.settings.value("undo_memory_mb", 64, type=int))
         
         self.fmt_label = QLabel("Formato de imagen:")
         self.pattern_label = QLabel("Patrón de nombre de archivo:")
+        self.save_dir_label = QLabel("Carpeta de capturas automáticas:")
+        self.burst_count_label = QLabel("Capturas por ráfaga:")
+        self.burst_interval_label = QLabel("Intervalo de ráfaga:")
+        self.timelapse_interval_label = QLabel("Intervalo de timelapse:")
+        self.timelapse_budget_label = QLabel("Límite de disco del timelapse:")
+        self.record_format_label = QLabel("Formato de grabación:")
+        self.record_fps_label = QLabel("Fotogramas por segundo de grabación:")
+        self.undo_memory_label = QLabel("Memoria para deshacer anotaciones:")
         
         layout.addRow(self.fmt_label, self.fmt_combo)
         layout.addRow(self.pattern_label, self.filename_pattern)
+        layout.addRow(self.save_dir_label, self.save_dir_edit)
+        layout.addRow(self.burst_count_label, self.burst_count)
+        layout.addRow(self.burst_interval_label, self.burst_interval)
+        layout.addRow(self.timelapse_interval_label, self.timelapse_interval)
+        layout.addRow(self.timelapse_budget_label, self.timelapse_budget)
+        layout.addRow(self.timelapse_tiles)
+        layout.addRow(self.record_format_label, self.record_format)
+        layout.addRow(self.record_fps_label, self.record_fps)
+        layout.addRow(self.undo_memory_label, self.undo_memory)
         
         self.tab_format.setLayout(layout)
 
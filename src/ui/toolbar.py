@@ -2,15 +2,15 @@ from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QColorDialog
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon, QColor
 
-import qtawesome as qta
+from src.ui.icons import icons
 
 class OverlayToolbar(QWidget):
     # Signals for tools
-    tool_selected = pyqtSignal(str)  # "pen", "arrow", "rect", "text"
+    tool_selected = pyqtSignal(str)  # "pen", "arrow", "rect", "text", "move"
     color_changed = pyqtSignal(QColor)
 
     # Signals for actions
-    action_triggered = pyqtSignal(str)  # "save", "copy", "close"
+    action_triggered = pyqtSignal(str)  # "save", "copy", "close", "undo", "redo", "scroll", "record"
 
     # Signal for manual move
     manually_moved = pyqtSignal()
@@ -55,7 +55,7 @@ class OverlayToolbar(QWidget):
         # --- Drag Handle ---
         from PyQt6.QtWidgets import QLabel
         self.drag_handle = QLabel()
-        self.drag_handle.setPixmap(qta.icon("fa5s.grip-vertical", color="#888888").pixmap(16, 16))
+        self.drag_handle.setPixmap(icons.pixmap("fa5s.grip-vertical", "#888888", 16))
         self.drag_handle.setToolTip("Arrastrar para mover")
         self.drag_handle.setFixedWidth(20)
         self.drag_handle.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -72,6 +72,7 @@ class OverlayToolbar(QWidget):
         self.btn_rect = self._create_button("fa5s.square", "rect", "Rectángulo")
         self.btn_text = self._create_button("fa5s.font", "text", "Texto")
         self.btn_blur = self._create_button("fa5s.tint", "blur", "Desenfocar")
+        self.btn_move = self._create_button("fa5s.mouse-pointer", "move", "Mover o borrar anotaciones (Supr)")
 
         # Add tool buttons to layout
         layout.addWidget(self.btn_pen)
@@ -80,10 +81,11 @@ class OverlayToolbar(QWidget):
         layout.addWidget(self.btn_rect)
         layout.addWidget(self.btn_text)
         layout.addWidget(self.btn_blur)
+        layout.addWidget(self.btn_move)
 
         # Color picker button
         self.btn_color = QPushButton()
-        self.btn_color.setIcon(qta.icon('fa5s.palette', color='white'))
+        self.btn_color.setIcon(icons.icon('fa5s.palette', 'white'))
         self.btn_color.setToolTip("Color")
         self.btn_color.clicked.connect(self._pick_color)
         layout.addWidget(self.btn_color)
@@ -92,12 +94,18 @@ class OverlayToolbar(QWidget):
         layout.addSpacing(10)
 
         # --- Actions ---
-        self.btn_undo = self._create_action_button("fa5s.undo", "undo", "Deshacer")
+        self.btn_undo = self._create_action_button("fa5s.undo", "undo", "Deshacer (Ctrl+Z)")
+        self.btn_redo = self._create_action_button("fa5s.redo", "redo", "Rehacer (Ctrl+Y)")
+        self.btn_scroll = self._create_action_button("fa5s.arrows-alt-v", "scroll", "Captura con desplazamiento")
+        self.btn_record = self._create_action_button("fa5s.video", "record", "Grabar región")
         self.btn_save = self._create_action_button("fa5s.save", "save", "Guardar")
         self.btn_copy = self._create_action_button("fa5s.copy", "copy", "Copiar")
         self.btn_close = self._create_action_button("fa5s.times", "close", "Cerrar")
 
         layout.addWidget(self.btn_undo)
+        layout.addWidget(self.btn_redo)
+        layout.addWidget(self.btn_scroll)
+        layout.addWidget(self.btn_record)
         layout.addWidget(self.btn_save)
         layout.addWidget(self.btn_copy)
         layout.addWidget(self.btn_close)
@@ -124,7 +132,7 @@ class OverlayToolbar(QWidget):
 
     def _create_button(self, icon_name, tool_id, tooltip):
         btn = QPushButton()
-        btn.setIcon(qta.icon(icon_name, color='white'))
+        btn.setIcon(icons.icon(icon_name, 'white'))
         btn.setToolTip(tooltip)
         btn.setCheckable(True)
         btn.setCursor(Qt.CursorShape.ArrowCursor) # Buttons use normal arrow
@@ -133,7 +141,7 @@ class OverlayToolbar(QWidget):
 
     def _create_action_button(self, icon_name, action_id, tooltip):
         btn = QPushButton()
-        btn.setIcon(qta.icon(icon_name, color='white'))
+        btn.setIcon(icons.icon(icon_name, 'white'))
         btn.setToolTip(tooltip)
         btn.setCursor(Qt.CursorShape.ArrowCursor) # Buttons use normal arrow
         btn.clicked.connect(lambda: self.action_triggered.emit(action_id))
@@ -141,7 +149,7 @@ class OverlayToolbar(QWidget):
 
     def _on_tool_clicked(self, btn, tool_id):
         # Uncheck other tool buttons
-        for b in [self.btn_pen, self.btn_highlight, self.btn_arrow, self.btn_rect, self.btn_text, self.btn_blur]:
+        for b in [self.btn_pen, self.btn_highlight, self.btn_arrow, self.btn_rect, self.btn_text, self.btn_blur, self.btn_move]:
             if b != btn:
                 b.setChecked(False)
 
@@ -157,4 +165,4 @@ class OverlayToolbar(QWidget):
         if color.isValid():
             self.color_changed.emit(color)
             # Update icon color to match selection
-            self.btn_color.setIcon(qta.icon('fa5s.palette', color=color.name()))
+            self.btn_color.setIcon(icons.icon('fa5s.palette', color.name(), persist=False))
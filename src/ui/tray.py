@@ -1,14 +1,13 @@
 from PyQt6.QtWidgets import QSystemTrayIcon, QMenu, QApplication, QMessageBox
 from PyQt6.QtGui import QIcon, QAction, QPixmap
 from PyQt6.QtCore import pyqtSignal, Qt, pyqtSlot
-from src.ui.settings import SettingsWindow
 from src.utils import resource_path
 from src.core.i18n import i18n
-import qtawesome as qta
 
 class SystemTrayIcon(QSystemTrayIcon):
     capture_triggered = pyqtSignal()
     full_capture_triggered = pyqtSignal()
+    timelapse_toggled = pyqtSignal(bool)
     settings_changed = pyqtSignal()
 
     def __init__(self, app_instance: QApplication): 
@@ -22,10 +21,6 @@ class SystemTrayIcon(QSystemTrayIcon):
         self.setToolTip("PixelCatchr")
         self.app_instance = app_instance
         
-        # Initialize settings window reference
-        self.settings_window = None
-
-        
         # Initialize settings window reference
         self.settings_window = None
 
@@ -41,40 +36,58 @@ class SystemTrayIcon(QSystemTrayIcon):
         i18n.language_changed.connect(self.retranslateUi)
 
     def setup_menu(self):
+        # Icons are set later by load_icons() so the icon font isn't loaded
+        # before the tray icon is visible.
         self.menu.clear()
         
         # Action: Capturar (Zona)
-        self.capture_action = QAction(qta.icon('fa5s.crop'), i18n.tr("tray_capture_zone"), self)
+        self.capture_action = QAction(i18n.tr("tray_capture_zone"), self)
         self.capture_action.triggered.connect(self.capture_triggered.emit)
         self.menu.addAction(self.capture_action)
 
         # Action: Captura Completa
-        self.full_capture_action = QAction(qta.icon('fa5s.desktop'), i18n.tr("tray_capture_full"), self)
+        self.full_capture_action = QAction(i18n.tr("tray_capture_full"), self)
         self.full_capture_action.triggered.connect(self.full_capture_triggered.emit)
         self.menu.addAction(self.full_capture_action)
+
+        # Action: Timelapse (checkable, on/off)
+        self.timelapse_action = QAction(i18n.tr("tray_timelapse"), self)
+        self.timelapse_action.setCheckable(True)
+        self.timelapse_action.toggled.connect(self.timelapse_toggled.emit)
+        self.menu.addAction(self.timelapse_action)
         
         self.menu.addSeparator()
 
         # Action: Configuración
-        self.settings_action = QAction(qta.icon('fa5s.cog'), i18n.tr("tray_settings"), self)
+        self.settings_action = QAction(i18n.tr("tray_settings"), self)
         self.settings_action.triggered.connect(self.show_settings)
         self.menu.addAction(self.settings_action)
 
         # Action: Acerca de
-        self.about_action = QAction(qta.icon('fa5s.info-circle'), i18n.tr("tray_about"), self)
+        self.about_action = QAction(i18n.tr("tray_about"), self)
         self.about_action.triggered.connect(self.show_about)
         self.menu.addAction(self.about_action)
         
         self.menu.addSeparator()
         
         # Action: Salir
-        self.exit_action = QAction(qta.icon('fa5s.power-off'), i18n.tr("tray_exit"), self)
+        self.exit_action = QAction(i18n.tr("tray_exit"), self)
         self.exit_action.triggered.connect(self.app_instance.quit)
         self.menu.addAction(self.exit_action)
 
+    def load_icons(self):
+        from src.ui.icons import icons
+        self.capture_action.setIcon(icons.icon('fa5s.crop'))
+        self.full_capture_action.setIcon(icons.icon('fa5s.desktop'))
+        self.timelapse_action.setIcon(icons.icon('fa5s.history'))
+        self.settings_action.setIcon(icons.icon('fa5s.cog'))
+        self.about_action.setIcon(icons.icon('fa5s.info-circle'))
+        self.exit_action.setIcon(icons.icon('fa5s.power-off'))
+
     def retranslateUi(self):
         self.capture_action.setText(i18n.tr("tray_capture_zone"))
         self.full_capture_action.setText(i18n.tr("tray_capture_full"))
+        self.timelapse_action.setText(i18n.tr("tray_timelapse"))
         self.settings_action.setText(i18n.tr("tray_settings"))
         self.about_action.setText(i18n.tr("tray_about"))
         self.exit_action.setText(i18n.tr("tray_exit"))
@@ -86,6 +99,7 @@ class SystemTrayIcon(QSystemTrayIcon):
 
     def show_settings(self):
         if self.settings_window is None:
+            from src.ui.settings import SettingsWindow
             self.settings_window = SettingsWindow()
             self.settings_window.settings_saved.connect(self.settings_changed.emit)
         self.settings_window.show()